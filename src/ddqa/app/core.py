@@ -77,7 +77,7 @@ class Application(App):
     def github(self) -> GitHubRepository:
         from ddqa.utils.github import GitHubRepository
 
-        return GitHubRepository(self.git, self.config.auth.github, self.cache_dir)
+        return GitHubRepository(self.git, self.config.auth.github, self.cache_dir, self.config.app)
 
     @cached_property
     def jira(self) -> JiraClient:
@@ -142,6 +142,28 @@ class Application(App):
             for name, _ in self.__queued_screens:
                 await self.push_screen(name)
 
+    def on_unmount(self) -> None:
+        self.save_caches()
+
+    def save_caches(self) -> None:
+        """
+        Write what is left of the caches used during this run, evict what exceeds the limits and save the statistics.
+        """
+        from ddqa.cache.stats import CacheStats
+
+        # Only the caches that were used during this run
+        caches = [getattr(self, name).cache for name in ('github', 'jira') if name in self.__dict__]
+        if not caches:
+            return
+
+        if 'github' in self.__dict__:
+            self.github.cache.flush_deferred_candidate_data()
+            self.github.cache.save_access_times()
+            if max_size := self.config.app.github_cache_max_size:
+                self.github.cache.evict(max_size)
+
+        CacheStats.save_run(self.cache_dir, *(cache.stats for cache in caches))
+
     def select_screen(self, name: str, screen: Screen) -> None:
         self.__queued_screens.append((name, screen))
 
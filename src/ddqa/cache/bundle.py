@@ -0,0 +1,227 @@
+# SPDX-FileCopyrightText: 2023-present Datadog, Inc. <dev@datadoghq.com>
+#
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import sqlite3
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from ddqa.utils.fs import Path
+
+# The first line of every bundle
+BUNDLE_FORMAT = 'ddqa-cache'
+BUNDLE_VERSION = 1
+
+# The cache directories that are bundled, relative to the cache location
+BUNDLED_DIRECTORIES = ('github', 'jira')
+
+
+class BundleResult:
+    def __init__(self) -> None:
+        self.pull_requests = 0
+        self.commits = 0
+        self.files = 0
+
+
+def export_cache(cache_dir: Path, bundle_path: Path) -> BundleResult:
+    """
+    Write the GitHub and Jira caches to a gzip-compressed file of JSON records, one per line, starting with a header
+    that identifies the format and its version. Databases are exported row by row and every other file is exported
+    along with its modification time.
+    """
+    from ddqa.cache.github import GitHubCache
+
+    result = BundleResult()
+    with gzip.open(bundle_path, 'wt', encoding='utf-8') as bundle:
+
+        def write(record: dict[str, Any]) -> None:
+            bundle.write(json.dumps(record))
+            bundle.write('\n')
+
+        write({'format': BUNDLE_FORMAT, 'version': BUNDLE_VERSION})
+
+        github_dir = cache_dir / 'github'
+        for database_file in sorted(github_dir.glob('*/*/cache.db')) if github_dir.is_dir() else ():
+            repo = database_file.parent.relative_to(github_dir).as_posix()
+            connection = GitHubCache.connect(database_file, timeout=30)
+            try:
+                for number, data, fetched_at, updated_at, accessed_at in connection.execute(
+                    'SELECT number, data, fetched_at, updated_at, accessed_at FROM pull_requests'
+                ):
+                    write(
+                        {
+                            'type': 'pull_request',
+                            'repo': repo,
+                            'number': number,
+                            'data': data,
+                            'fetched_at': fetched_at,
+                            'updated_at': updated_at,
+                            'accessed_at': accessed_at,
+                        }
+                    )
+                    result.pull_requests += 1
+
+                for commit_hash, pr, data, accessed_at in connection.execute(
+                    'SELECT hash, pr, data, accessed_at FROM commits'
+                ):
+                    write(
+                        {
+                            'type': 'commit',
+                            'repo': repo,
+                            'hash': commit_hash,
+                            'pr': pr,
+                            'data': data,
+                            'accessed_at': accessed_at,
+                        }
+                    )
+                    result.commits += 1
+
+                for number, data in connection.execute('SELECT number, data FROM pull_request_reviews'):
+                    write({'type': 'pull_request_reviews', 'repo': repo, 'number': number, 'data': data})
+
+                for url, validators, body in connection.execute('SELECT url, validators, body FROM http_responses'):
+                    write({'type': 'http_response', 'repo': repo, 'url': url, 'validators': validators, 'body': body})
+            finally:
+                connection.close()
+
+        for path in iter_bundled_files(cache_dir):
+            write(
+                {
+                    'type': 'file',
+                    'path': path.relative_to(cache_dir).as_posix(),
+                    'mtime': path.stat().st_mtime,
+                    'content': path.read_text(encoding='utf-8'),
+                }
+            )
+            result.files += 1
+
+    return result
+
+
+def import_cache(cache_dir: Path, bundle_path: Path) -> BundleResult:
+    """
+    Merge a bundle created by `export_cache` into the cache. Pull requests replace those that were fetched earlier
+    and files replace those that were modified earlier, while commits are only added as they never change. Reviews
+    and cached responses are only added since the time at which they were received is unknown.
+    """
+    from ddqa.cache.github import GitHubCache
+
+    result = BundleResult()
+    # Repository -> database connection
+    connections: dict[str, sqlite3.Connection] = {}
+    try:
+        # Files are replaced atomically so a single lock keeps concurrent imports from interleaving, rather than
+        # a lock file next to every imported file
+        with (cache_dir / 'import').lock(), gzip.open(bundle_path, 'rt', encoding='utf-8') as bundle:
+            header = json.loads(bundle.readline() or '{}')
+            if header.get('format') != BUNDLE_FORMAT:
+                message = f'Not a cache bundle: {bundle_path}'
+                raise ValueError(message)
+            elif header.get('version') != BUNDLE_VERSION:
+                message = f'Unsupported cache bundle version `{header.get("version")}`, expected `{BUNDLE_VERSION}`'
+                raise ValueError(message)
+
+            for line in bundle:
+                record = json.loads(line)
+                if record['type'] == 'file':
+                    if import_file(cache_dir, record):
+                        result.files += 1
+
+                    continue
+
+                repo = record['repo']
+                if (connection := connections.get(repo)) is None:
+                    repo_dir = get_bundled_path(cache_dir, f'github/{repo}')
+                    repo_dir.ensure_dir_exists()
+                    connection = connections[repo] = GitHubCache.connect(repo_dir / 'cache.db', timeout=30)
+                    connection.execute('BEGIN IMMEDIATE')
+
+                if record['type'] == 'pull_request':
+                    cursor = connection.execute(
+                        """
+                        INSERT INTO pull_requests (number, data, fetched_at, updated_at, accessed_at)
+                        VALUES (?, ?, ?, ?, ?)
+                        ON CONFLICT (number) DO UPDATE SET
+                            data = excluded.data,
+                            fetched_at = excluded.fetched_at,
+                            updated_at = excluded.updated_at,
+                            accessed_at = MAX(IFNULL(accessed_at, 0), IFNULL(excluded.accessed_at, 0))
+                        WHERE IFNULL(excluded.fetched_at, 0) > IFNULL(fetched_at, 0)
+                        """,
+                        (
+                            record['number'],
+                            record['data'],
+                            record['fetched_at'],
+                            record['updated_at'],
+                            record['accessed_at'],
+                        ),
+                    )
+                    result.pull_requests += cursor.rowcount
+                elif record['type'] == 'commit':
+                    cursor = connection.execute(
+                        'INSERT OR IGNORE INTO commits (hash, pr, data, accessed_at) VALUES (?, ?, ?, ?)',
+                        (record['hash'], record['pr'], record['data'], record['accessed_at']),
+                    )
+                    result.commits += cursor.rowcount
+                elif record['type'] == 'pull_request_reviews':
+                    connection.execute(
+                        'INSERT OR IGNORE INTO pull_request_reviews (number, data) VALUES (?, ?)',
+                        (record['number'], record['data']),
+                    )
+                elif record['type'] == 'http_response':
+                    connection.execute(
+                        'INSERT OR IGNORE INTO http_responses (url, validators, body) VALUES (?, ?, ?)',
+                        (record['url'], record['validators'], record['body']),
+                    )
+    except BaseException:
+        for connection in connections.values():
+            connection.execute('ROLLBACK')
+
+        raise
+    else:
+        for connection in connections.values():
+            connection.execute('COMMIT')
+    finally:
+        for connection in connections.values():
+            connection.close()
+
+    return result
+
+
+def import_file(cache_dir: Path, record: dict[str, Any]) -> bool:
+    path = get_bundled_path(cache_dir, record['path'])
+    if path.is_file() and path.stat().st_mtime >= record['mtime']:
+        return False
+
+    path.parent.ensure_dir_exists()
+    path.write_atomic(record['content'], 'w', encoding='utf-8')
+    os.utime(path, (record['mtime'], record['mtime']))
+    return True
+
+
+def get_bundled_path(cache_dir: Path, relative_path: str) -> Path:
+    parts = relative_path.split('/')
+    if parts[0] not in BUNDLED_DIRECTORIES or any(part in {'', '.', '..'} for part in parts):
+        message = f'Invalid path in cache bundle: {relative_path}'
+        raise ValueError(message)
+
+    return cache_dir.joinpath(*parts)
+
+
+def iter_bundled_files(cache_dir: Path) -> Iterator[Path]:
+    for directory_name in BUNDLED_DIRECTORIES:
+        directory = cache_dir / directory_name
+        if not directory.is_dir():
+            continue
+
+        for root, _, file_names in os.walk(directory):
+            for file_name in sorted(file_names):
+                # Databases are exported by row and locks only matter to running processes
+                if not file_name.startswith('cache.db') and not file_name.endswith('.lock'):
+                    yield cache_dir.joinpath(root, file_name)
@@ -3,15 +3,28 @@
 # SPDX-License-Identifier: MIT
 from __future__ import annotations
 
+import asyncio
+import copy
 import json
+import shutil
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from functools import cached_property
 from typing import TYPE_CHECKING, Any
 
 from pydantic import HttpUrl
 
+from ddqa.cache.memory import MemoryCache
+from ddqa.cache.stats import CacheStats
 from ddqa.utils.fs import Path
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+    from ddqa.cache.prune import PruneResult
+    from ddqa.models.github import TestCandidate
     from ddqa.utils.github import GitHubRepository
 
 
@@ -21,26 +34,166 @@ class SetEncoder(json.JSONEncoder):
 
 
 class GitHubCache:
+    # Stay well below the maximum number of parameters of a single SQLite statement
+    BULK_QUERY_SIZE = 500
+
+    # The number of seconds without new deferred writes after which they are flushed
+    DEFERRED_WRITE_DELAY = 1.0
+
+    # Deferred writes are flushed right away once this many candidates are waiting
+    DEFERRED_WRITE_LIMIT = 500
+
     def __init__(self, cache_dir: Path, github_repo: GitHubRepository) -> None:
         super().__init__()
         self.__cache_dir = cache_dir
         self.__github_repo = github_repo
 
+        # Commit hash -> candidate, for candidates that have yet to be written
+        self.__deferred_candidates: dict[str, TestCandidate] = {}
+        self.__deferred_flush: asyncio.TimerHandle | None = None
+        # Commits and pull requests read during this run, whose time of last access is written once at the end
+        self.__accessed_commits: set[str] = set()
+        self.__accessed_pull_requests: set[str] = set()
+
+        # Writes happen in order on a single thread so that older data never overwrites newer data
+        self.__writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='ddqa-cache-writer')
+
+        self.__stats = CacheStats()
+        self.__memory = MemoryCache()
+
+    @property
+    def stats(self) -> CacheStats:
+        return self.__stats
+
+    @property
+    def memory(self) -> MemoryCache:
+        return self.__memory
+
     @cached_property
     def cache_dir(self) -> Path:
         return self.__cache_dir / 'github' / self.__github_repo.org / self.__github_repo.repo_name
 
     @cached_property
-    def cache_dir_commits(self) -> Path:
-        directory = self.cache_dir / 'commits'
-        directory.ensure_dir_exists()
-        return directory
+    def database_file(self) -> Path:
+        return self.cache_dir / 'cache.db'
 
     @cached_property
-    def cache_dir_pull_requests(self) -> Path:
-        directory = self.cache_dir / 'pull_requests'
-        directory.ensure_dir_exists()
-        return directory
+    def database(self) -> sqlite3.Connection:
+        self.cache_dir.ensure_dir_exists()
+        connection = self.connect(self.database_file, check_same_thread=False, timeout=30)
+        self.__migrate_directory_layout(connection)
+        return connection
+
+    @classmethod
+    def connect(cls, database_file: Path, **kwargs: Any) -> sqlite3.Connection:
+        connection = sqlite3.connect(str(database_file), isolation_level=None, **kwargs)
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('PRAGMA synchronous=NORMAL')
+        cls.create_tables(connection)
+        return connection
+
+    @classmethod
+    def create_tables(cls, connection: sqlite3.Connection) -> None:
+        with cls.transaction(connection):
+            # A commit either references a pull request or holds the data of a candidate without one
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS commits (hash TEXT PRIMARY KEY, pr TEXT, data TEXT, accessed_at REAL)'
+            )
+            # The time at which a pull request was fetched and its own `updated_at` determine its freshness
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS pull_requests '
+                '(number TEXT PRIMARY KEY, data TEXT NOT NULL, fetched_at REAL, updated_at TEXT, accessed_at REAL)'
+            )
+            connection.execute('CREATE INDEX IF NOT EXISTS commits_pr ON commits (pr)')
+            # The validators and body of the last response to a conditional request, by URL
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS http_responses '
+                '(url TEXT PRIMARY KEY, validators TEXT NOT NULL, body TEXT NOT NULL)'
+            )
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS pull_request_reviews (number TEXT PRIMARY KEY, data TEXT NOT NULL)'
+            )
+
+            # The time of last access was added later and is used to evict the least recently used entries
+            for table in ('commits', 'pull_requests'):
+                columns = {row[1] for row in connection.execute(f'PRAGMA table_info({table})')}
+                if 'accessed_at' not in columns:
+                    connection.execute(f'ALTER TABLE {table} ADD COLUMN accessed_at REAL')
+
+    @staticmethod
+    @contextmanager
+    def transaction(connection: sqlite3.Connection) -> Iterator[sqlite3.Connection]:
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            yield connection
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+        else:
+            connection.execute('COMMIT')
+
+    def __migrate_directory_layout(self, connection: sqlite3.Connection) -> None:
+        # Previous versions stored every commit as a directory and every pull request, response and list of reviews
+        # as a JSON file
+        directories = [self.cache_dir / name for name in ('commits', 'pull_requests', 'http', 'pull_request_reviews')]
+        if not any(directory.is_dir() for directory in directories):
+            return
+
+        with self.database_file.lock():
+            # Another process may have migrated the directories while waiting for the lock
+            if any(directory.is_dir() for directory in directories):
+                self.__import_directory_layout(connection, *directories)
+
+    def __import_directory_layout(
+        self,
+        connection: sqlite3.Connection,
+        commits_dir: Path,
+        pull_requests_dir: Path,
+        http_dir: Path,
+        pull_request_reviews_dir: Path,
+    ) -> None:
+        with self.transaction(connection):
+            if pull_request_reviews_dir.is_dir():
+                connection.executemany(
+                    'INSERT OR IGNORE INTO pull_request_reviews (number, data) VALUES (?, ?)',
+                    ((path.stem, path.read_text()) for path in pull_request_reviews_dir.glob('*.json')),
+                )
+
+            if http_dir.is_dir():
+                for path in http_dir.glob('*.json'):
+                    response = json.loads(path.read_text())
+                    connection.execute(
+                        'INSERT OR IGNORE INTO http_responses (url, validators, body) VALUES (?, ?, ?)',
+                        (response['url'], json.dumps(response['validators']), response['body']),
+                    )
+
+            if pull_requests_dir.is_dir():
+                connection.executemany(
+                    'INSERT OR IGNORE INTO pull_requests (number, data) VALUES (?, ?)',
+                    ((path.stem, path.read_text()) for path in pull_requests_dir.glob('*.json')),
+                )
+
+            if commits_dir.is_dir():
+                for directory in commits_dir.iterdir():
+                    entries = list(directory.iterdir())
+                    if not entries:
+                        continue
+
+                    data = entries[0]
+                    if data.stem == 'no_pr':
+                        connection.execute(
+                            'INSERT OR IGNORE INTO commits (hash, pr, data) VALUES (?, NULL, ?)',
+                            (directory.name, data.read_text()),
+                        )
+                    else:
+                        connection.execute(
+                            'INSERT OR IGNORE INTO commits (hash, pr, data) VALUES (?, ?, NULL)',
+                            (directory.name, data.name),
+                        )
+
+        for directory in (commits_dir, pull_requests_dir, http_dir, pull_request_reviews_dir):
+            if directory.is_dir():
+                shutil.rmtree(directory)
 
     @cached_property
     def cache_dir_team_members(self) -> Path:
@@ -48,6 +201,20 @@ class GitHubCache:
         directory.ensure_dir_exists()
         return directory
 
+    @cached_property
+    def merged_pull_requests_file(self) -> Path:
+        path = self.cache_dir / 'merged_pull_requests.json'
+        path.parent.ensure_dir_exists()
+        return path
+
+    @cached_property
+    def merged_pull_requests(self) -> dict[str, dict[str, Any]]:
+        # Merge commit hash -> pull request data
+        if self.merged_pull_requests_file.is_file():
+            return json.loads(self.merged_pull_requests_file.read_text())
+
+        return {}
+
     @cached_property
     def global_config_file(self) -> Path:
         path = self.cache_dir / 'config.json'
@@ -55,65 +222,317 @@ class GitHubCache:
         return path
 
     def save_global_config(self, source: HttpUrl, global_config: dict[str, Any]) -> None:
-        data = {}
-        if self.global_config_file.is_file():
-            data.update(json.loads(self.global_config_file.read_text()))
-
-        data[str(source)] = global_config
-        self.global_config_file.write_atomic(json.dumps(data), 'w', encoding='utf-8')
+        # Other processes may be saving the global config of other sources
+        with self.global_config_file.lock():
+            data = dict(self.__load_global_configs())
+            data[str(source)] = global_config
+            self.global_config_file.write_atomic(json.dumps(data), 'w', encoding='utf-8')
+            self.memory.put(self.global_config_file, data)
 
     def load_global_config(self, source: HttpUrl) -> dict[str, Any]:
-        if not self.global_config_file.is_file():
-            return {}
+        return copy.deepcopy(self.__load_global_configs().get(str(source), {}))
+
+    def __load_global_configs(self) -> dict[str, dict[str, Any]]:
+        # Source -> global config
+        return self.memory.get(self.global_config_file, lambda path: json.loads(path.read_text())) or {}
+
+    def get_http_response(self, url: str) -> dict[str, Any] | None:
+        row = self.database.execute('SELECT validators, body FROM http_responses WHERE url = ?', (url,)).fetchone()
+        if row is None:
+            return None
 
-        return json.loads(self.global_config_file.read_text()).get(str(source), {})
+        return {'url': url, 'validators': json.loads(row[0]), 'body': row[1]}
+
+    def save_http_response(self, url: str, validators: dict[str, str], body: str) -> None:
+        self.database.execute(
+            'INSERT OR REPLACE INTO http_responses (url, validators, body) VALUES (?, ?, ?)',
+            (url, json.dumps(validators), body),
+        )
 
     def get_team_members_file(self, team):
         return self.cache_dir_team_members / f'{team}.txt'
 
     def get_cached_candidate_data_from_commit(self, commit_hash: str):
-        directory = self.cache_dir_commits / commit_hash
-        if not directory.is_dir():
+        row = self.database.execute(
+            """
+            SELECT commits.data, pull_requests.data FROM commits
+            LEFT JOIN pull_requests ON pull_requests.number = commits.pr
+            WHERE commits.hash = ?
+            """,
+            (commit_hash,),
+        ).fetchone()
+        if row is None:
             return
 
-        entries = list(directory.iterdir())
-        if not entries:
-            return
+        data = row[0] if row[0] is not None else row[1]
+        if data is not None:
+            self.__accessed_commits.add(commit_hash)
+            return json.loads(data)
+
+    def get_many(self, commit_hashes: Iterable[str]) -> tuple[dict[str, dict[str, Any]], list[str]]:
+        """
+        Look up the cached candidate data of several commits at once, returning the hits
+        and the hashes of the commits that are not cached, both in the given order.
+        """
+        commit_hashes = list(dict.fromkeys(commit_hashes))
+        found: dict[str, str] = {}
+        for batch_start in range(0, len(commit_hashes), self.BULK_QUERY_SIZE):
+            batch = commit_hashes[batch_start : batch_start + self.BULK_QUERY_SIZE]
+            rows = self.database.execute(
+                f"""
+                SELECT commits.hash, commits.data, pull_requests.data FROM commits
+                LEFT JOIN pull_requests ON pull_requests.number = commits.pr
+                WHERE commits.hash IN ({', '.join('?' * len(batch))})
+                """,  # noqa: S608
+                batch,
+            )
+            batch_found = {
+                commit_hash: data
+                for commit_hash, commit_data, pr_data in rows
+                if (data := commit_data if commit_data is not None else pr_data) is not None
+            }
+            self.__accessed_commits.update(batch_found)
+            found.update(batch_found)
+
+        hits: dict[str, dict[str, Any]] = {}
+        misses: list[str] = []
+        for commit_hash in commit_hashes:
+            if commit_hash in found:
+                hits[commit_hash] = json.loads(found[commit_hash])
+            else:
+                misses.append(commit_hash)
 
-        data = entries[0]
-        if data.stem == 'no_pr':
-            return json.loads(data.read_text())
-        elif (cached_candidate_data := self.cache_dir_pull_requests / f'{data.name}.json').is_file():
-            return json.loads(cached_candidate_data.read_text())
+        self.stats.record('github/commits', hits=len(hits), misses=len(misses))
+        return hits, misses
 
     def get_cached_candidate_data_from_pr_number(self, number: str):
-        if (cached_candidate_data := self.cache_dir_pull_requests / f'{number}.json').is_file():
-            return json.loads(cached_candidate_data.read_text())
+        row = self.database.execute('SELECT data FROM pull_requests WHERE number = ?', (number,)).fetchone()
+        if row is None:
+            self.stats.record('github/pull_requests', misses=1)
+            return
+
+        self.stats.record('github/pull_requests', hits=1)
+        self.__accessed_pull_requests.add(number)
+        return json.loads(row[0])
+
+    def save_access_times(self) -> None:
+        """
+        Record when the commits and pull requests read during this run were last accessed, in a single transaction.
+        """
+        if not self.__accessed_commits and not self.__accessed_pull_requests:
+            return
+
+        accessed_at = time.time()
+        with self.transaction(self.database) as connection:
+            connection.executemany(
+                'UPDATE commits SET accessed_at = ? WHERE hash = ?',
+                ((accessed_at, commit_hash) for commit_hash in self.__accessed_commits),
+            )
+            # Accessing a commit also accesses the pull request it references
+            connection.executemany(
+                'UPDATE pull_requests SET accessed_at = ? WHERE number = (SELECT pr FROM commits WHERE hash = ?)',
+                ((accessed_at, commit_hash) for commit_hash in self.__accessed_commits),
+            )
+            connection.executemany(
+                'UPDATE pull_requests SET accessed_at = ? WHERE number = ?',
+                ((accessed_at, number) for number in self.__accessed_pull_requests),
+            )
+
+        self.__accessed_commits.clear()
+        self.__accessed_pull_requests.clear()
 
     def duplicate_cached_candidate_data_from_pr_number(self, commit_hash: str, number: str):
-        directory = self.cache_dir_commits / commit_hash
-        directory.ensure_dir_exists()
-        (directory / number).touch()
+        self.database.execute(
+            'INSERT OR REPLACE INTO commits (hash, pr, data, accessed_at) VALUES (?, ?, NULL, ?)',
+            (commit_hash, number, time.time()),
+        )
 
-    def cache_candidate_data(self, commit_hash: str, candidate_data: dict):
-        directory = self.cache_dir_commits / commit_hash
-        directory.ensure_dir_exists()
+    def get_pull_request_freshness(self, number: str) -> tuple[float | None, str | None] | None:
+        return self.database.execute(
+            'SELECT fetched_at, updated_at FROM pull_requests WHERE number = ?', (number,)
+        ).fetchone()
+
+    def touch_pull_request(self, number: str, fetched_at: float) -> None:
+        self.database.execute('UPDATE pull_requests SET fetched_at = ? WHERE number = ?', (fetched_at, number))
 
+    def save_pull_request_data(
+        self, candidate_data: dict, *, fetched_at: float | None = None, updated_at: str | None = None
+    ) -> None:
+        self.__save_pull_request_data(self.database, candidate_data, fetched_at=fetched_at, updated_at=updated_at)
+
+    @staticmethod
+    def __save_pull_request_data(
+        connection: sqlite3.Connection,
+        candidate_data: dict,
+        *,
+        fetched_at: float | None = None,
+        updated_at: str | None = None,
+    ) -> None:
+        # Freshness is only recorded when the data comes from GitHub, other writes like team assignment preserve it
+        connection.execute(
+            """
+            INSERT INTO pull_requests (number, data, fetched_at, updated_at, accessed_at) VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (number) DO UPDATE SET
+                data = excluded.data,
+                fetched_at = COALESCE(excluded.fetched_at, fetched_at),
+                updated_at = COALESCE(excluded.updated_at, updated_at),
+                accessed_at = excluded.accessed_at
+            """,
+            (candidate_data['id'], json.dumps(candidate_data, cls=SetEncoder), fetched_at, updated_at, time.time()),
+        )
+
+    def cache_candidate_data(
+        self,
+        commit_hash: str,
+        candidate_data: dict,
+        *,
+        fetched_at: float | None = None,
+        updated_at: str | None = None,
+    ):
+        with self.transaction(self.database) as connection:
+            self.__save_candidate_data(
+                connection, commit_hash, candidate_data, fetched_at=fetched_at, updated_at=updated_at
+            )
+
+    @classmethod
+    def __save_candidate_data(
+        cls,
+        connection: sqlite3.Connection,
+        commit_hash: str,
+        candidate_data: dict,
+        *,
+        fetched_at: float | None = None,
+        updated_at: str | None = None,
+    ) -> None:
         if candidate_data['id'].isdigit():
-            (self.cache_dir_pull_requests / f'{candidate_data["id"]}.json').write_text(
-                json.dumps(candidate_data, cls=SetEncoder)
+            cls.__save_pull_request_data(connection, candidate_data, fetched_at=fetched_at, updated_at=updated_at)
+            connection.execute(
+                'INSERT OR REPLACE INTO commits (hash, pr, data, accessed_at) VALUES (?, ?, NULL, ?)',
+                (commit_hash, candidate_data['id'], time.time()),
             )
-            (directory / candidate_data['id']).touch()
         else:
-            (directory / 'no_pr.json').write_text(json.dumps(candidate_data, cls=SetEncoder))
+            connection.execute(
+                'INSERT OR REPLACE INTO commits (hash, pr, data, accessed_at) VALUES (?, NULL, ?, ?)',
+                (commit_hash, json.dumps(candidate_data, cls=SetEncoder), time.time()),
+            )
 
-    def get_team_members(self, team: str) -> set[str] | None:
-        members_file = self.get_team_members_file(team)
+    def evict(self, max_size: int) -> PruneResult:
+        """
+        Evict the least recently used pull requests and commits of the repository until their combined
+        size is at most `max_size` bytes.
+        """
+        from ddqa.cache.prune import prune_repositories
+
+        return prune_repositories([self.cache_dir], max_size=max_size)
+
+    def defer_candidate_data(self, commit_hash: str, candidate: TestCandidate) -> None:
+        """
+        Cache the data of a candidate once no other candidate has been deferred for a while. Candidates are
+        only serialized when written so that repeated changes to the same candidate result in a single write.
+        """
+        self.__deferred_candidates[commit_hash] = candidate
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.flush_deferred_candidate_data()
+            return
 
-        if members_file.is_file():
-            return set(members_file.read_text().splitlines())
+        if self.__deferred_flush is not None:
+            self.__deferred_flush.cancel()
 
-        return None
+        delay = 0 if len(self.__deferred_candidates) >= self.DEFERRED_WRITE_LIMIT else self.DEFERRED_WRITE_DELAY
+        self.__deferred_flush = loop.call_later(delay, self.__flush_deferred_candidate_data_in_background)
+
+    def flush_deferred_candidate_data(self) -> None:
+        """
+        Write the deferred candidates, waiting for those already being written in the background.
+        """
+        if self.__deferred_flush is not None:
+            self.__deferred_flush.cancel()
+            self.__deferred_flush = None
+
+        self.__writer.submit(self.__write_candidate_data, self.__take_deferred_candidate_data()).result()
+
+    def __flush_deferred_candidate_data_in_background(self) -> None:
+        self.__deferred_flush = None
+        self.__writer.submit(self.__write_candidate_data, self.__take_deferred_candidate_data())
+
+    def __take_deferred_candidate_data(self) -> list[tuple[str, dict[str, Any]]]:
+        candidate_data = [
+            (commit_hash, candidate.model_dump()) for commit_hash, candidate in self.__deferred_candidates.items()
+        ]
+        self.__deferred_candidates.clear()
+
+        # Make sure the database exists before it is written to from another thread
+        if candidate_data:
+            _ = self.database
+
+        return candidate_data
+
+    def __write_candidate_data(self, candidate_data: list[tuple[str, dict[str, Any]]]) -> None:
+        if not candidate_data:
+            return
+
+        # Writes happen on the writer thread so they get their own connection
+        connection = sqlite3.connect(str(self.database_file), isolation_level=None, timeout=30)
+        try:
+            with self.transaction(connection):
+                for commit_hash, data in candidate_data:
+                    self.__save_candidate_data(connection, commit_hash, data)
+        finally:
+            connection.close()
+
+    def get_merged_pull_request(self, merge_commit_hash: str) -> dict[str, Any] | None:
+        return self.merged_pull_requests.get(merge_commit_hash)
+
+    def save_merged_pull_requests(self, pull_requests: dict[str, dict[str, Any]]) -> None:
+        # Merge with the pull requests that other processes have indexed since this one was loaded
+        with self.merged_pull_requests_file.lock():
+            if self.merged_pull_requests_file.is_file():
+                self.merged_pull_requests.update(json.loads(self.merged_pull_requests_file.read_text()))
+
+            self.merged_pull_requests.update(pull_requests)
+
+            # Commits are looked up in the database first so the index is only needed until they are cached,
+            # which keeps it bounded by the number of merge commits that have yet to be resolved
+            for commit_hash in self.__get_cached_commit_hashes(self.merged_pull_requests):
+                del self.merged_pull_requests[commit_hash]
+
+            self.merged_pull_requests_file.write_atomic(json.dumps(self.merged_pull_requests), 'w', encoding='utf-8')
+
+    def __get_cached_commit_hashes(self, commit_hashes: Iterable[str]) -> set[str]:
+        commit_hashes = list(commit_hashes)
+        cached: set[str] = set()
+        for batch_start in range(0, len(commit_hashes), self.BULK_QUERY_SIZE):
+            batch = commit_hashes[batch_start : batch_start + self.BULK_QUERY_SIZE]
+            rows = self.database.execute(
+                f'SELECT hash FROM commits WHERE hash IN ({", ".join("?" * len(batch))})',  # noqa: S608
+                batch,
+            )
+            cached.update(commit_hash for (commit_hash,) in rows)
+
+        return cached
+
+    def get_pull_request_reviewers(self, number: str) -> list[dict[str, str]] | None:
+        row = self.database.execute('SELECT data FROM pull_request_reviews WHERE number = ?', (number,)).fetchone()
+        if row is None:
+            return None
+
+        return json.loads(row[0])
+
+    def save_pull_request_reviewers(self, number: str, reviewers: list[dict[str, str]]) -> None:
+        self.database.execute(
+            'INSERT OR REPLACE INTO pull_request_reviews (number, data) VALUES (?, ?)', (number, json.dumps(reviewers))
+        )
+
+    def get_team_members(self, team: str) -> set[str] | None:
+        members = self.memory.get(
+            self.get_team_members_file(team), lambda path: frozenset(path.read_text().splitlines())
+        )
+        return None if members is None else set(members)
 
     def save_team_members(self, team: str, members: set[str]) -> None:
-        self.get_team_members_file(team).write_text('\n'.join(members))
+        members_file = self.get_team_members_file(team)
+        members_file.write_atomic('\n'.join(members), 'w', encoding='utf-8')
+        self.memory.put(members_file, frozenset(members))
@@ -1,9 +1,12 @@
 # SPDX-FileCopyrightText: 2023-present Datadog, Inc. <dev@datadoghq.com>
 #
 # SPDX-License-Identifier: MIT
+import copy
 import json
 from functools import cached_property
 
+from ddqa.cache.memory import MemoryCache
+from ddqa.cache.stats import CacheStats
 from ddqa.models.jira import JiraIssue
 from ddqa.utils.fs import Path
 
@@ -11,6 +14,16 @@ from ddqa.utils.fs import Path
 class JiraCache:
     def __init__(self, cache_dir: Path) -> None:
         self.__cache_dir = cache_dir
+        self.__stats = CacheStats()
+        self.__memory = MemoryCache()
+
+    @property
+    def stats(self) -> CacheStats:
+        return self.__stats
+
+    @property
+    def memory(self) -> MemoryCache:
+        return self.__memory
 
     @cached_property
     def cache_dir(self) -> Path:
@@ -34,31 +47,34 @@ class JiraCache:
         return path
 
     def get_user_ids(self) -> dict[str, str]:
-        if self.cached_user_id_file.is_file():
-            return json.loads(self.cached_user_id_file.read_text())
-
-        return {}
+        return dict(self.__load_user_ids())
 
     def get_user_id(self, email: str, token: str) -> str | None:
-        user_ids = self.get_user_ids()
-        return user_ids.get(self.__get_user_key(email, token))
+        return self.__load_user_ids().get(self.__get_user_key(email, token))
 
     def save_user_id(self, email: str, token: str, user_id: str) -> None:
-        user_ids = self.get_user_ids()
-        user_ids[self.__get_user_key(email, token)] = user_id
-        self.cached_user_id_file.write_atomic(json.dumps(user_ids), 'w', encoding='utf-8')
+        with self.cached_user_id_file.lock():
+            user_ids = self.get_user_ids()
+            user_ids[self.__get_user_key(email, token)] = user_id
+            self.cached_user_id_file.write_atomic(json.dumps(user_ids), 'w', encoding='utf-8')
+            self.memory.put(self.cached_user_id_file, user_ids)
+
+    def __load_user_ids(self) -> dict[str, str]:
+        return self.memory.get(self.cached_user_id_file, lambda path: json.loads(path.read_text())) or {}
 
     def get_transitions(self, issue: JiraIssue) -> dict[str, dict[str, str]]:
         transitions_file = self.cache_dir_projects / issue.project / 'transitions.json'
-
-        if transitions_file.is_file():
-            return json.loads(transitions_file.read_text())
-
-        return {}
+        transitions = self.memory.get(transitions_file, lambda path: json.loads(path.read_text()))
+        return {} if transitions is None else copy.deepcopy(transitions)
 
     def save_transitions(self, issue: JiraIssue, transitions: dict[str, dict[str, str]]) -> None:
         transitions_file = self.get_transitions_file(issue)
-        transitions_file.write_atomic(json.dumps(transitions), 'w', encoding='utf-8')
+        # Keep the transitions of issue types that other processes have saved
+        with transitions_file.lock():
+            data = self.get_transitions(issue)
+            data.update(copy.deepcopy(transitions))
+            transitions_file.write_atomic(json.dumps(data), 'w', encoding='utf-8')
+            self.memory.put(transitions_file, data)
 
     @staticmethod
     def __get_user_key(email: str, token: str) -> str:
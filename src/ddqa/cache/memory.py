@@ -0,0 +1,73 @@
+# SPDX-FileCopyrightText: 2023-present Datadog, Inc. <dev@datadoghq.com>
+#
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, TypeVar
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from ddqa.utils.fs import Path
+
+T = TypeVar('T')
+
+
+class MemoryCache:
+    """
+    A bounded in-memory tier in front of cache files that keeps their parsed contents. Entries are invalidated
+    whenever their file changes on disk, for example when written by another process, and are updated in place
+    when written through this tier. Values are shared so callers must not modify them.
+    """
+
+    # The number of files whose contents are kept, the least recently used are dropped first
+    MAX_ENTRIES = 256
+
+    def __init__(self) -> None:
+        # Path -> file version and parsed contents
+        self.__entries: OrderedDict[str, tuple[tuple[int, int, int], Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def get(self, path: Path, load: Callable[[Path], T]) -> T | None:
+        key = str(path)
+        version = self.get_version(path)
+        if version is None:
+            self.__entries.pop(key, None)
+            return None
+
+        if (entry := self.__entries.get(key)) is not None and entry[0] == version:
+            self.__entries.move_to_end(key)
+            return entry[1]
+
+        value = load(path)
+        self.__store(key, version, value)
+        return value
+
+    def put(self, path: Path, value: Any) -> None:
+        """
+        Record the contents of a file that was just written.
+        """
+        key = str(path)
+        if (version := self.get_version(path)) is None:
+            self.__entries.pop(key, None)
+        else:
+            self.__store(key, version, value)
+
+    def __store(self, key: str, version: tuple[int, int, int], value: Any) -> None:
+        self.__entries[key] = (version, value)
+        self.__entries.move_to_end(key)
+        while len(self.__entries) > self.MAX_ENTRIES:
+            self.__entries.popitem(last=False)
+
+    @staticmethod
+    def get_version(path: Path) -> tuple[int, int, int] | None:
+        # Atomic writes replace the file so the inode changes even if the modification time does not
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return None
+
+        return stat.st_mtime_ns, stat.st_size, stat.st_ino
@@ -0,0 +1,184 @@
+# SPDX-FileCopyrightText: 2023-present Datadog, Inc. <dev@datadoghq.com>
+#
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+import json
+import sqlite3
+import time
+from typing import TYPE_CHECKING, NamedTuple
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from ddqa.utils.fs import Path
+
+
+class CacheEntry(NamedTuple):
+    accessed_at: float
+    size: int
+    repo_dir: Path
+    # Either a pull request number or the hash of a commit without a pull request
+    key: str
+    is_pull_request: bool
+
+
+class PruneResult:
+    def __init__(self) -> None:
+        self.pull_requests = 0
+        self.commits = 0
+        self.bytes = 0
+
+
+def prune_cache(
+    cache_dir: Path, *, max_size: int | None = None, max_age: float | None = None, now: float | None = None
+) -> PruneResult:
+    """
+    Evict the cached pull requests and commits of every repository, see `prune_repositories`.
+    """
+    github_dir = cache_dir / 'github'
+    return prune_repositories(
+        github_dir.glob('*/*') if github_dir.is_dir() else (), max_size=max_size, max_age=max_age, now=now
+    )
+
+
+def prune_repositories(
+    repo_dirs: Iterable[Path], *, max_size: int | None = None, max_age: float | None = None, now: float | None = None
+) -> PruneResult:
+    """
+    Evict the cached pull requests and commits that were not accessed within `max_age` seconds, and then the least
+    recently used ones until their combined size is at most `max_size` bytes. Pull requests are evicted along with
+    the commits that reference them, their reviews and their cached responses, and so are the indexed merged pull
+    requests that were merged more than `max_age` seconds ago. Other entries like team members are never evicted.
+    """
+    if now is None:
+        now = time.time()
+
+    repo_dirs = list(repo_dirs)
+    entries: list[CacheEntry] = []
+    for repo_dir in repo_dirs:
+        if (repo_dir / 'cache.db').is_file():
+            entries.extend(get_cache_entries(repo_dir))
+
+    # Least recently used first
+    entries.sort(key=lambda entry: entry.accessed_at)
+    evicted: list[CacheEntry] = []
+    if max_age is not None:
+        evicted.extend(entry for entry in entries if entry.accessed_at < now - max_age)
+        entries = entries[len(evicted) :]
+
+    if max_size is not None:
+        size = sum(entry.size for entry in entries)
+        for entry in entries:
+            if size <= max_size:
+                break
+
+            evicted.append(entry)
+            size -= entry.size
+
+    result = PruneResult()
+    evicted_by_repo: dict[Path, list[CacheEntry]] = {}
+    for entry in evicted:
+        evicted_by_repo.setdefault(entry.repo_dir, []).append(entry)
+        result.bytes += entry.size
+        if entry.is_pull_request:
+            result.pull_requests += 1
+        else:
+            result.commits += 1
+
+    for repo_dir, repo_entries in evicted_by_repo.items():
+        remove_cache_entries(repo_dir, repo_entries)
+
+    # Pull requests whose merge commits have yet to be resolved are only kept in the index while they are recent
+    for repo_dir in repo_dirs:
+        remove_merged_pull_requests(
+            repo_dir,
+            (entry.key for entry in evicted_by_repo.get(repo_dir, []) if entry.is_pull_request),
+            merged_before=None if max_age is None else now - max_age,
+        )
+
+    return result
+
+
+def get_cache_entries(repo_dir: Path) -> list[CacheEntry]:
+    from ddqa.cache.github import GitHubCache
+
+    # Databases written by previous versions may not record the time of last access until they are connected to
+    connection = GitHubCache.connect(repo_dir / 'cache.db', timeout=30)
+    try:
+        # Sizes are computed like those of the `cache stats` command
+        pull_requests = connection.execute("""
+            SELECT
+                pull_requests.number,
+                COALESCE(pull_requests.accessed_at, pull_requests.fetched_at, 0),
+                LENGTH(pull_requests.number) + LENGTH(pull_requests.data)
+                    + IFNULL(SUM(LENGTH(commits.hash) + LENGTH(commits.pr)), 0)
+            FROM pull_requests
+            LEFT JOIN commits ON commits.pr = pull_requests.number
+            GROUP BY pull_requests.number
+            """).fetchall()
+        commits = connection.execute(
+            'SELECT hash, IFNULL(accessed_at, 0), LENGTH(hash) + LENGTH(data) FROM commits WHERE data IS NOT NULL'
+        ).fetchall()
+    finally:
+        connection.close()
+
+    return [
+        *(CacheEntry(accessed_at, size, repo_dir, number, True) for number, accessed_at, size in pull_requests),
+        *(CacheEntry(accessed_at, size, repo_dir, commit_hash, False) for commit_hash, accessed_at, size in commits),
+    ]
+
+
+def remove_cache_entries(repo_dir: Path, entries: list[CacheEntry]) -> None:
+    from ddqa.cache.github import GitHubCache
+    from ddqa.utils.github import GitHubRepository
+
+    numbers = [entry.key for entry in entries if entry.is_pull_request]
+    commit_hashes = [entry.key for entry in entries if not entry.is_pull_request]
+
+    # The cache directory of a repository is named after its organization and repository
+    org, repo_name = repo_dir.parent.name, repo_dir.name
+    urls = [
+        api.format(org=org, repo=repo_name, number=number)
+        for number in numbers
+        for api in (GitHubRepository.PULL_REQUEST_API, GitHubRepository.PR_REVIEWS_API)
+    ]
+
+    connection = sqlite3.connect(str(repo_dir / 'cache.db'), isolation_level=None, timeout=30)
+    try:
+        with GitHubCache.transaction(connection):
+            connection.executemany('DELETE FROM pull_requests WHERE number = ?', ((number,) for number in numbers))
+            connection.executemany('DELETE FROM commits WHERE pr = ?', ((number,) for number in numbers))
+            connection.executemany(
+                'DELETE FROM commits WHERE hash = ?', ((commit_hash,) for commit_hash in commit_hashes)
+            )
+            connection.executemany(
+                'DELETE FROM pull_request_reviews WHERE number = ?', ((number,) for number in numbers)
+            )
+            connection.executemany('DELETE FROM http_responses WHERE url = ?', ((url,) for url in urls))
+    finally:
+        connection.close()
+
+
+def remove_merged_pull_requests(repo_dir: Path, numbers: Iterable[str], merged_before: float | None = None) -> None:
+    """
+    Remove the given pull requests from the index of merged pull requests, along with those merged before
+    the given timestamp.
+    """
+    from datetime import datetime
+
+    index_file = repo_dir / 'merged_pull_requests.json'
+    if not index_file.is_file():
+        return
+
+    numbers = set(numbers)
+    with index_file.lock():
+        merged_pull_requests = json.loads(index_file.read_text())
+        kept = {
+            merge_commit_hash: pr_data
+            for merge_commit_hash, pr_data in merged_pull_requests.items()
+            if str(pr_data['number']) not in numbers
+            and (merged_before is None or datetime.fromisoformat(pr_data['merged_at']).timestamp() >= merged_before)
+        }
+        if len(kept) != len(merged_pull_requests):
+            index_file.write_atomic(json.dumps(kept), 'w', encoding='utf-8')
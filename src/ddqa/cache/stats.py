@@ -0,0 +1,134 @@
+# SPDX-FileCopyrightText: 2023-present Datadog, Inc. <dev@datadoghq.com>
+#
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import time
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from ddqa.utils.fs import Path
+
+
+class CacheStats:
+    """
+    Hits and misses of cache lookups per namespace, saved at the end of every run.
+    """
+
+    # The number of runs for which statistics are kept
+    MAX_RUNS = 20
+
+    def __init__(self) -> None:
+        # Namespace -> hits and misses
+        self.__counts: dict[str, dict[str, int]] = {}
+
+    @property
+    def counts(self) -> dict[str, dict[str, int]]:
+        return self.__counts
+
+    def record(self, namespace: str, *, hits: int = 0, misses: int = 0) -> None:
+        counts = self.__counts.setdefault(namespace, {'hits': 0, 'misses': 0})
+        counts['hits'] += hits
+        counts['misses'] += misses
+
+    @staticmethod
+    def get_file(cache_dir: Path) -> Path:
+        return cache_dir / 'stats.json'
+
+    @classmethod
+    def load_runs(cls, cache_dir: Path) -> list[dict]:
+        stats_file = cls.get_file(cache_dir)
+        if stats_file.is_file():
+            return json.loads(stats_file.read_text())
+
+        return []
+
+    @classmethod
+    def save_run(cls, cache_dir: Path, *all_stats: CacheStats) -> None:
+        counts: dict[str, dict[str, int]] = {}
+        for stats in all_stats:
+            for namespace, namespace_counts in stats.counts.items():
+                counts.setdefault(namespace, {'hits': 0, 'misses': 0})
+                counts[namespace]['hits'] += namespace_counts['hits']
+                counts[namespace]['misses'] += namespace_counts['misses']
+
+        if not counts:
+            return
+
+        cache_dir.ensure_dir_exists()
+        stats_file = cls.get_file(cache_dir)
+        with stats_file.lock():
+            runs = cls.load_runs(cache_dir)
+            runs.append({'time': time.time(), 'counts': counts})
+            stats_file.write_atomic(json.dumps(runs[-cls.MAX_RUNS :]), 'w', encoding='utf-8')
+
+
+class NamespaceUsage:
+    def __init__(self) -> None:
+        self.entries = 0
+        self.bytes = 0
+        self.inodes = 0
+
+
+def get_cache_usage(cache_dir: Path) -> dict[str, NamespaceUsage]:
+    """
+    Compute the number of entries, bytes and inodes of each cache namespace. Namespaces that are
+    stored in a database only account for the size of their data and do not use their own inodes.
+    """
+    usage = {
+        namespace: NamespaceUsage()
+        for namespace in ('github/commits', 'github/pull_requests', 'github/team_members', 'jira/projects')
+    }
+
+    github_dir = cache_dir / 'github'
+    for repo_dir in (github_dir.glob('*/*') if github_dir.is_dir() else ()):
+        if (database_file := repo_dir / 'cache.db').is_file():
+            connection = sqlite3.connect(f'{database_file.as_uri()}?mode=ro', uri=True)
+            try:
+                for namespace, query in (
+                    (
+                        'github/commits',
+                        'SELECT COUNT(*), SUM(LENGTH(hash) + IFNULL(LENGTH(pr), 0) + IFNULL(LENGTH(data), 0)) '
+                        'FROM commits',
+                    ),
+                    ('github/pull_requests', 'SELECT COUNT(*), SUM(LENGTH(number) + LENGTH(data)) FROM pull_requests'),
+                ):
+                    entries, size = connection.execute(query).fetchone()
+                    usage[namespace].entries += entries
+                    usage[namespace].bytes += size or 0
+            finally:
+                connection.close()
+
+        if (team_members_dir := repo_dir / 'team_members').is_dir():
+            add_directory_usage(usage['github/team_members'], team_members_dir)
+
+    if (projects_dir := cache_dir / 'jira' / 'projects').is_dir():
+        add_directory_usage(usage['jira/projects'], projects_dir)
+
+    total = usage['total'] = NamespaceUsage()
+    if cache_dir.is_dir():
+        add_directory_usage(total, cache_dir)
+
+    return usage
+
+
+def add_directory_usage(usage: NamespaceUsage, directory: Path) -> None:
+    usage.inodes += 1
+    for entry in walk(directory):
+        usage.inodes += 1
+        if entry.is_file(follow_symlinks=False):
+            usage.entries += 1
+            usage.bytes += entry.stat(follow_symlinks=False).st_size
+
+
+def walk(directory: str | os.PathLike[str]) -> Iterator[os.DirEntry]:
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            yield entry
+            if entry.is_dir(follow_symlinks=False):
+                yield from walk(entry.path)
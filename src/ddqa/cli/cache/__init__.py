@@ -4,8 +4,13 @@
 import click
 
 from ddqa.cli.cache.explore import explore
+from ddqa.cli.cache.export import export
 from ddqa.cli.cache.find import find
+from ddqa.cli.cache.import_ import import_
+from ddqa.cli.cache.prune import prune
 from ddqa.cli.cache.purge import purge
+from ddqa.cli.cache.stats import stats
+from ddqa.cli.cache.warm import warm
 
 
 @click.group(short_help='Manage the cache')
@@ -14,5 +19,10 @@ def cache():
 
 
 cache.add_command(explore)
+cache.add_command(export)
 cache.add_command(find)
+cache.add_command(import_)
+cache.add_command(prune)
 cache.add_command(purge)
+cache.add_command(stats)
+cache.add_command(warm)
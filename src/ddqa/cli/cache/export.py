@@ -0,0 +1,19 @@
+# SPDX-FileCopyrightText: 2023-present Datadog, Inc. <dev@datadoghq.com>
+#
+# SPDX-License-Identifier: MIT
+import click
+
+
+@click.command(short_help='Export the cache to a bundle')
+@click.argument('path', type=click.Path(dir_okay=False, writable=True))
+@click.pass_obj
+def export(app, path):
+    """Write the GitHub and Jira caches to a compressed bundle that can be imported elsewhere."""
+    from ddqa.cache.bundle import export_cache
+    from ddqa.utils.fs import Path
+
+    result = export_cache(app.cache_dir, Path(path))
+    app.print(
+        f'Exported {result.pull_requests} pull request(s), {result.commits} commit(s) and {result.files} file(s) '
+        f'to {path}'
+    )
@@ -0,0 +1,26 @@
+# SPDX-FileCopyrightText: 2023-present Datadog, Inc. <dev@datadoghq.com>
+#
+# SPDX-License-Identifier: MIT
+import click
+
+
+@click.command('import', short_help='Import a bundle into the cache')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.pass_obj
+def import_(app, path):
+    """
+    Merge a bundle created by the `export` command into the cache. Entries that are already cached are only
+    replaced by those that were fetched more recently.
+    """
+    from ddqa.cache.bundle import import_cache
+    from ddqa.utils.fs import Path
+
+    try:
+        result = import_cache(app.cache_dir, Path(path))
+    except ValueError as e:
+        raise click.ClickException(str(e)) from None
+
+    app.print(
+        f'Imported {result.pull_requests} pull request(s), {result.commits} commit(s) and {result.files} file(s) '
+        f'from {path}'
+    )
@@ -0,0 +1,26 @@
+# SPDX-FileCopyrightText: 2023-present Datadog, Inc. <dev@datadoghq.com>
+#
+# SPDX-License-Identifier: MIT
+import click
+
+
+@click.command(short_help='Evict the least recently used cache entries')
+@click.option('--max-size', type=click.IntRange(min=0), help='The maximum number of bytes of cached pull requests')
+@click.option('--max-age', type=click.IntRange(min=0), help='Evict entries not used within this many seconds')
+@click.pass_obj
+def prune(app, max_size, max_age):
+    """
+    Evict the cached pull requests and commits of every repository that were not used recently. Team members,
+    Jira transitions and Jira user IDs are kept.
+    """
+    from ddqa.cache.prune import prune_cache
+
+    if max_size is None and max_age is None:
+        message = 'At least one of `--max-size` or `--max-age` is required'
+        raise click.UsageError(message)
+
+    result = prune_cache(app.cache_dir, max_size=max_size, max_age=max_age)
+    app.print(
+        f'Removed {result.pull_requests} pull request(s) and {result.commits} commit(s), '
+        f'freeing {result.bytes} bytes'
+    )
@@ -0,0 +1,41 @@
+# SPDX-FileCopyrightText: 2023-present Datadog, Inc. <dev@datadoghq.com>
+#
+# SPDX-License-Identifier: MIT
+import click
+
+
+@click.command(short_help='Show the usage and hit rates of the cache')
+@click.pass_obj
+def stats(app):
+    """Show the number of entries, bytes and inodes used by each cache namespace and the hit rates of recent runs."""
+    from ddqa.cache.stats import CacheStats, get_cache_usage
+
+    usage = get_cache_usage(app.cache_dir)
+    width = max(map(len, usage))
+
+    app.print(f'{"Namespace":<{width}}  {"Entries":>8}  {"Bytes":>12}  {"Inodes":>8}')
+    for namespace, namespace_usage in usage.items():
+        app.print(
+            f'{namespace:<{width}}  {namespace_usage.entries:>8}  {namespace_usage.bytes:>12}  '
+            f'{namespace_usage.inodes:>8}'
+        )
+
+    runs = CacheStats.load_runs(app.cache_dir)
+    if not runs:
+        app.print('\nNo hit rates recorded yet')
+        return
+
+    counts: dict[str, dict[str, int]] = {}
+    for run in runs:
+        for namespace, namespace_counts in run['counts'].items():
+            counts.setdefault(namespace, {'hits': 0, 'misses': 0})
+            counts[namespace]['hits'] += namespace_counts['hits']
+            counts[namespace]['misses'] += namespace_counts['misses']
+
+    width = max(width, *map(len, counts))
+    app.print(f'\nHit rates of the last {len(runs)} run{"s" if len(runs) > 1 else ""}:')
+    app.print(f'{"Namespace":<{width}}  {"Hits":>8}  {"Misses":>8}  {"Rate":>7}')
+    for namespace, namespace_counts in sorted(counts.items()):
+        hits, misses = namespace_counts['hits'], namespace_counts['misses']
+        rate = f'{hits / (hits + misses):.1%}' if hits + misses else '-'
+        app.print(f'{namespace:<{width}}  {hits:>8}  {misses:>8}  {rate:>7}')
@@ -0,0 +1,54 @@
+# SPDX-FileCopyrightText: 2023-present Datadog, Inc. <dev@datadoghq.com>
+#
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import click
+
+if TYPE_CHECKING:
+    from ddqa.app.core import Application
+
+
+@click.command(short_help='Fill the cache with the candidates of a commit range')
+@click.argument('previous_ref')
+@click.argument('current_ref')
+@click.option(
+    '--concurrency',
+    type=click.IntRange(min=1),
+    help='The number of candidates to resolve at the same time, defaulting to the `github_concurrency` option',
+)
+@click.pass_obj
+def warm(app: Application, previous_ref: str, current_ref: str, concurrency: int | None):
+    """
+    Resolve the candidates of the commits between two refs without the UI so that creating QA items for the
+    same range later on finds them in the cache.
+    """
+    import asyncio
+
+    from ddqa.utils.network import ConsoleStatus, ResponsiveNetworkClient
+
+    if errors := app.config_errors():
+        for error in errors:
+            app.print(error)
+
+        message = 'Invalid configuration, run `ddqa` to fix it'
+        raise click.ClickException(message)
+
+    if concurrency is not None:
+        app.config.app.github_concurrency = concurrency
+
+    commits = app.git.get_mutually_exclusive_commits(previous_ref, current_ref)
+    app.print(f'Warming the cache with {len(commits)} commit(s) for {previous_ref}..{current_ref}')
+
+    async def warm_candidates() -> tuple[int, int]:
+        async with ResponsiveNetworkClient(ConsoleStatus(app.print)) as client:
+            return await app.github.warm_candidates(client, commits, app.repo.ignored_labels, app.config.app.pr_labels)
+
+    try:
+        candidates, ignored = asyncio.run(warm_candidates())
+    finally:
+        app.save_caches()
+
+    app.print(f'Cached {candidates} candidate(s), {ignored} ignored')
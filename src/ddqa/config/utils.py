@@ -2,12 +2,15 @@
 #
 # SPDX-License-Identifier: MIT
 SCRUBBED_VALUE = '*****'
-SCRUBBED_GLOBS = ('github.token', 'jira.token')
+SCRUBBED_GLOBS = ('github.token', 'github.tokens', 'jira.token')
 
 
 def scrub_config(config: dict):
     if 'token' in config.get('github', {}):
         config['github']['token'] = SCRUBBED_VALUE
 
+    if isinstance(config.get('github', {}).get('tokens'), list):
+        config['github']['tokens'] = [SCRUBBED_VALUE for _ in config['github']['tokens']]
+
     if 'token' in config.get('jira', {}):
         config['jira']['token'] = SCRUBBED_VALUE
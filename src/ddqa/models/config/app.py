@@ -3,10 +3,22 @@
 # SPDX-License-Identifier: MIT
 from __future__ import annotations
 
-from pydantic import BaseModel
+from typing import Annotated
+
+from pydantic import BaseModel, Field
 
 
 class AppConfig(BaseModel):
     repo: str = ''
     cache_dir: str = ''
     pr_labels: list[str] = []
+    github_concurrency: Annotated[int, Field(ge=1)] = 8
+    github_graphql: bool = False
+    github_subject_resolution: bool = False
+    github_search_batch_size: Annotated[int, Field(ge=1)] = 1
+    github_pr_sweep: bool = False
+    github_lazy_reviews: bool = True
+    github_cache_max_age: Annotated[int, Field(ge=0)] = 0
+    github_cache_max_size: Annotated[int, Field(ge=0)] = 0
+    jira_bulk_create: bool = False
+    jira_concurrency: Annotated[int, Field(ge=1)] = 1
@@ -1,15 +1,31 @@
 # SPDX-FileCopyrightText: 2023-present Datadog, Inc. <dev@datadoghq.com>
 #
 # SPDX-License-Identifier: MIT
-from pydantic import BaseModel
+from pydantic import BaseModel, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class GitHubAuth(BaseSettings):
     user: str
     token: str
+    # Tokens of other accounts or GitHub Apps whose rate limits are pooled with that of the main token
+    tokens: list[str] = []
     model_config = SettingsConfigDict(env_prefix='DDQA_GITHUB_')
 
+    @field_validator('tokens')
+    @classmethod
+    def check_tokens(cls, v, info):
+        # Rate limits are per account so repeating a token would not increase the pool
+        if len(set(v)) != len(v) or info.data.get('token') in v:
+            message = 'must not repeat any token, including the main token'
+            raise ValueError(message)
+
+        return v
+
+    @property
+    def token_pool(self) -> list[str]:
+        return [self.token, *self.tokens]
+
 
 class JiraAuth(BaseSettings):
     email: str
@@ -24,7 +24,8 @@ class TestCandidate(BaseModel):
     user_url: str = ''
     body: str = ''
     labels: list[PullRequestLabel] = []
-    reviewers: list[PullRequestReviewer] = []
+    # This is `None` until fetched when reviews are lazily resolved
+    reviewers: list[PullRequestReviewer] | None = []
     assigned_teams: set[str] = set()
 
     def short_display(self) -> str:
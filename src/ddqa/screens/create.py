@@ -3,8 +3,9 @@
 # SPDX-License-Identifier: MIT
 from __future__ import annotations
 
+import asyncio
 import typing
-from collections import defaultdict
+from collections import defaultdict, deque
 
 from rich.markdown import Markdown as RichMarkdown
 from rich.markup import escape
@@ -65,7 +66,7 @@ class Candidate:
             else:
                 self.data.assigned_teams.discard(team_name)
 
-            self.__cache.cache_candidate_data(self.data.id, self.data.model_dump())
+            self.__cache.defer_candidate_data(self.data.id, self.data)
 
 
 class CandidateListing(DataTable):
@@ -123,35 +124,43 @@ class CandidateListing(DataTable):
             return
 
         total = len(commits)
-        num_candidates = 0
 
         self.app.print(f'Beginning to load candidates for commits for {self.previous_ref}..{self.current_ref}')
         self.sidebar.status.loading()
 
+        # Stale candidates are shown right away and revalidated in the background while loading continues
+        stale: asyncio.Queue[Candidate | None] = asyncio.Queue()
         async with ResponsiveNetworkClient(self.sidebar.status) as client:
-            async for model, index, ignored in self.app.github.get_candidates(
-                client,
-                commits,
-                self.app.repo.ignored_labels,
-                self.pr_labels,
-            ):
-                shown_index = str(index + 1)
-                self.sidebar.label.update(f' {shown_index} / {total} ({ignored} ignored)')
-
-                if model is not None:
-                    self.app.print(f'Processing {model.long_display()}')
-
-                    if model.user and not model.assigned_teams:
-                        author_team = await self.app.github.get_author_team(client, model.user, self.app.repo.teams)
-                        if author_team:
-                            model.assigned_teams = {author_team}
-
-                    candidate = Candidate(model, self.app.repo, self.app.github.cache)
-                    self.candidates[num_candidates] = candidate
-                    self.add_row(candidate.status_indicator, escape(model.title.strip()), key=str(num_candidates))
-                    num_candidates += 1
-
-        if not num_candidates:
+            revalidation = self.run_worker(self.__revalidate_candidates(client, stale), group='revalidation')
+            try:
+                async for model, index, ignored in self.app.github.get_candidates(
+                    client,
+                    commits,
+                    self.app.repo.ignored_labels,
+                    self.pr_labels,
+                ):
+                    shown_index = str(index + 1)
+                    self.sidebar.label.update(f' {shown_index} / {total} ({ignored} ignored)')
+
+                    if model is not None:
+                        self.app.print(f'Processing {model.long_display()}')
+                        await self.__assign_author_team(client, model)
+
+                        # Rows are keyed by their position since revalidated candidates may be removed
+                        row = len(self.candidates)
+                        candidate = Candidate(model, self.app.repo, self.app.github.cache)
+                        self.candidates[row] = candidate
+                        self.add_row(candidate.status_indicator, escape(model.title.strip()), key=str(row))
+                        if self.app.github.is_stale(model):
+                            stale.put_nowait(candidate)
+            except BaseException:
+                revalidation.cancel()
+                raise
+
+            stale.put_nowait(None)
+            await revalidation.wait()
+
+        if not self.candidates:
             self.app.print('No candidates found')
             self.sidebar.label.update(' No candidates ')
             self.sidebar.status.update(f'{self.previous_ref} -> {self.current_ref}')
@@ -160,7 +169,75 @@ class CandidateListing(DataTable):
         self.app.print('Finished processing candidates')
         self.sidebar.update_assignment_status()
 
+    async def __revalidate_candidates(
+        self, client: ResponsiveNetworkClient, stale: asyncio.Queue[Candidate | None]
+    ) -> None:
+        semaphore = asyncio.Semaphore(self.app.config.app.github_concurrency)
+
+        async def revalidate(candidate: Candidate) -> None:
+            async with semaphore:
+                self.app.print(f'Revalidating {candidate.data.long_display()}')
+                model = await self.app.github.revalidate_candidate(client, candidate.data)
+                if model is None:
+                    return
+
+                if self.app.github.is_ignored(model, self.app.repo.ignored_labels, self.pr_labels):
+                    self.app.print(f'Ignoring {model.long_display()}')
+                    self.__remove_candidate(candidate)
+                    # Supersede the pending write of the team assigned when the candidate was loaded
+                    self.app.github.cache.defer_candidate_data(model.id, model)
+                    return
+
+                await self.__assign_author_team(client, model)
+
+            # The row may have moved while waiting for the author's team
+            row = next(row for row, listed in self.candidates.items() if listed is candidate)
+            revalidated = Candidate(model, self.app.repo, self.app.github.cache)
+            self.candidates[row] = revalidated
+            self.update_cell(str(row), 'status', revalidated.status_indicator)
+            self.update_cell(str(row), 'title', escape(model.title.strip()), update_width=True)
+
+        tasks: list[asyncio.Task] = []
+        try:
+            while (candidate := await stale.get()) is not None:
+                tasks.append(asyncio.create_task(revalidate(candidate)))
+
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def __remove_candidate(self, candidate: Candidate) -> None:
+        # Rows are keyed by their position so the rows that follow are shifted up
+        cursor_row = self.cursor_row
+        candidates = [listed for listed in self.candidates.values() if listed is not candidate]
+        self.candidates.clear()
+        self.clear()
+        for row, listed in enumerate(candidates):
+            self.candidates[row] = listed
+            self.add_row(listed.status_indicator, escape(listed.data.title.strip()), key=str(row))
+
+        if candidates:
+            self.move_cursor(row=min(cursor_row, len(candidates) - 1))
+
+    async def __assign_author_team(self, client: ResponsiveNetworkClient, model: TestCandidate) -> None:
+        if not model.user or model.assigned_teams:
+            return
+
+        author_teams = await self.app.github.get_author_teams(client, model.user, self.app.repo.teams)
+        if len(author_teams) > 1:
+            self.app.print(
+                f'Author {model.user} belongs to several teams ({", ".join(author_teams)}), '
+                f'assigning to: {author_teams[0]}'
+            )
+        if author_teams:
+            model.assigned_teams = {author_teams[0]}
+
     async def on_worker_state_changed(self, event: Worker.StateChanged) -> None:
+        # Loading only finishes once every revalidation has
+        if event.worker.group == 'revalidation':
+            return
+
         if event.state not in (WorkerState.PENDING, WorkerState.RUNNING) and self.auto_mode:
             await self.sidebar.create_cards_or_exit()
 
@@ -188,57 +265,68 @@ class CandidateListing(DataTable):
         self.app.print(f'Candidates ready for creation: {total}')
         self.sidebar.status.update('Creating...')
         async with ResponsiveNetworkClient(self.sidebar.status) as client:
-            for index, candidate in list(self.candidates.items()):
-                self.app.print(f'Creating issue for {candidate.data.long_display()}')
-
-                assignments: dict[str, str | None] = {}
-                for team, assigned in candidate.assignments.items():
-                    if not assigned:
-                        continue
-
-                    team_members = await self.app.github.get_team_members(client, self.app.repo.teams[team].github_team)
-
-                    assignee = get_assignee(
-                        team_members,
-                        self.app.jira.config,
-                        candidate.data,
-                        self.app.repo.teams[team],
-                        assignment_counts,
-                    )
-
-                    if assignee:
-                        assignment_counts[self.app.repo.teams[team].github_team][assignee] += 1
-
-                    assignments[team] = assignee
+            # Every assignment is chosen before creating any issue, without waiting on requests
+            team_members = await self.__prefetch_assignment_data(client)
+            planned: list[tuple[int, Candidate, dict[str, str | None]]] = [
+                (index, candidate, self.__plan_assignments(candidate, team_members, assignment_counts))
+                for index, candidate in self.candidates.items()
+            ]
+
+            if self.app.config.app.jira_bulk_create:
+                self.app.print(f'Creating the issues of {total} candidates in bulk')
                 try:
-                    created_issues = await self.app.jira.create_issues(client, candidate.data, self.labels, assignments)
+                    results = await self.app.jira.create_issues_bulk(
+                        client, [(candidate.data, assignments) for _, candidate, assignments in planned], self.labels
+                    )
                 except Exception as e:
                     self.sidebar.status.update(escape(str(e)))
                     return
 
-                self.sidebar.label.update(f' {index + 1} / {total} ')
-
-                result = DataTable(classes='assignment-result')
-                result.add_columns('Team', 'Assignee', 'Issue')
-                for assignee, (team, issue_url) in zip(assignments.values(), created_issues.items(), strict=True):
-                    github_user = (
-                        self.app.jira.config.get_github_user_id_from_jira_user_id(assignee) if assignee else None
-                    )
-                    result.add_row(
-                        team,
-                        f'[link=https://github.com/{github_user}]{github_user}[/link]' if github_user else '',
-                        f'[link={issue_url}]{issue_url.rpartition("/")[2]}[/link]',
+                for (index, candidate, assignments), (created_issues, failed_issues) in zip(
+                    planned, results, strict=True
+                ):
+                    self.sidebar.label.update(f' {index + 1} / {total} ')
+                    await self.__show_result(
+                        index, candidate, assignments, created_issues, failed_issues, update=not display_updated
                     )
+                    display_updated = True
+            else:
 
-                await self.app.query_one(CandidateRendering).add_assignment_result(
-                    candidate.data.id,
-                    HorizontalScroll(result, classes='assignment-result-box'),
-                    update=not display_updated,
-                )
-                self.update_cell(str(index), 'status', len(created_issues), update_width=True)
+                async def create_issues(candidate: Candidate, assignments: dict[str, str | None]) -> dict[str, str]:
+                    self.app.print(f'Creating issue for {candidate.data.long_display()}')
+                    return await self.app.jira.create_issues(client, candidate.data, self.labels, assignments)
 
-                if not display_updated:
-                    display_updated = True
+                # Create the issues of up to the configured number of candidates at the same time while still
+                # showing results in order, starting the next candidate whenever the oldest one is shown
+                remaining = iter(planned)
+                pending: deque[tuple[int, Candidate, dict[str, str | None], asyncio.Task]] = deque()
+                try:
+                    while True:
+                        while len(pending) < self.app.config.app.jira_concurrency and (
+                            next_planned := next(remaining, None)
+                        ):
+                            index, candidate, assignments = next_planned
+                            task = asyncio.create_task(create_issues(candidate, assignments))
+                            pending.append((index, candidate, assignments, task))
+
+                        if not pending:
+                            break
+
+                        index, candidate, assignments, task = pending.popleft()
+                        try:
+                            created_issues = await task
+                        except Exception as e:
+                            self.sidebar.status.update(escape(str(e)))
+                            return
+
+                        self.sidebar.label.update(f' {index + 1} / {total} ')
+                        await self.__show_result(
+                            index, candidate, assignments, created_issues, {}, update=not display_updated
+                        )
+                        display_updated = True
+                finally:
+                    for *_, task in pending:
+                        task.cancel()
 
         self.app.print('Finished creating issues')
         self.sidebar.status.update('Finished')
@@ -247,6 +335,103 @@ class CandidateListing(DataTable):
         if self.sidebar.auto_mode:
             self.app.exit()
 
+    async def __prefetch_assignment_data(self, client: ResponsiveNetworkClient) -> dict[str, set[str]]:
+        """
+        Fetch the reviewers and team members that assignments depend on, returning the members of every GitHub team.
+        """
+        from ddqa.models.github import PullRequestReviewer
+
+        semaphore = asyncio.Semaphore(self.app.config.app.github_concurrency)
+        team_members: dict[str, set[str]] = {}
+
+        async def fetch_reviewers(candidate: Candidate) -> None:
+            async with semaphore:
+                reviewers = await self.app.github.get_pull_request_reviewers(client, candidate.data.id)
+                candidate.data.reviewers = [PullRequestReviewer(**reviewer) for reviewer in reviewers]
+
+        async def fetch_team_members(github_team: str) -> None:
+            async with semaphore:
+                team_members[github_team] = await self.app.github.get_team_members(client, github_team)
+
+        github_teams = {
+            self.app.repo.teams[team].github_team: None
+            for candidate in self.candidates.values()
+            for team, assigned in candidate.assignments.items()
+            if assigned
+        }
+        await asyncio.gather(
+            *(fetch_reviewers(candidate) for candidate in self.candidates.values() if candidate.data.reviewers is None),
+            *(fetch_team_members(github_team) for github_team in github_teams),
+        )
+
+        return team_members
+
+    def __plan_assignments(
+        self,
+        candidate: Candidate,
+        team_members: dict[str, set[str]],
+        assignment_counts: dict[str, dict[str, int]],
+    ) -> dict[str, str | None]:
+        assignments: dict[str, str | None] = {}
+        for team, assigned in candidate.assignments.items():
+            if not assigned:
+                continue
+
+            team_config = self.app.repo.teams[team]
+            # Members are removed from the given set as they are ruled out
+            assignee = get_assignee(
+                set(team_members[team_config.github_team]),
+                self.app.jira.config,
+                candidate.data,
+                team_config,
+                assignment_counts,
+            )
+
+            if assignee:
+                assignment_counts[team_config.github_team][assignee] += 1
+
+            assignments[team] = assignee
+
+        return assignments
+
+    async def __show_result(
+        self,
+        index: int,
+        candidate: Candidate,
+        assignments: dict[str, str | None],
+        created_issues: dict[str, str],
+        failed_issues: dict[str, str],
+        *,
+        update: bool,
+    ) -> None:
+        result = DataTable(classes='assignment-result')
+        result.add_columns('Team', 'Assignee', 'Issue')
+        # Every assigned team has either an issue or an error
+        outcomes = dict(created_issues, **failed_issues)
+        for team, assignee in assignments.items():
+            github_user = self.app.jira.config.get_github_user_id_from_jira_user_id(assignee) if assignee else None
+            outcome = outcomes[team]
+            if team in failed_issues:
+                self.app.print(
+                    f'Failed to create the issue of team `{team}` for {candidate.data.long_display()}: {outcome}'
+                )
+                issue = f'[red]{escape(outcome)}[/red]'
+            else:
+                issue = f'[link={outcome}]{outcome.rpartition("/")[2]}[/link]'
+
+            result.add_row(
+                team,
+                f'[link=https://github.com/{github_user}]{github_user}[/link]' if github_user else '',
+                issue,
+            )
+
+        await self.app.query_one(CandidateRendering).add_assignment_result(
+            candidate.data.id,
+            HorizontalScroll(result, classes='assignment-result-box'),
+            update=update,
+        )
+        self.update_cell(str(index), 'status', len(created_issues), update_width=True)
+
 
 class StatusLabel(Label):
     def loading(self) -> None:
@@ -577,7 +762,9 @@ def get_assignee(
     if not jira_team_members:
         return jira_config.get_jira_user_id_from_github_user_id(candidate.user)
 
-    reviewers = jira_config.get_jira_user_ids_from_github_user_ids({reviewer.name for reviewer in candidate.reviewers})
+    reviewers = jira_config.get_jira_user_ids_from_github_user_ids(
+        {reviewer.name for reviewer in candidate.reviewers or ()}
+    )
     member_keys = {member: (counts[member], member in reviewers) for member in jira_team_members}
 
     priorities: dict[tuple[int, bool], list[str]] = defaultdict(list)
@@ -3,6 +3,7 @@
 # SPDX-License-Identifier: MIT
 from __future__ import annotations
 
+import time
 from abc import ABC, abstractmethod
 from collections.abc import Iterable
 from datetime import datetime, timedelta
@@ -39,6 +40,11 @@ class IssueFilter(ABC):
     def add(self, filter_key: str, issue: JiraIssue):
         self.issues.setdefault(filter_key, {})[issue.key] = issue
 
+    def remove(self, issue_key: str):
+        # Filter keys are kept even without issues as they may be selected
+        for issues in self.issues.values():
+            issues.pop(issue_key, None)
+
     @abstractmethod
     def update(self, old_issue: JiraIssue, new_issue: JiraIssue):
         pass
@@ -61,13 +67,28 @@ class MemberIssueFilter(IssueFilter):
 class FilterSelect(Select):
     def __init__(self, issue_filter: IssueFilter, css_id: str | None = None):
         self.__issue_filter = issue_filter
+        self.__filter_keys = sorted(self.__issue_filter.issues)
 
-        super().__init__(((issue, issue) for issue in sorted(self.__issue_filter.issues)), id=css_id)
+        super().__init__(((filter_key, filter_key) for filter_key in self.__filter_keys), id=css_id)
 
     @property
     def issue_filter(self) -> IssueFilter:
         return self.__issue_filter
 
+    def update_options(self) -> None:
+        """
+        Add the filter keys that were added since the options were last set, keeping the current selection.
+        """
+        filter_keys = sorted(self.__issue_filter.issues)
+        if filter_keys == self.__filter_keys:
+            return
+
+        self.__filter_keys = filter_keys
+        value = self.value
+        with self.prevent(Select.Changed):
+            self.set_options((filter_key, filter_key) for filter_key in filter_keys)
+            self.value = value
+
 
 class FormattedTimeDelta:
     def __init__(self, td: timedelta):
@@ -350,6 +371,7 @@ class StatusScreen(Screen):
 
         self.__labels = labels
         self.__current_user_id = ''
+        self.__refreshed_at = 0.0
         self.__team_filter = TeamIssueFilter()
         self.__member_filter = MemberIssueFilter()
         self.__refresh_button = Button('Refresh', variant='primary', id='refresh-submission')
@@ -443,8 +465,11 @@ class StatusScreen(Screen):
         issues_found = False
 
         self.sidebar.status.update('Loading...')
+        self.__refreshed_at = time.time()
         async with ResponsiveNetworkClient(self.sidebar.status) as client:
-            async for issue in self.app.jira.search_issues(client, self.labels):
+            async for issue in self.app.jira.search_issues(
+                client, self.labels, concurrency=self.app.config.app.jira_concurrency
+            ):
                 team = self.get_team(issue)
                 if not team:
                     continue
@@ -515,20 +540,13 @@ class StatusScreen(Screen):
             return
 
         issue_key = event.data_table.get_cell_at(Coordinate(event.cursor_row, 0))
-        issue = self.cached_issues[issue_key]
-        self.issues.label.update(f' [link={self.app.jira.construct_issue_url(issue.key)}]{issue.key}[/link] ')
-        self.issues.info.update(issue.summary)
-
-        current_status = self.get_qa_status(issue)
-        self.status_changer.radio_buttons[current_status].value = True
-
-        disabled_radio_button = issue.assignee is None or issue.assignee.id != self.current_user_id
-
-        for radio_button in self.status_changer.radio_buttons.values():
-            radio_button.disabled = disabled_radio_button
+        self.__show_issue(self.cached_issues[issue_key])
 
     async def on_radio_set_changed(self, event: RadioSet.Changed) -> None:
-        current_issue = self.cached_issues[str(self.issues.label.render()).strip()]
+        # The highlighted issue may have been removed by a refresh
+        if (current_issue := self.cached_issues.get(self.__get_shown_issue_key())) is None:
+            return
+
         current_status = self.get_qa_status(current_issue)
         self.status_changer.button.disabled = (
             current_issue.assignee is None
@@ -538,10 +556,12 @@ class StatusScreen(Screen):
 
     async def on_button_pressed(self, event: Button.Pressed) -> None:
         if event.button == self.refresh_button:
-            self.__reload_screen()
+            self.run_worker(self.__refresh_issues())
+            return
+
+        if (old_issue := self.cached_issues.get(self.__get_shown_issue_key())) is None:
             return
 
-        old_issue = self.cached_issues[str(self.issues.label.render()).strip()]
         selected_status = str(self.status_changer.radio_set.pressed_button.label)
 
         async with ResponsiveNetworkClient(self.sidebar.status) as client:
@@ -585,6 +605,28 @@ class StatusScreen(Screen):
         self.status_changer.button.disabled = True
         self.__update_completion_status()
 
+    def __get_shown_issue_key(self) -> str:
+        return str(self.issues.label.render()).strip()
+
+    def __show_issue(self, issue: JiraIssue) -> None:
+        self.issues.label.update(f' [link={self.app.jira.construct_issue_url(issue.key)}]{issue.key}[/link] ')
+        self.issues.info.update(issue.summary)
+
+        current_status = self.get_qa_status(issue)
+        self.status_changer.radio_buttons[current_status].value = True
+
+        disabled_radio_button = issue.assignee is None or issue.assignee.id != self.current_user_id
+
+        for radio_button in self.status_changer.radio_buttons.values():
+            radio_button.disabled = disabled_radio_button
+
+    def __clear_issue(self) -> None:
+        self.issues.label.update('')
+        self.issues.info.update('')
+        self.status_changer.button.disabled = True
+        for radio_button in self.status_changer.radio_buttons.values():
+            radio_button.disabled = True
+
     def __refocus(self) -> None:
         # Focus on the first available row of the first table with entries
         focused = False
@@ -603,14 +645,79 @@ class StatusScreen(Screen):
         total = sum(counts)
         done = counts[-1]
 
-        percent = (Decimal(done) / total) * 100
+        # Every issue may have been removed by a refresh
+        percent = (Decimal(done) / total) * 100 if total else Decimal(0)
         if 0 < percent < 100:  # noqa: PLR2004
             percent = percent.quantize(COMPLETION_PRECISION)
 
         self.sidebar.status.update(f'{done} / {total} ({percent}%)')
 
-    def __reload_screen(self):
-        self.app.pop_screen()
-        self.app.uninstall_screen('status')
-        self.app.install_screen(StatusScreen(self.labels), 'status')
-        self.app.push_screen('status')
+    async def __refresh_issues(self) -> None:
+        self.refresh_button.disabled = True
+        try:
+            # Issues updated during the search are found again by the next refresh
+            refreshed_at = time.time()
+            changed_statuses: set[str] = set()
+            async with ResponsiveNetworkClient(self.sidebar.status) as client:
+                async for issue in self.app.jira.search_issues(
+                    client,
+                    self.labels,
+                    concurrency=self.app.config.app.jira_concurrency,
+                    updated_since=self.__refreshed_at,
+                ):
+                    changed_statuses.update(self.__merge_issue(issue))
+
+            self.__refreshed_at = refreshed_at
+        finally:
+            self.refresh_button.disabled = False
+
+        for status in changed_statuses:
+            self.statuses[status].sort_issues()
+
+        for select in self.query(FilterSelect).results():
+            select.update_options()
+
+        # Clear the details of the highlighted issue if it was removed, showing the first remaining issue instead
+        if self.__get_shown_issue_key() not in self.cached_issues:
+            self.__clear_issue()
+            self.__refocus()
+            for status_table in self.statuses.values():
+                if status_table.table.show_cursor:
+                    self.__show_issue(self.cached_issues[status_table.table.get_cell_at(Coordinate(0, 0))])
+                    break
+
+        self.__update_completion_status()
+
+    def __merge_issue(self, issue: JiraIssue) -> set[str]:
+        """
+        Replace the cached version of an issue that was updated and move its row, returning the QA statuses
+        whose table changed. Issues that no longer have any of the labels or no longer belong to a team are removed.
+        """
+        changed_statuses: set[str] = set()
+        if (old_issue := self.cached_issues.pop(issue.key, None)) is not None:
+            old_status = self.get_qa_status(old_issue)
+            if issue.key in self.statuses[old_status].table.rows:
+                self.statuses[old_status].table.remove_row(issue.key)
+                changed_statuses.add(old_status)
+
+            for issue_filter in (self.team_filter, self.member_filter):
+                issue_filter.remove(issue.key)
+
+        team = self.get_team(issue)
+        if not team or not any(label in self.labels for label in issue.labels):
+            return changed_statuses
+
+        self.cached_issues[issue.key] = issue
+        self.member_filter.add(':unassigned' if issue.assignee is None else issue.assignee.name, issue)
+        self.team_filter.add(team, issue)
+
+        # Only show the issue if it matches the selected filter, if any
+        for select in self.query(FilterSelect).results():
+            if isinstance(choice := select.value, str) and issue.key not in select.issue_filter.issues.get(choice, {}):
+                return changed_statuses
+
+        new_status = self.get_qa_status(issue)
+        self.statuses[new_status].add_issue(issue)
+        changed_statuses.add(new_status)
+
+        return changed_statuses
@@ -13,6 +13,7 @@ from textual.widgets import Button, Header, Label, RichLog
 from textual.worker import Worker, WorkerState
 
 from ddqa.utils.network import ResponsiveNetworkClient
+from ddqa.utils.teams import TeamIndex
 from ddqa.widgets.static import Placeholder
 
 
@@ -59,18 +60,27 @@ class InteractiveSidebar(Widget):
                 f'[link={self.app.repo.global_config_source}]{self.app.repo.global_config_source}[/link]',
                 shrink=False,
             )
+            global_config_source = str(self.app.repo.global_config_source)
+            kwargs = {}
+            if headers := self.app.github.get_validator_headers(global_config_source):
+                kwargs['headers'] = headers
+
             try:
                 response = await client.get(
-                    str(self.app.repo.global_config_source),
+                    global_config_source,
                     auth=(self.app.config.auth.github.user, self.app.config.auth.github.token),
+                    **kwargs,
                 )
-                response.raise_for_status()
+                if response.status_code != 304:  # noqa: PLR2004
+                    response.raise_for_status()
+
+                global_config_text = self.app.github.get_validated_body(global_config_source, response)
             except Exception as e:
                 status.update(str(e))
                 return
 
             try:
-                global_config = tomllib.loads(response.text)
+                global_config = tomllib.loads(global_config_text)
             except Exception:
                 status.update('Unable to parse TOML source')
                 return
@@ -81,6 +91,7 @@ class InteractiveSidebar(Widget):
 
             self.app.github.cache.save_global_config(self.app.repo.global_config_source, global_config)
 
+            team_members = {}
             teams = sorted(team.github_team for team in self.app.repo.teams.values())
             for team in teams:
                 text_log.write(
@@ -89,6 +100,7 @@ class InteractiveSidebar(Widget):
                 )
                 try:
                     github_members = await self.app.github.get_team_members(client, team, refresh=True)
+                    team_members[team] = github_members
                     for member in github_members:
                         if member not in global_config['members']:
                             text_log.write(
@@ -101,6 +113,15 @@ class InteractiveSidebar(Widget):
                     status.update(str(e))
                     return
 
+            team_index = TeamIndex(self.app.repo.teams, team_members)
+            self.app.github.set_team_index(team_index)
+            for member, member_teams in team_index.get_multi_team_users().items():
+                text_log.write(
+                    f'GitHub user [link=https://github.com/{member}]{member}[/link] belongs to several teams, '
+                    f'the first will be used for assignment: {", ".join(member_teams)}',
+                    shrink=False,
+                )
+
             text_log.write('Validating the github-metadata configuration...', shrink=False)
 
             members = global_config.get('members', {})
@@ -0,0 +1,52 @@
+# SPDX-FileCopyrightText: 2023-present Datadog, Inc. <dev@datadoghq.com>
+#
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING, Generic, TypeVar
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Hashable
+
+KeyT = TypeVar('KeyT', bound='Hashable')
+ResultT = TypeVar('ResultT')
+
+
+class PendingCalls(Generic[KeyT, ResultT]):
+    """
+    Calls that are running by key, so that concurrent callers of the same key wait for the result of the first one
+    rather than running their own.
+    """
+
+    def __init__(self) -> None:
+        self.__futures: dict[KeyT, asyncio.Future[ResultT]] = {}
+
+    def get(self, key: KeyT) -> Awaitable[ResultT] | None:
+        """
+        Return the result of the running call of a key to be awaited, raising the same error if the call fails,
+        or `None` if there is no such call. Cancelling the caller does not cancel the call.
+        """
+        if (future := self.__futures.get(key)) is None:
+            return None
+
+        return asyncio.shield(future)
+
+    async def run(self, key: KeyT, call: Awaitable[ResultT]) -> ResultT:
+        future: asyncio.Future[ResultT] = asyncio.get_running_loop().create_future()
+        self.__futures[key] = future
+        try:
+            result = await call
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            # The error is retrieved here so that it is not reported as never retrieved when nothing else waits
+            future.set_exception(e)
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self.__futures[key]
@@ -70,6 +70,42 @@ class Path(_PathBase):
 
         os.replace(path, self)
 
+    @contextmanager
+    def lock(self) -> Generator[Path, None, None]:
+        """
+        Hold an exclusive lock, shared by every process, on a `.lock` file next to this path.
+        """
+        lock_file = self.with_name(f'{self.name}.lock')
+        lock_file.parent.ensure_dir_exists()
+
+        with open(lock_file, 'a+b') as f:
+            if sys.platform == 'win32':
+                import msvcrt
+
+                while True:
+                    f.seek(0)
+                    try:
+                        # Retries for 10 seconds before giving up
+                        msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    except OSError:
+                        continue
+                    else:
+                        break
+
+                try:
+                    yield self
+                finally:
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                import fcntl
+
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+                try:
+                    yield self
+                finally:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
     @contextmanager
     def as_cwd(self, *args: Any, **kwargs: Any) -> Generator[Path, None, None]:
         origin = os.getcwd()
@@ -6,6 +6,8 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable
+
     from ddqa.utils.fs import Path
 
 
@@ -53,6 +55,19 @@ class GitRepository:
 
         return commits
 
+    def get_commit_timestamps(self, commit_hashes: Iterable[str]) -> dict[str, int]:
+        commit_hashes = list(commit_hashes)
+        timestamps = {}
+
+        # Keep the command line short enough for every platform
+        for batch_start in range(0, len(commit_hashes), 500):
+            batch = commit_hashes[batch_start : batch_start + 500]
+            for line in self.capture('show', '--no-patch', '--format=%H %ct', *batch).splitlines():
+                commit_hash, _, timestamp = line.partition(' ')
+                timestamps[commit_hash] = int(timestamp)
+
+        return timestamps
+
     def capture(self, *args) -> str:
         import subprocess
 
@@ -3,17 +3,26 @@
 # SPDX-License-Identifier: MIT
 from __future__ import annotations
 
+import asyncio
+import json
 import time
-from collections.abc import AsyncIterator, Iterable
+from collections.abc import AsyncIterator, Iterable, Iterator
 from functools import cached_property
 from typing import TYPE_CHECKING, Any
 
 from pydantic import HttpUrl
 
 from ddqa.cache.github import GitHubCache
+from ddqa.utils.concurrency import PendingCalls
 from ddqa.utils.fs import Path
+from ddqa.utils.network import BearerAuth
+from ddqa.utils.rate_limit import RateLimiter
+from ddqa.utils.teams import TeamIndex
 
 if TYPE_CHECKING:
+    import httpx
+
+    from ddqa.models.config.app import AppConfig
     from ddqa.models.config.auth import GitHubAuth
     from ddqa.models.config.team import TeamConfig
     from ddqa.models.github import TestCandidate
@@ -25,19 +34,72 @@ class GitHubRepository:
     # https://docs.github.com/en/rest/search?apiVersion=2022-11-28#search-issues-and-pull-requests
     ISSUE_SEARCH_API = 'https://api.github.com/search/issues'
 
+    # https://docs.github.com/en/rest/pulls/pulls?apiVersion=2022-11-28#list-pull-requests
+    PULL_REQUESTS_API = 'https://api.github.com/repos/{org}/{repo}/pulls'
+
+    # https://docs.github.com/en/rest/pulls/pulls?apiVersion=2022-11-28#get-a-pull-request
+    PULL_REQUEST_API = 'https://api.github.com/repos/{org}/{repo}/pulls/{number}'
+
     # https://docs.github.com/en/rest/pulls/reviews?apiVersion=2022-11-28#list-reviews-for-a-pull-request
     PR_REVIEWS_API = 'https://api.github.com/repos/{org}/{repo}/pulls/{number}/reviews'
 
     # https://docs.github.com/en/rest/teams/members?apiVersion=2022-11-28#list-team-members
     TEAM_MEMBERS_API = 'https://api.github.com/orgs/{org}/teams/{team}/members'
 
+    PAGINATION_RESULT_SIZE = 100
+
+    # The margin of time around the commit range within which merged pull requests are indexed
+    PR_SWEEP_MARGIN = 3600
+
+    # Abbreviated hashes keep batched search queries short, the minimum supported length being 7
+    SEARCH_HASH_LENGTH = 12
+
+    # https://docs.github.com/en/search-github/getting-started-with-searching-on-github/troubleshooting-search-queries#limitations-on-query-length
+    # The operator limit is reached long before the length limit of 256 characters since at most six abbreviated
+    # hashes are searched at once
+    SEARCH_MAX_OPERATORS = 5
+
+    # https://docs.github.com/en/graphql/guides/forming-calls-with-graphql
+    GRAPHQL_API = 'https://api.github.com/graphql'
+
+    # The maximum number of commits resolved by a single GraphQL query
+    GRAPHQL_BATCH_SIZE = 50
+
+    # https://docs.github.com/en/graphql/reference/objects#commit
+    GRAPHQL_CANDIDATE_FRAGMENT = """
+fragment candidate on Commit {
+  associatedPullRequests(first: 5) {
+    nodes {
+      number
+      title
+      body
+      merged
+      updatedAt
+      author { login url }
+      labels(first: 100) { nodes { name color } }
+      reviews(first: 100) { nodes { author { login } authorAssociation } }
+    }
+  }
+}
+"""
+
     # Default labels that always skip QA card creation
     DEFAULT_QA_SKIP_LABELS = {'qa/done', 'qa/no-code-change'}
 
-    def __init__(self, repo: GitRepository, auth: GitHubAuth, cache_dir: Path):
+    def __init__(self, repo: GitRepository, auth: GitHubAuth, cache_dir: Path, config: AppConfig | None = None):
+        from ddqa.models.config.app import AppConfig
+
         self.__repo = repo
         self.__auth = auth
+        self.__config = config or AppConfig()
         self.__cache = GitHubCache(cache_dir, self)
+        self.__rate_limiters = {token: RateLimiter() for token in auth.token_pool}
+
+        # PR number -> candidate data, for PRs that are currently being fetched by another commit
+        self.__pending_candidates: PendingCalls[str, dict[str, Any]] = PendingCalls()
+
+        # Built on the first author lookup and invalidated whenever team members are refreshed
+        self.__team_index: TeamIndex | None = None
 
     @property
     def repo(self) -> GitRepository:
@@ -47,10 +109,31 @@ class GitHubRepository:
     def auth(self) -> GitHubAuth:
         return self.__auth
 
+    @property
+    def config(self) -> AppConfig:
+        return self.__config
+
     @property
     def cache(self) -> GitHubCache:
         return self.__cache
 
+    @property
+    def rate_limiters(self) -> dict[str, RateLimiter]:
+        # Token -> rate limiter
+        return self.__rate_limiters
+
+    def select_token(self, resource: str) -> str:
+        # Use the token with the most remaining requests for the resource, preferring the main token on ties
+        now = time.time()
+        return max(self.rate_limiters, key=lambda token: self.rate_limiters[token].get_headroom(resource, now))
+
+    def get_token_auth(self, token: str) -> tuple[str, str] | BearerAuth:
+        # Tokens of the pool belong to other accounts or GitHub Apps so they cannot be paired with the main user
+        if token == self.auth.token:
+            return self.auth.user, token
+
+        return BearerAuth(token)
+
     @cached_property
     def repo_id(self) -> str:
         # https://github.com/foo/bar.git -> foo/bar
@@ -71,23 +154,47 @@ class GitHubRepository:
 
     async def get_team_members(self, client: ResponsiveNetworkClient, team: str, *, refresh: bool = False) -> set[str]:
         members = self.cache.get_team_members(team)
+        if not refresh:
+            self.cache.stats.record('github/team_members', hits=int(members is not None), misses=int(members is None))
 
         if refresh or members is None:
-            response = await self.__api_get(client, self.TEAM_MEMBERS_API.format(org=self.org, team=team))
+            team_members_data = json.loads(
+                await self.__api_get_validated(client, self.TEAM_MEMBERS_API.format(org=self.org, team=team))
+            )
             # No bots
-            members = {user['login'] for user in response.json() if user['type'] == 'User'}
+            members = {user['login'] for user in team_members_data if user['type'] == 'User'}
             self.cache.save_team_members(team, members)
+            self.__team_index = None
 
         return members
 
+    async def get_team_index(
+        self, client: ResponsiveNetworkClient, teams: dict[str, TeamConfig], *, refresh: bool = False
+    ) -> TeamIndex:
+        if refresh or self.__team_index is None or not self.__team_index.matches(teams):
+            team_members = {}
+            for github_team in dict.fromkeys(team_config.github_team for team_config in teams.values()):
+                team_members[github_team] = await self.get_team_members(client, github_team, refresh=refresh)
+
+            self.__team_index = TeamIndex(teams, team_members)
+
+        return self.__team_index
+
+    def set_team_index(self, team_index: TeamIndex) -> None:
+        self.__team_index = team_index
+
+    async def get_author_teams(
+        self, client: ResponsiveNetworkClient, user: str, teams: dict[str, TeamConfig]
+    ) -> list[str]:
+        team_index = await self.get_team_index(client, teams)
+        return team_index.get_teams(user)
+
     async def get_author_team(
         self, client: ResponsiveNetworkClient, user: str, teams: dict[str, TeamConfig]
     ) -> str | None:
-        for team_name, team_config in teams.items():
-            members = await self.get_team_members(client, team_config.github_team)
-            if user in members:
-                return team_name
-        return None
+        # The first configured team wins when the author belongs to several
+        author_teams = await self.get_author_teams(client, user, teams)
+        return author_teams[0] if author_teams else None
 
     async def get_candidate(self, client: ResponsiveNetworkClient, commit: GitCommit) -> TestCandidate:
         from ddqa.models.github import TestCandidate
@@ -96,27 +203,43 @@ class GitHubRepository:
             return TestCandidate(**cached_candidate_data)
 
         candidate_data: dict[str, Any] = {}
-        response = await self.__api_get(
-            client,
-            self.ISSUE_SEARCH_API,
-            # https://docs.github.com/en/search-github/searching-on-github/searching-issues-and-pull-requests
-            # https://github.blog/changelog/2025-03-06-github-issues-projects-api-support-for-issues-advanced-search-and-more/
-            params={
-                'q': f'{commit.hash} AND repo:{self.repo_id} AND is:merged AND is:pull-request',
-                'advanced_search': True,
-            },
-        )
-        pr_data = response.json()
-
-        if not pr_data['items']:
-            candidate_data['id'] = commit.hash
-            candidate_data['title'] = commit.subject
-            candidate_data['url'] = f'https://github.com/{self.repo_id}/commit/{commit.hash}'
+        number: str | None = None
+        if (pr_data := self.cache.get_merged_pull_request(commit.hash)) is not None:
+            number = str(pr_data['number'])
+        elif self.config.github_subject_resolution:
+            number = self.parse_pr_number(commit.subject)
+
+        if number:
+            if cached_candidate_data := self.cache.get_cached_candidate_data_from_pr_number(number):
+                self.cache.duplicate_cached_candidate_data_from_pr_number(commit.hash, number)
+                return TestCandidate(**cached_candidate_data)
+
+            if pr_data is None:
+                pr_data = await self.__get_merged_pull_request(client, number)
+
+        if pr_data is None:
+            response = await self.__api_get(
+                client,
+                self.ISSUE_SEARCH_API,
+                # https://docs.github.com/en/search-github/searching-on-github/searching-issues-and-pull-requests
+                # https://github.blog/changelog/2025-03-06-github-issues-projects-api-support-for-issues-advanced-search-and-more/
+                params={
+                    'q': f'{commit.hash} AND repo:{self.repo_id} AND is:merged AND is:pull-request',
+                    'advanced_search': True,
+                },
+            )
+            search_data = response.json()
+
+            if not search_data['items']:
+                candidate_data['id'] = commit.hash
+                candidate_data['title'] = commit.subject
+                candidate_data['url'] = f'https://github.com/{self.repo_id}/commit/{commit.hash}'
+
+                self.cache.cache_candidate_data(commit.hash, candidate_data)
+                return TestCandidate(**candidate_data)
+
+            pr_data = search_data['items'][0]
 
-            self.cache.cache_candidate_data(commit.hash, candidate_data)
-            return TestCandidate(**candidate_data)
-
-        pr_data = pr_data['items'][0]
         candidate_data['id'] = str(pr_data['number'])
 
         # This would only happen on the first encounter of a duplicate per commit hash
@@ -124,6 +247,54 @@ class GitHubRepository:
             self.cache.duplicate_cached_candidate_data_from_pr_number(commit.hash, candidate_data['id'])
             return TestCandidate(**cached_candidate_data)
 
+        # Another commit of the same PR is being resolved concurrently
+        if (pending := self.__pending_candidates.get(candidate_data['id'])) is not None:
+            cached_candidate_data = await pending
+            self.cache.duplicate_cached_candidate_data_from_pr_number(commit.hash, candidate_data['id'])
+            return TestCandidate(**cached_candidate_data)
+
+        # Other commits of the same PR fail with the same error
+        await self.__pending_candidates.run(
+            candidate_data['id'], self.__fetch_pull_request_data(client, candidate_data, pr_data)
+        )
+
+        self.cache.cache_candidate_data(
+            commit.hash, candidate_data, fetched_at=time.time(), updated_at=pr_data.get('updated_at')
+        )
+        return TestCandidate(**candidate_data)
+
+    async def __get_merged_pull_request(self, client: ResponsiveNetworkClient, number: str) -> dict[str, Any] | None:
+        url = self.PULL_REQUEST_API.format(org=self.org, repo=self.repo_name, number=number)
+        kwargs: dict[str, Any] = {}
+        if headers := self.get_validator_headers(url):
+            kwargs['headers'] = headers
+
+        response = await self.__api_get(client, url, allowed_status_codes=(304, 404), **kwargs)
+        if response.status_code == 404:  # noqa: PLR2004
+            return None
+
+        pr_data = json.loads(self.get_validated_body(url, response))
+        if pr_data.get('merged_at') is None:
+            return None
+
+        return pr_data
+
+    def __get_cached_pull_request(self, number: str) -> dict[str, Any] | None:
+        cached_response = self.cache.get_http_response(
+            self.PULL_REQUEST_API.format(org=self.org, repo=self.repo_name, number=number)
+        )
+        if cached_response is None:
+            return None
+
+        pr_data = json.loads(cached_response['body'])
+        if pr_data.get('merged_at') is None:
+            return None
+
+        return pr_data
+
+    async def __fetch_pull_request_data(
+        self, client: ResponsiveNetworkClient, candidate_data: dict[str, Any], pr_data: dict[str, Any]
+    ) -> dict[str, Any]:
         candidate_data['title'] = pr_data['title']
         candidate_data['url'] = f'https://github.com/{self.repo_id}/pull/{pr_data["number"]}'
         candidate_data['user'] = pr_data['user']['login']
@@ -136,13 +307,73 @@ class GitHubRepository:
             # so we normalize to remove carriage returns on Windows
             candidate_data['body'] = '\n'.join(pr_data['body'].splitlines())
 
-        response = await self.__api_get(
-            client, self.PR_REVIEWS_API.format(org=self.org, repo=self.repo_name, number=candidate_data['id'])
+        # Reviews are only needed for assignment so they are fetched for candidates that reach creation
+        if self.config.github_lazy_reviews:
+            candidate_data['reviewers'] = None
+        else:
+            candidate_data['reviewers'] = await self.__fetch_pull_request_reviewers(client, candidate_data['id'])
+
+        return candidate_data
+
+    def is_stale(self, candidate: TestCandidate) -> bool:
+        if not self.config.github_cache_max_age or not candidate.id.isdigit():
+            return False
+
+        freshness = self.cache.get_pull_request_freshness(candidate.id)
+        if freshness is None:
+            return False
+
+        # Entries cached before freshness was recorded are always stale
+        fetched_at, _ = freshness
+        return fetched_at is None or time.time() - fetched_at > self.config.github_cache_max_age
+
+    async def revalidate_candidate(
+        self, client: ResponsiveNetworkClient, candidate: TestCandidate
+    ) -> TestCandidate | None:
+        """
+        Fetch the pull request of a stale candidate again, returning the updated candidate
+        or `None` if the pull request did not change since it was cached.
+        """
+        from ddqa.models.github import TestCandidate
+
+        pr_data = json.loads(
+            await self.__api_get_validated(
+                client, self.PULL_REQUEST_API.format(org=self.org, repo=self.repo_name, number=candidate.id)
+            )
+        )
+        fetched_at = time.time()
+
+        _, updated_at = self.cache.get_pull_request_freshness(candidate.id) or (None, None)
+        if updated_at is not None and pr_data.get('updated_at') == updated_at:
+            self.cache.touch_pull_request(candidate.id, fetched_at)
+            return None
+
+        # Team assignment is derived again from the current labels
+        candidate_data: dict[str, Any] = {'id': candidate.id}
+        await self.__fetch_pull_request_data(client, candidate_data, pr_data)
+        self.cache.save_pull_request_data(candidate_data, fetched_at=fetched_at, updated_at=pr_data.get('updated_at'))
+
+        return TestCandidate(**candidate_data)
+
+    async def get_pull_request_reviewers(self, client: ResponsiveNetworkClient, number: str) -> list[dict[str, str]]:
+        reviewers = self.cache.get_pull_request_reviewers(number)
+        if reviewers is None:
+            reviewers = await self.__fetch_pull_request_reviewers(client, number)
+            self.cache.save_pull_request_reviewers(number, reviewers)
+
+        return reviewers
+
+    async def __fetch_pull_request_reviewers(
+        self, client: ResponsiveNetworkClient, number: str
+    ) -> list[dict[str, str]]:
+        pr_review_data = json.loads(
+            await self.__api_get_validated(
+                client, self.PR_REVIEWS_API.format(org=self.org, repo=self.repo_name, number=number)
+            )
         )
-        pr_review_data = response.json()
 
         # Deduplicate, filtering out reviewers with deleted/ghost users
-        candidate_data['reviewers'] = [
+        return [
             {'name': name, 'association': association}
             for name, association in {
                 reviewer['user']['login']: reviewer['author_association'].lower()
@@ -151,8 +382,185 @@ class GitHubRepository:
             }.items()
         ]
 
-        self.cache.cache_candidate_data(commit.hash, candidate_data)
-        return TestCandidate(**candidate_data)
+    async def cache_candidates_graphql(self, client: ResponsiveNetworkClient, commits: Iterable[GitCommit]) -> None:
+        """
+        Resolve a batch of commits with a single GraphQL query and cache the results in the same shape
+        as `get_candidate`. Commits that GitHub does not know about are left uncached so that they may
+        be resolved individually.
+        """
+        commits = list(commits)[: self.GRAPHQL_BATCH_SIZE]
+        if not commits:
+            return
+
+        aliases = '\n'.join(
+            f'    c{i}: object(oid: "{commit.hash}") {{ ...candidate }}' for i, commit in enumerate(commits)
+        )
+        query = (
+            f'query($owner: String!, $name: String!) {{\n'
+            f'  repository(owner: $owner, name: $name) {{\n{aliases}\n  }}\n'
+            f'}}\n{self.GRAPHQL_CANDIDATE_FRAGMENT}'
+        )
+        response = await self.__api_post(
+            client,
+            self.GRAPHQL_API,
+            json={'query': query, 'variables': {'owner': self.org, 'name': self.repo_name}},
+        )
+        repository = (response.json().get('data') or {}).get('repository') or {}
+
+        for i, commit in enumerate(commits):
+            if (commit_data := repository.get(f'c{i}')) is None:
+                continue
+
+            pull_requests = [pr for pr in commit_data['associatedPullRequests']['nodes'] if pr['merged']]
+            if not pull_requests:
+                self.cache.cache_candidate_data(
+                    commit.hash,
+                    {
+                        'id': commit.hash,
+                        'title': commit.subject,
+                        'url': f'https://github.com/{self.repo_id}/commit/{commit.hash}',
+                    },
+                )
+                continue
+
+            pr_data = pull_requests[0]
+            number = str(pr_data['number'])
+            if self.cache.get_cached_candidate_data_from_pr_number(number):
+                self.cache.duplicate_cached_candidate_data_from_pr_number(commit.hash, number)
+                continue
+
+            # Deleted users are represented by a null author
+            author = pr_data['author'] or {'login': 'ghost', 'url': 'https://github.com/ghost'}
+            candidate_data: dict[str, Any] = {
+                'id': number,
+                'title': pr_data['title'],
+                'url': f'https://github.com/{self.repo_id}/pull/{number}',
+                'user': author['login'],
+                'user_url': author['url'],
+                'labels': [{'name': label['name'], 'color': label['color']} for label in pr_data['labels']['nodes']],
+            }
+
+            if pr_data['body'] is not None:
+                candidate_data['body'] = '\n'.join(pr_data['body'].splitlines())
+
+            candidate_data['reviewers'] = [
+                {'name': name, 'association': association}
+                for name, association in {
+                    review['author']['login']: review['authorAssociation'].lower()
+                    for review in pr_data['reviews']['nodes']
+                    if review['author'] is not None
+                }.items()
+            ]
+
+            self.cache.cache_candidate_data(
+                commit.hash, candidate_data, fetched_at=time.time(), updated_at=pr_data.get('updatedAt')
+            )
+
+    async def cache_candidates_search(self, client: ResponsiveNetworkClient, commits: Iterable[GitCommit]) -> None:
+        """
+        Resolve a batch of commits with a single search query and cache the results in the same shape
+        as `get_candidate`. Search results do not say which commit matched, so pull requests are mapped
+        back to commits by their merge commit. Commits that cannot be mapped are left uncached so that
+        they may be resolved individually.
+        """
+        commits = list(commits)
+        if not commits:
+            return
+
+        # Qualifiers are implicitly combined so that every available operator is used to join the hashes
+        terms = ' OR '.join(commit.hash[: self.SEARCH_HASH_LENGTH] for commit in commits)
+        response = await self.__api_get(
+            client,
+            self.ISSUE_SEARCH_API,
+            params={
+                'q': f'repo:{self.repo_id} is:merged is:pull-request ({terms})',
+                'advanced_search': True,
+                'per_page': 100,
+            },
+            # The query was rejected, the commits will be resolved individually
+            allowed_status_codes=(422,),
+        )
+        if response.status_code == 422:  # noqa: PLR2004
+            return
+
+        items = response.json()['items']
+        if not items:
+            for commit in commits:
+                self.cache.cache_candidate_data(
+                    commit.hash,
+                    {
+                        'id': commit.hash,
+                        'title': commit.subject,
+                        'url': f'https://github.com/{self.repo_id}/commit/{commit.hash}',
+                    },
+                )
+
+            return
+
+        remaining = {commit.hash: commit for commit in commits}
+        for item in items:
+            number = str(item['number'])
+            # Merge commits never change so pull requests that were already fetched need no request to be mapped
+            pr_data = self.__get_cached_pull_request(number)
+            if pr_data is None:
+                pr_data = await self.__get_merged_pull_request(client, number)
+
+            if pr_data is None or (merged_commit := remaining.pop(pr_data.get('merge_commit_sha', ''), None)) is None:
+                continue
+
+            if self.cache.get_cached_candidate_data_from_pr_number(number):
+                self.cache.duplicate_cached_candidate_data_from_pr_number(merged_commit.hash, number)
+                continue
+
+            candidate_data: dict[str, Any] = {'id': number}
+            await self.__fetch_pull_request_data(client, candidate_data, pr_data)
+            self.cache.cache_candidate_data(
+                merged_commit.hash, candidate_data, fetched_at=time.time(), updated_at=pr_data.get('updated_at')
+            )
+
+    async def sweep_merged_pull_requests(self, client: ResponsiveNetworkClient, since: float, until: float) -> None:
+        """
+        Index every pull request merged between the given timestamps by its merge commit, so that the
+        corresponding commits may be resolved without searching.
+        """
+        from datetime import datetime
+
+        pull_requests: dict[str, dict[str, Any]] = {}
+        page = 1
+        while True:
+            response = await self.__api_get(
+                client,
+                self.PULL_REQUESTS_API.format(org=self.org, repo=self.repo_name),
+                params={
+                    'state': 'closed',
+                    'sort': 'updated',
+                    'direction': 'desc',
+                    'per_page': self.PAGINATION_RESULT_SIZE,
+                    'page': page,
+                },
+            )
+            pr_page = response.json()
+
+            for pr_data in pr_page:
+                if pr_data['merged_at'] is None or not pr_data['merge_commit_sha']:
+                    continue
+
+                if since <= datetime.fromisoformat(pr_data['merged_at']).timestamp() <= until:
+                    pull_requests[pr_data['merge_commit_sha']] = {
+                        key: pr_data[key]
+                        for key in ('number', 'title', 'body', 'user', 'labels', 'merged_at', 'updated_at')
+                    }
+
+            # Pull requests are updated no earlier than they are merged
+            if (
+                len(pr_page) < self.PAGINATION_RESULT_SIZE
+                or datetime.fromisoformat(pr_page[-1]['updated_at']).timestamp() < since
+            ):
+                break
+
+            page += 1
+
+        self.cache.save_merged_pull_requests(pull_requests)
 
     async def get_candidates(
         self,
@@ -163,14 +571,7 @@ class GitHubRepository:
     ) -> AsyncIterator[tuple[TestCandidate | None, int, int]]:
         processed_pr_numbers = set()
         ignored = 0
-        # Combine default QA skip labels with configured ignored labels
-        all_ignored_labels = set(self.DEFAULT_QA_SKIP_LABELS)
-        if ignored_labels:
-            all_ignored_labels.update(ignored_labels)
-
-        for index, commit in enumerate(commits):
-            model = await self.get_candidate(client, commit)
-
+        async for index, model in self.__resolve_candidates(client, commits):
             if model.id.isdigit():
                 if model.id in processed_pr_numbers:
                     ignored += 1
@@ -178,28 +579,233 @@ class GitHubRepository:
 
                 processed_pr_numbers.add(model.id)
 
-                labels = {label.name for label in model.labels}
-                if (pr_labels and not any(label in labels for label in pr_labels)) or any(
-                    label in labels for label in all_ignored_labels
-                ):
+                if self.is_ignored(model, ignored_labels, pr_labels):
                     ignored += 1
                     yield None, index, ignored
                     continue
 
             yield model, index, ignored
 
+    def is_ignored(
+        self,
+        candidate: TestCandidate,
+        ignored_labels: Iterable[str] | None = None,
+        pr_labels: Iterable[str] | None = None,
+    ) -> bool:
+        labels = {label.name for label in candidate.labels}
+        if pr_labels and not any(label in labels for label in pr_labels):
+            return True
+
+        # Combine default QA skip labels with configured ignored labels
+        all_ignored_labels = set(self.DEFAULT_QA_SKIP_LABELS)
+        if ignored_labels:
+            all_ignored_labels.update(ignored_labels)
+
+        return any(label in labels for label in all_ignored_labels)
+
+    async def warm_candidates(
+        self,
+        client: ResponsiveNetworkClient,
+        commits: Iterable[GitCommit],
+        ignored_labels: Iterable[str] | None = None,
+        pr_labels: Iterable[str] | None = None,
+    ) -> tuple[int, int]:
+        """
+        Resolve and cache the candidates of the given commits like `get_candidates`, also revalidating those that are
+        stale and fetching the reviews that are otherwise only fetched for issue creation. The number of candidates
+        and of ignored commits are returned.
+        """
+        candidates: list[TestCandidate] = []
+        ignored = 0
+        async for model, _, total_ignored in self.get_candidates(client, commits, ignored_labels, pr_labels):
+            ignored = total_ignored
+            if model is not None:
+                candidates.append(model)
+
+        semaphore = asyncio.Semaphore(self.config.github_concurrency)
+
+        async def refresh(candidate: TestCandidate) -> None:
+            async with semaphore:
+                if self.is_stale(candidate):
+                    candidate = await self.revalidate_candidate(client, candidate) or candidate
+
+                if candidate.reviewers is None:
+                    await self.get_pull_request_reviewers(client, candidate.id)
+
+        await asyncio.gather(*(refresh(candidate) for candidate in candidates))
+        return len(candidates), ignored
+
+    async def __resolve_candidates(
+        self, client: ResponsiveNetworkClient, commits: Iterable[GitCommit]
+    ) -> AsyncIterator[tuple[int, TestCandidate]]:
+        from ddqa.models.github import TestCandidate
+
+        # Resolve up to the configured number of uncached commits concurrently while still yielding in commit order
+        semaphore = asyncio.Semaphore(self.config.github_concurrency)
+        commits = list(commits)
+
+        async def prefetch(batch: list[GitCommit]) -> None:
+            async with semaphore:
+                if self.config.github_graphql:
+                    await self.cache_candidates_graphql(client, batch)
+                else:
+                    await self.cache_candidates_search(client, batch)
+
+        # Cached candidates are resolved without any network request, only the others wait for the commits before them
+        hits, _ = self.cache.get_many(commit.hash for commit in commits)
+        uncached = [commit for commit in commits if commit.hash not in hits]
+
+        # Commit hash -> task that resolves the batch the commit belongs to
+        batches: dict[str, asyncio.Task] = {}
+
+        async def prefetch_batches() -> None:
+            if self.config.github_pr_sweep and (
+                timestamps := self.repo.get_commit_timestamps(
+                    commit.hash for commit in uncached if self.cache.get_merged_pull_request(commit.hash) is None
+                )
+            ):
+                async with semaphore:
+                    await self.sweep_merged_pull_requests(
+                        client,
+                        min(timestamps.values()) - self.PR_SWEEP_MARGIN,
+                        max(timestamps.values()) + self.PR_SWEEP_MARGIN,
+                    )
+
+            # Indexed commits are resolved individually without searching
+            unindexed = [commit for commit in uncached if self.cache.get_merged_pull_request(commit.hash) is None]
+            for batch in self.__batch_commits(unindexed):
+                batch_task = asyncio.create_task(prefetch(batch))
+                for commit in batch:
+                    batches[commit.hash] = batch_task
+
+        # Leading cached candidates are yielded without waiting for the pull request sweep
+        prefetch_task = asyncio.create_task(prefetch_batches()) if uncached else None
+
+        async def resolve(commit: GitCommit) -> TestCandidate:
+            if prefetch_task is not None:
+                await prefetch_task
+
+            if (batch_task := batches.get(commit.hash)) is not None:
+                await batch_task
+
+            async with semaphore:
+                return await self.get_candidate(client, commit)
+
+        tasks = {commit.hash: asyncio.create_task(resolve(commit)) for commit in uncached}
+        try:
+            for index, commit in enumerate(commits):
+                if (candidate_data := hits.get(commit.hash)) is not None:
+                    yield index, TestCandidate(**candidate_data)
+                else:
+                    yield index, await tasks[commit.hash]
+        finally:
+            if prefetch_task is not None:
+                prefetch_task.cancel()
+
+            for task in (*batches.values(), *tasks.values()):
+                task.cancel()
+
+    def __batch_commits(self, commits: list[GitCommit]) -> Iterator[list[GitCommit]]:
+        if self.config.github_graphql:
+            for batch_start in range(0, len(commits), self.GRAPHQL_BATCH_SIZE):
+                yield commits[batch_start : batch_start + self.GRAPHQL_BATCH_SIZE]
+
+            return
+
+        if self.config.github_search_batch_size == 1:
+            return
+
+        # Every additional hash requires an `OR` operator
+        batch_size = min(self.config.github_search_batch_size, self.SEARCH_MAX_OPERATORS + 1)
+        for batch_start in range(0, len(commits), batch_size):
+            yield commits[batch_start : batch_start + batch_size]
+
+    @staticmethod
+    def parse_pr_number(subject: str) -> str | None:
+        """
+        Extract the pull request number from the subject of a squash merge, like `Fix foo (#123)`,
+        or of a merge commit, like `Merge pull request #123 from org/branch`.
+        """
+        import re
+
+        if match := re.search(r'\(#(\d+)\)$', subject.strip()) or re.match(r'Merge pull request #(\d+)', subject):
+            return match.group(1)
+
+        return None
+
+    def get_rate_limit_resource(self, url: str) -> str:
+        if url == self.GRAPHQL_API:
+            return 'graphql'
+        elif url.startswith('https://api.github.com/search/'):
+            return 'search'
+
+        return 'core'
+
+    def get_validator_headers(self, url: str) -> dict[str, str]:
+        """
+        https://docs.github.com/en/rest/using-the-rest-api/best-practices-for-using-the-rest-api#use-conditional-requests-if-appropriate
+        """
+        if (cached_response := self.cache.get_http_response(url)) is None:
+            return {}
+
+        headers = {}
+        if etag := cached_response['validators'].get('ETag'):
+            headers['If-None-Match'] = etag
+        if last_modified := cached_response['validators'].get('Last-Modified'):
+            headers['If-Modified-Since'] = last_modified
+
+        return headers
+
+    def get_validated_body(self, url: str, response: httpx.Response) -> str:
+        """
+        Return the body of a response to a conditional request, using the cached body if it was not modified
+        """
+        if response.status_code == 304:  # noqa: PLR2004
+            cached_response = self.cache.get_http_response(url)
+            if cached_response is None:
+                message = f'Received a `304 Not Modified` response without a cached body: {url}'
+                raise ValueError(message)
+
+            return cached_response['body']
+
+        validators = {name: response.headers[name] for name in ('ETag', 'Last-Modified') if name in response.headers}
+        if validators:
+            self.cache.save_http_response(url, validators, response.text)
+
+        return response.text
+
+    async def __api_get_validated(self, client: ResponsiveNetworkClient, url: str, **kwargs) -> str:
+        if headers := self.get_validator_headers(url):
+            kwargs['headers'] = headers
+
+        response = await self.__api_get(client, url, allowed_status_codes=(304,), **kwargs)
+        return self.get_validated_body(url, response)
+
     async def __api_get(self, client: ResponsiveNetworkClient, *args, **kwargs):
+        return await self.__api_request(client.get, client, *args, **kwargs)
+
+    async def __api_post(self, client: ResponsiveNetworkClient, *args, **kwargs):
+        return await self.__api_request(client.post, client, *args, **kwargs)
+
+    async def __api_request(
+        self, send, client: ResponsiveNetworkClient, *args, allowed_status_codes: tuple[int, ...] = (), **kwargs
+    ):
+        resource = self.get_rate_limit_resource(args[0])
         retry_wait = 2
         while True:
             try:
-                response = await client.get(*args, auth=(self.auth.user, self.auth.token), **kwargs)
+                token = self.select_token(resource)
+                rate_limiter = self.rate_limiters[token]
+                await rate_limiter.acquire(client, resource)
+                response = await send(*args, auth=self.get_token_auth(token), **kwargs)
 
-                # https://docs.github.com/en/rest/overview/resources-in-the-rest-api?apiVersion=2022-11-28#rate-limiting
-                # https://docs.github.com/en/rest/guides/best-practices-for-integrators?apiVersion=2022-11-28#dealing-with-rate-limits
-                if response.status_code == 403 and response.headers['X-RateLimit-Remaining'] == '0':  # noqa: PLR2004
-                    await client.wait(float(response.headers['X-RateLimit-Reset']) - time.time() + 1)
+                # Throttled requests are retried once the rate limiter allows it
+                if rate_limiter.update(response, resource):
                     continue
 
+                if response.status_code in allowed_status_codes:
+                    return response
+
                 client.check_status(response, **kwargs)
             except Exception as e:
                 await client.wait(retry_wait, context=str(e))
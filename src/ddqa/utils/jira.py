@@ -3,10 +3,12 @@
 # SPDX-License-Identifier: MIT
 from __future__ import annotations
 
-from collections.abc import AsyncIterator, Iterable
+import asyncio
+from collections.abc import AsyncIterator, Iterable, Sequence
 from typing import TYPE_CHECKING, Any
 
 from ddqa.cache.jira import JiraCache
+from ddqa.utils.concurrency import PendingCalls
 from ddqa.utils.fs import Path
 
 if TYPE_CHECKING:
@@ -20,6 +22,10 @@ if TYPE_CHECKING:
 class JiraClient:
     PAGINATION_RESULT_SIZE = 100
     USER_BULK_BATCH_SIZE = 50
+    ISSUE_BULK_BATCH_SIZE = 50
+
+    # Extra seconds searched for when only looking for updated issues, to account for clock differences
+    UPDATED_SEARCH_MARGIN = 60
 
     # https://developer.atlassian.com/cloud/jira/platform/rest/v2/api-group-myself/#api-rest-api-2-myself-get
     SELF_INSPECTION_API = 'rest/api/2/myself'
@@ -27,6 +33,9 @@ class JiraClient:
     # https://developer.atlassian.com/cloud/jira/platform/rest/v2/api-group-issues/#api-rest-api-2-issue-post
     ISSUE_API = 'rest/api/2/issue'
 
+    # https://developer.atlassian.com/cloud/jira/platform/rest/v2/api-group-issues/#api-rest-api-2-issue-bulk-post
+    ISSUE_BULK_API = 'rest/api/2/issue/bulk'
+
     # https://developer.atlassian.com/cloud/jira/platform/rest/v2/api-group-issues/#api-rest-api-2-issue-issueidorkey-transitions-get
     TRANSITIONS_API = 'rest/api/2/issue/{issue_key}/transitions'
 
@@ -45,6 +54,9 @@ class JiraClient:
         # project key -> issue type -> status name -> transition ID
         self.__transitions: dict[str, dict[str, dict[str, str]]] = {}
 
+        # (project key, issue type) -> completion of the transitions that are currently being fetched
+        self.__pending_transitions: PendingCalls[tuple[str, str], None] = PendingCalls()
+
     @property
     def config(self) -> JiraConfig:
         return self.__config
@@ -63,8 +75,11 @@ class JiraClient:
 
     async def get_current_user_id(self, client: ResponsiveNetworkClient) -> str:
         if cached_user_id := self.cache.get_user_id(self.auth.email, self.auth.token):
+            self.cache.stats.record('jira/user_ids', hits=1)
             return cached_user_id
 
+        self.cache.stats.record('jira/user_ids', misses=1)
+
         response = await self.__api_get(client, f'{self.config.jira_server}{self.SELF_INSPECTION_API}')
         user_id: str = response.json()['accountId']
 
@@ -79,6 +94,74 @@ class JiraClient:
         assignments: dict[str, str | None],
     ) -> dict[str, str]:
         created_issues: dict[str, str] = {}
+        for team, fields in self.__construct_issues_fields(candidate, labels, assignments):
+            response = await self.__api_post(
+                client, f'{self.config.jira_server}{self.ISSUE_API}', json={'fields': fields}
+            )
+            created_issues[team] = f'{self.construct_issue_url(response.json()["key"])}'
+
+        return created_issues
+
+    async def create_issues_bulk(
+        self,
+        client: ResponsiveNetworkClient,
+        candidates: Sequence[tuple[TestCandidate, dict[str, str | None]]],
+        labels: tuple[str, ...],
+    ) -> list[tuple[dict[str, str], dict[str, str]]]:
+        """
+        Create the issues of several candidates, up to `ISSUE_BULK_BATCH_SIZE` per request. For every candidate,
+        the URLs of the created issues and the errors of the issues that could not be created are returned by team.
+        """
+        # Candidate index, team and fields of every issue
+        issues: list[tuple[int, str, dict[str, Any]]] = [
+            (index, team, fields)
+            for index, (candidate, assignments) in enumerate(candidates)
+            for team, fields in self.__construct_issues_fields(candidate, labels, assignments)
+        ]
+        results: list[tuple[dict[str, str], dict[str, str]]] = [({}, {}) for _ in candidates]
+
+        for batch_start in range(0, len(issues), self.ISSUE_BULK_BATCH_SIZE):
+            batch = issues[batch_start : batch_start + self.ISSUE_BULK_BATCH_SIZE]
+            # Requests fail as a whole only when no issue could be created
+            response = await self.__api_post(
+                client,
+                f'{self.config.jira_server}{self.ISSUE_BULK_API}',
+                allowed_status_codes=(400,),
+                json={'issueUpdates': [{'fields': fields} for _, _, fields in batch]},
+            )
+            data = response.json()
+
+            # Position in the batch -> error, other responses have errors keyed by field
+            errors: dict[int, str] = {}
+            if isinstance(bulk_errors := data.get('errors'), list):
+                errors.update((error['failedElementNumber'], self.__format_bulk_error(error)) for error in bulk_errors)
+            if response.status_code == 400 and not errors:  # noqa: PLR2004
+                errors = dict.fromkeys(range(len(batch)), self.__format_bulk_error(data))
+
+            # Created issues are listed in the order they were requested
+            created_data = data.get('issues') or []
+            if len(created_data) != len(batch) - len(errors):
+                # Issues can no longer be matched to their position so every issue of the batch is reported as failed,
+                # while the results of the other batches are kept to avoid creating their issues again
+                message = (
+                    f'Jira returned {len(created_data)} created issue(s) and {len(errors)} error(s) '
+                    f'for a batch of {len(batch)} issue(s), the issue may have been created'
+                )
+                errors = dict.fromkeys(range(len(batch)), message)
+
+            created = iter(created_data)
+            for position, (index, team, _) in enumerate(batch):
+                created_issues, failed_issues = results[index]
+                if position in errors:
+                    failed_issues[team] = errors[position]
+                else:
+                    created_issues[team] = self.construct_issue_url(next(created)['key'])
+
+        return results
+
+    def __construct_issues_fields(
+        self, candidate: TestCandidate, labels: tuple[str, ...], assignments: dict[str, str | None]
+    ) -> Iterable[tuple[str, dict[str, Any]]]:
         common_fields: dict[str, Any] = {
             'description': self.__construct_body(candidate),
             'labels': list(labels),
@@ -99,62 +182,120 @@ class JiraClient:
             if team_config.jira_component:
                 fields['components'] = [{'name': team_config.jira_component}]
 
-            response = await self.__api_post(
-                client, f'{self.config.jira_server}{self.ISSUE_API}', json={'fields': fields}
-            )
-            created_issues[team] = f'{self.construct_issue_url(response.json()["key"])}'
+            yield team, fields
 
-        return created_issues
+    @staticmethod
+    def __format_bulk_error(error: dict[str, Any]) -> str:
+        element_errors = error.get('elementErrors', error)
+        messages = [
+            *(element_errors.get('errorMessages') or []),
+            *(f'{field}: {message}' for field, message in (element_errors.get('errors') or {}).items()),
+        ]
+        return '; '.join(messages) or f'Unknown error ({error.get("status", "no status")})'
+
+    async def search_issues(
+        self,
+        client: ResponsiveNetworkClient,
+        labels: tuple[str, ...],
+        *,
+        concurrency: int = 1,
+        updated_since: float | None = None,
+    ) -> AsyncIterator[JiraIssue]:
+        """
+        Once the first page of results gives the total number of issues, up to `concurrency` of the remaining pages
+        are requested at the same time. Issues are yielded as soon as their page is received so they are not
+        necessarily in the order of the search. If `updated_since` is a timestamp, only the issues that were updated
+        since then are searched for regardless of their labels, so that issues whose labels were removed are found
+        too and callers must check the labels themselves.
+        """
+        query = f'project in {self.__format_jql_list(team.jira_project for team in self.repo_config.teams.values())}'
+        if updated_since is None:
+            query += f' and labels in {self.__format_jql_list(labels)}'
+        else:
+            import math
+            import time
+
+            # Absolute dates would be interpreted in the time zone of the user's profile
+            minutes = math.ceil((time.time() - updated_since + self.UPDATED_SEARCH_MARGIN) / 60)
+            query += f' and updated >= -{minutes}m'
+
+        # Transitions are fetched in the background as soon as a page has issues of a new project and type
+        requested_transitions: set[tuple[str, str]] = set()
+        transition_tasks: list[asyncio.Task] = []
+
+        def load_issues(data: dict[str, Any]) -> list[JiraIssue]:
+            issues = [self.__parse_issue(issue) for issue in data['issues']]
+            for issue in issues:
+                if (issue.project, issue.type) not in requested_transitions:
+                    requested_transitions.add((issue.project, issue.type))
+                    transition_tasks.append(asyncio.create_task(self.__get_transitions(client, issue)))
+
+            return issues
+
+        tasks: list[asyncio.Task] = []
+        try:
+            data = await self.__search_page(client, query, 0, self.PAGINATION_RESULT_SIZE)
+            for jira_issue in load_issues(data):
+                yield jira_issue
 
-    async def search_issues(self, client: ResponsiveNetworkClient, labels: tuple[str, ...]) -> AsyncIterator[JiraIssue]:
-        from ddqa.models.jira import JiraIssue
+            # The server may return fewer results per page than requested
+            page_size = data.get('maxResults') or self.PAGINATION_RESULT_SIZE
+            semaphore = asyncio.Semaphore(concurrency)
 
-        offset = 0
-        query = (
-            f'project in {self.__format_jql_list(team.jira_project for team in self.repo_config.teams.values())}'
-            f' and '
-            f'labels in {self.__format_jql_list(labels)}'
-        )
+            async def fetch_page(offset: int) -> dict[str, Any]:
+                async with semaphore:
+                    return await self.__search_page(client, query, offset, page_size)
 
-        while True:
-            response = await self.__api_post(
-                client,
-                f'{self.config.jira_server}{self.SEARCH_API}',
-                json={
-                    'jql': query,
-                    'fields': [
-                        'assignee',
-                        'components',
-                        'description',
-                        'issuetype',
-                        'labels',
-                        'project',
-                        'status',
-                        'summary',
-                        'updated',
-                    ],
-                    'maxResults': self.PAGINATION_RESULT_SIZE,
-                    'startAt': offset,
-                },
+            tasks.extend(
+                asyncio.create_task(fetch_page(offset))
+                for offset in range(len(data['issues']), data['total'], page_size)
             )
+            for task in asyncio.as_completed(tasks):
+                for jira_issue in load_issues(await task):
+                    yield jira_issue
+
+            # Every issue that was found can change status once the search completes
+            await asyncio.gather(*transition_tasks)
+        finally:
+            for task in (*tasks, *transition_tasks):
+                task.cancel()
+
+    async def __search_page(
+        self, client: ResponsiveNetworkClient, query: str, offset: int, page_size: int
+    ) -> dict[str, Any]:
+        response = await self.__api_post(
+            client,
+            f'{self.config.jira_server}{self.SEARCH_API}',
+            json={
+                'jql': query,
+                'fields': [
+                    'assignee',
+                    'components',
+                    'description',
+                    'issuetype',
+                    'labels',
+                    'project',
+                    'status',
+                    'summary',
+                    'updated',
+                ],
+                'maxResults': page_size,
+                'startAt': offset,
+            },
+        )
+        return response.json()
 
-            data = response.json()
-            for issue in data['issues']:
-                offset += 1
-
-                jira_issue = JiraIssue(
-                    key=issue['key'],
-                    project=issue['fields'].pop('project')['key'],
-                    type=issue['fields'].pop('issuetype')['name'],
-                    components=[component['name'] for component in issue['fields'].pop('components')],
-                    **issue['fields'],
-                )
-                await self.__get_transitions(client, jira_issue)
-
-                yield jira_issue
+    @staticmethod
+    def __parse_issue(issue: dict[str, Any]) -> JiraIssue:
+        from ddqa.models.jira import JiraIssue
 
-            if offset >= data['total']:
-                break
+        return JiraIssue(
+            key=issue['key'],
+            project=issue['fields'].pop('project')['key'],
+            type=issue['fields'].pop('issuetype')['name'],
+            components=[component['name'] for component in issue['fields'].pop('components')],
+            **issue['fields'],
+        )
 
     async def get_users(self, client: ResponsiveNetworkClient, account_ids: Iterable[str]) -> AsyncIterator[dict]:
         account_id_list = list(account_ids)
@@ -191,6 +332,8 @@ class JiraClient:
     async def update_issue_status(self, client: ResponsiveNetworkClient, issue: JiraIssue, status: str) -> JiraIssue:
         from datetime import datetime
 
+        # Transitions are looked up in the background while searching
+        await self.__get_transitions(client, issue)
         await self.__api_post(
             client,
             f'{self.config.jira_server}{self.TRANSITIONS_API.format(issue_key=issue.key)}',
@@ -208,10 +351,26 @@ class JiraClient:
         if issue.type in issue_types:
             return
 
+        # Another issue of the same project and type is being looked up concurrently
+        if (pending := self.__pending_transitions.get((issue.project, issue.type))) is not None:
+            await pending
+            return
+
         issue_types.update(self.cache.get_transitions(issue))
         if issue.type in issue_types:
+            self.cache.stats.record('jira/projects', hits=1)
             return
 
+        self.cache.stats.record('jira/projects', misses=1)
+
+        # Other issues of the same project and type fail with the same error
+        await self.__pending_transitions.run(
+            (issue.project, issue.type), self.__fetch_transitions(client, issue, issue_types)
+        )
+
+    async def __fetch_transitions(
+        self, client: ResponsiveNetworkClient, issue: JiraIssue, issue_types: dict[str, dict[str, str]]
+    ) -> None:
         response = await self.__api_get(
             client, f'{self.config.jira_server}{self.TRANSITIONS_API.format(issue_key=issue.key)}'
         )
@@ -228,7 +387,14 @@ class JiraClient:
     async def __api_post(self, client: ResponsiveNetworkClient, *args, **kwargs):
         return await self.__api_request('POST', client, *args, **kwargs)
 
-    async def __api_request(self, method: str, client: ResponsiveNetworkClient, *args, **kwargs):
+    async def __api_request(
+        self,
+        method: str,
+        client: ResponsiveNetworkClient,
+        *args,
+        allowed_status_codes: tuple[int, ...] = (),
+        **kwargs,
+    ):
         retry_wait = 2
         while True:
             try:
@@ -241,6 +407,9 @@ class JiraClient:
                     await client.wait(float(response.headers['Retry-After']) + 1)
                     continue
 
+                if response.status_code in allowed_status_codes:
+                    return response
+
                 client.check_status(response, **kwargs)
             except Exception as e:
                 await client.wait(retry_wait, context=str(e))
@@ -11,35 +11,97 @@ from time import monotonic
 import httpx
 
 if typing.TYPE_CHECKING:
-    from textual.widgets import Static
+    from collections.abc import Callable, Generator
+
+    from rich.console import RenderableType
+
+
+class BearerAuth(httpx.Auth):
+    """
+    https://docs.github.com/en/rest/authentication/authenticating-to-the-rest-api#authenticating-with-a-personal-access-token
+    """
+
+    def __init__(self, token: str) -> None:
+        self.token = token
+
+    def auth_flow(self, request: httpx.Request) -> Generator[httpx.Request, httpx.Response, None]:
+        request.headers['Authorization'] = f'Bearer {self.token}'
+        yield request
+
+
+class Status(typing.Protocol):
+    """
+    The parts of a status widget used to show the reason of every wait, satisfied by `Static`.
+    """
+
+    def render(self) -> RenderableType: ...
+
+    def update(self, renderable: RenderableType = '', /) -> None: ...
+
+
+class ConsoleStatus:
+    """
+    A stand-in for the status widget of the UI when running without it, printing the reason of every wait once.
+    """
+
+    def __init__(self, print_status: Callable[[str], None]) -> None:
+        self.__print_status = print_status
+        self.__status: RenderableType = ''
+        self.__waiting = False
+
+    def render(self) -> RenderableType:
+        return self.__status
+
+    def update(self, status: RenderableType = '') -> None:
+        # The countdown of a wait is updated continuously until the original status is restored
+        if isinstance(status, str) and status.startswith(ResponsiveNetworkClient.WAIT_PREFIX):
+            if not self.__waiting:
+                self.__waiting = True
+                self.__print_status(status)
+        else:
+            self.__waiting = False
+            self.__status = status
 
 
 class ResponsiveNetworkClient(httpx.AsyncClient):
-    def __init__(self, status: Static, *args, **kwargs):
+    WAIT_PREFIX = 'Retrying in: '
+
+    def __init__(self, status: Status, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
         self.__status = status
 
+        # Waits may overlap when requests are sent concurrently so only the last one restores the status
+        self.__waits = 0
+        self.__original_status: RenderableType = ''
+
     @property
-    def status(self) -> Static:
+    def status(self) -> Status:
         return self.__status
 
     async def wait(self, seconds_to_wait: int | float, *, context: str = '') -> None:
-        original_status = self.status.render()
-        start_time = monotonic()
-
-        while (elapsed_seconds := monotonic() - start_time) < seconds_to_wait:
-            remaining_minutes, remaining_seconds = divmod(seconds_to_wait - elapsed_seconds, 60)
-            remaining_hours, remaining_minutes = divmod(remaining_minutes, 60)
+        if not self.__waits:
+            self.__original_status = self.status.render()
 
-            message = f'Retrying in: {remaining_hours:02,.0f}:{remaining_minutes:02.0f}:{remaining_seconds:05.2f}'
-            if context:
-                message = f'{message}\n\n{context}'
+        self.__waits += 1
+        start_time = monotonic()
+        try:
+            while (elapsed_seconds := monotonic() - start_time) < seconds_to_wait:
+                remaining_minutes, remaining_seconds = divmod(seconds_to_wait - elapsed_seconds, 60)
+                remaining_hours, remaining_minutes = divmod(remaining_minutes, 60)
 
-            self.status.update(message)
-            await asyncio.sleep(0.1)
+                message = (
+                    f'{self.WAIT_PREFIX}{remaining_hours:02,.0f}:{remaining_minutes:02.0f}:{remaining_seconds:05.2f}'
+                )
+                if context:
+                    message = f'{message}\n\n{context}'
 
-        self.status.update(original_status)
+                self.status.update(message)
+                await asyncio.sleep(0.1)
+        finally:
+            self.__waits -= 1
+            if not self.__waits:
+                self.status.update(self.__original_status)
 
     @staticmethod
     def check_status(response: httpx.Response, **kwargs) -> None:
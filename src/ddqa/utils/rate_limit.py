@@ -0,0 +1,139 @@
+# SPDX-FileCopyrightText: 2023-present Datadog, Inc. <dev@datadoghq.com>
+#
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import httpx
+
+    from ddqa.utils.network import ResponsiveNetworkClient
+
+
+class RateLimitBucket:
+    # Requests are sent as fast as possible until less than this fraction of the limit remains
+    RESERVE_RATIO = 0.2
+
+    def __init__(self) -> None:
+        self.limit = 0
+        self.remaining = 0
+        self.reset = 0.0
+        self.next_request = 0.0
+        self.lock = asyncio.Lock()
+
+    def get_delay(self, now: float) -> float:
+        # Unknown or expired window
+        if self.reset <= now:
+            return 0
+
+        if self.remaining <= 0:
+            return self.reset - now + 1
+
+        if self.remaining > self.limit * self.RESERVE_RATIO:
+            return 0
+
+        return max(0.0, self.next_request - now)
+
+    def consume(self, now: float) -> None:
+        if self.reset <= now:
+            return
+
+        self.remaining -= 1
+        if 0 < self.remaining <= self.limit * self.RESERVE_RATIO:
+            # Spread what is left of the budget evenly over what is left of the window
+            self.next_request = now + (self.reset - now) / self.remaining
+
+    def update(self, limit: int, remaining: int, reset: float) -> None:
+        if reset != self.reset:
+            self.remaining = remaining
+        else:
+            # Account for requests that were sent before this response was received
+            self.remaining = min(self.remaining, remaining)
+
+        self.limit = max(limit, self.remaining)
+        self.reset = reset
+
+
+class RateLimiter:
+    """
+    https://docs.github.com/en/rest/using-the-rest-api/rate-limits-for-the-rest-api
+    https://docs.github.com/en/rest/using-the-rest-api/best-practices-for-using-the-rest-api#handle-rate-limit-errors-appropriately
+    """
+
+    # The minimum amount of time to wait after hitting a secondary rate limit without a `Retry-After` header
+    SECONDARY_LIMIT_WAIT = 60
+
+    def __init__(self) -> None:
+        self.__buckets: dict[str, RateLimitBucket] = {}
+        self.__blocked_until = 0.0
+
+    @property
+    def buckets(self) -> dict[str, RateLimitBucket]:
+        return self.__buckets
+
+    def get_bucket(self, resource: str) -> RateLimitBucket:
+        if (bucket := self.__buckets.get(resource)) is None:
+            bucket = self.__buckets[resource] = RateLimitBucket()
+
+        return bucket
+
+    def get_headroom(self, resource: str, now: float) -> float:
+        if self.__blocked_until > now:
+            return -1
+
+        bucket = self.__buckets.get(resource)
+        if bucket is None or bucket.reset <= now:
+            return math.inf
+
+        return bucket.remaining
+
+    async def acquire(self, client: ResponsiveNetworkClient, resource: str) -> None:
+        bucket = self.get_bucket(resource)
+
+        # Requests for a given resource are released one at a time so that pacing is applied in order
+        async with bucket.lock:
+            while True:
+                now = time.time()
+                delay = max(self.__blocked_until - now, bucket.get_delay(now))
+                if delay <= 0:
+                    break
+
+                if delay < 1:
+                    await asyncio.sleep(delay)
+                else:
+                    await client.wait(delay, context=f'Waiting for the GitHub `{resource}` rate limit')
+
+            bucket.consume(time.time())
+
+    def update(self, response: httpx.Response, resource: str) -> bool:
+        """
+        Record the rate limit information of a response, returning whether the request was throttled.
+        """
+        headers = response.headers
+        resource = headers.get('X-RateLimit-Resource', resource)
+        if 'X-RateLimit-Remaining' in headers and 'X-RateLimit-Reset' in headers:
+            self.get_bucket(resource).update(
+                int(headers.get('X-RateLimit-Limit', 0)),
+                int(headers['X-RateLimit-Remaining']),
+                float(headers['X-RateLimit-Reset']),
+            )
+
+        if response.status_code not in (403, 429):
+            return False
+
+        if 'Retry-After' in headers:
+            self.__blocked_until = max(self.__blocked_until, time.time() + float(headers['Retry-After']))
+            return True
+
+        if headers.get('X-RateLimit-Remaining') == '0':
+            return True
+
+        if response.status_code == 429 or 'secondary rate limit' in response.text.lower():  # noqa: PLR2004
+            self.__blocked_until = max(self.__blocked_until, time.time() + self.SECONDARY_LIMIT_WAIT)
+            return True
+
+        return False
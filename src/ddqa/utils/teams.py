@@ -0,0 +1,40 @@
+# SPDX-FileCopyrightText: 2023-present Datadog, Inc. <dev@datadoghq.com>
+#
+# SPDX-License-Identifier: MIT
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping
+
+    from ddqa.models.config.team import TeamConfig
+
+
+class TeamIndex:
+    """
+    A reverse index of GitHub users to the configured teams they belong to.
+    """
+
+    def __init__(self, teams: dict[str, TeamConfig], team_members: Mapping[str, Iterable[str]]) -> None:
+        # Team name -> GitHub team
+        self.__github_teams = {team_name: team_config.github_team for team_name, team_config in teams.items()}
+
+        # GitHub user -> team names, in the order the teams are configured
+        self.__user_teams: dict[str, list[str]] = {}
+        for team_name, github_team in self.__github_teams.items():
+            for member in team_members.get(github_team, ()):
+                self.__user_teams.setdefault(member, []).append(team_name)
+
+    @property
+    def github_teams(self) -> dict[str, str]:
+        return self.__github_teams
+
+    def matches(self, teams: dict[str, TeamConfig]) -> bool:
+        return self.__github_teams == {team_name: team_config.github_team for team_name, team_config in teams.items()}
+
+    def get_teams(self, user: str) -> list[str]:
+        return self.__user_teams.get(user, [])
+
+    def get_multi_team_users(self) -> dict[str, list[str]]:
+        return {user: teams for user, teams in sorted(self.__user_teams.items()) if len(teams) > 1}
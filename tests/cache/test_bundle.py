@@ -0,0 +1,114 @@
+# SPDX-FileCopyrightText: 2023-present Datadog, Inc. <dev@datadoghq.com>
+#
+# SPDX-License-Identifier: MIT
+import gzip
+import json
+import os
+from unittest.mock import MagicMock
+
+import pytest
+
+from ddqa.cache.bundle import export_cache, import_cache
+from ddqa.cache.github import GitHubCache
+from ddqa.utils.fs import Path
+
+
+def get_github_cache(cache_dir: Path) -> GitHubCache:
+    github_repo = MagicMock()
+    github_repo.org = 'Datadog'
+    github_repo.repo_name = 'test-repo'
+    return GitHubCache(cache_dir, github_repo)
+
+
+def write_bundle(path: Path, *records):
+    with gzip.open(path, 'wt', encoding='utf-8') as bundle:
+        bundle.writelines(f'{json.dumps(record)}\n' for record in records)
+
+
+def test_round_trip(temp_dir):
+    source_dir = temp_dir / 'source'
+    source = get_github_cache(source_dir)
+    source.cache_candidate_data('hash1', {'id': '1', 'title': 'title1'}, fetched_at=100, updated_at='2024-01-01')
+    source.cache_candidate_data('hash2', {'id': 'hash2', 'title': 'subject2'})
+    source.save_team_members('team1', {'m1'})
+    source.save_http_response('https://api.github.com/repos/Datadog/test-repo/pulls/1', {'ETag': '"foo"'}, '{}')
+    source.save_pull_request_reviewers('1', [{'name': 'username1', 'association': 'member'}])
+    jira_file = source_dir / 'jira' / 'user_ids.json'
+    jira_file.parent.ensure_dir_exists()
+    jira_file.write_text('{"key": "id"}')
+
+    bundle_path = temp_dir / 'cache.jsonl.gz'
+    result = export_cache(source_dir, bundle_path)
+    assert (result.pull_requests, result.commits, result.files) == (1, 2, 2)
+
+    target_dir = temp_dir / 'target'
+    result = import_cache(target_dir, bundle_path)
+    assert (result.pull_requests, result.commits, result.files) == (1, 2, 2)
+
+    target = get_github_cache(target_dir)
+    hits, misses = target.get_many(['hash1', 'hash2'])
+    assert hits == {'hash1': {'id': '1', 'title': 'title1'}, 'hash2': {'id': 'hash2', 'title': 'subject2'}}
+    assert not misses
+    assert target.get_pull_request_freshness('1') == (100, '2024-01-01')
+    assert target.get_team_members('team1') == {'m1'}
+    assert target.get_pull_request_reviewers('1') == [{'name': 'username1', 'association': 'member'}]
+    assert target.get_http_response('https://api.github.com/repos/Datadog/test-repo/pulls/1') == {
+        'url': 'https://api.github.com/repos/Datadog/test-repo/pulls/1',
+        'validators': {'ETag': '"foo"'},
+        'body': '{}',
+    }
+    assert (target_dir / 'jira' / 'user_ids.json').read_text() == '{"key": "id"}'
+    # A single lock is taken for the whole import
+    assert [path.name for path in target_dir.rglob('*.lock')] == ['import.lock']
+
+
+def test_newest_wins(temp_dir):
+    target = get_github_cache(temp_dir)
+    target.cache_candidate_data('hash1', {'id': '1', 'title': 'local1'}, fetched_at=200)
+    target.cache_candidate_data('hash2', {'id': '2', 'title': 'local2'}, fetched_at=200)
+    team_members_file = target.get_team_members_file('team1')
+    team_members_file.write_text('local')
+    os.utime(team_members_file, (200, 200))
+    target.database.close()
+
+    bundle_path = temp_dir / 'cache.jsonl.gz'
+    pull_request = {'type': 'pull_request', 'repo': 'Datadog/test-repo', 'updated_at': None, 'accessed_at': None}
+    write_bundle(
+        bundle_path,
+        {'format': 'ddqa-cache', 'version': 1},
+        {**pull_request, 'number': '1', 'data': '{"id": "1", "title": "remote1"}', 'fetched_at': 100},
+        {**pull_request, 'number': '2', 'data': '{"id": "2", "title": "remote2"}', 'fetched_at': 300},
+        {'type': 'commit', 'repo': 'Datadog/test-repo', 'hash': 'hash3', 'pr': '2', 'data': None, 'accessed_at': 0},
+        {'type': 'file', 'path': 'github/Datadog/test-repo/team_members/team1.txt', 'mtime': 100, 'content': 'old'},
+    )
+
+    result = import_cache(temp_dir, bundle_path)
+    assert (result.pull_requests, result.commits, result.files) == (1, 1, 0)
+
+    target = get_github_cache(temp_dir)
+    assert target.get_cached_candidate_data_from_commit('hash1') == {'id': '1', 'title': 'local1'}
+    assert target.get_cached_candidate_data_from_commit('hash2') == {'id': '2', 'title': 'remote2'}
+    assert target.get_cached_candidate_data_from_commit('hash3') == {'id': '2', 'title': 'remote2'}
+    assert team_members_file.read_text() == 'local'
+
+
+def test_unsupported_version(temp_dir):
+    bundle_path = temp_dir / 'cache.jsonl.gz'
+    write_bundle(bundle_path, {'format': 'ddqa-cache', 'version': 9000})
+
+    with pytest.raises(ValueError, match='Unsupported cache bundle version `9000`, expected `1`'):
+        import_cache(temp_dir, bundle_path)
+
+
+def test_invalid_path(temp_dir):
+    bundle_path = temp_dir / 'cache.jsonl.gz'
+    write_bundle(
+        bundle_path,
+        {'format': 'ddqa-cache', 'version': 1},
+        {'type': 'file', 'path': 'github/../../outside.txt', 'mtime': 100, 'content': ''},
+    )
+
+    with pytest.raises(ValueError, match='Invalid path in cache bundle: github/../../outside.txt'):
+        import_cache(temp_dir / 'cache', bundle_path)
+
+    assert not (temp_dir / 'outside.txt').exists()
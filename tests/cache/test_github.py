@@ -1,6 +1,18 @@
 # SPDX-FileCopyrightText: 2023-present Datadog, Inc. <dev@datadoghq.com>
 #
 # SPDX-License-Identifier: MIT
+import asyncio
+import json
+import multiprocessing
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+from unittest.mock import MagicMock
+
+from pydantic import HttpUrl
+
+from ddqa.cache.github import GitHubCache
+from ddqa.models.github import TestCandidate as Candidate
+from ddqa.utils.fs import Path
 
 
 class TestTeamMembers:
@@ -20,3 +32,222 @@ class TestTeamMembers:
     def test_write_read(self, github_cache):
         github_cache.save_team_members('random', {'m1', 'm2'})
         assert {'m1', 'm2'} == github_cache.get_team_members('random')
+
+
+class TestCandidates:
+    def test_write_read(self, github_cache):
+        assert github_cache.get_cached_candidate_data_from_commit('hash1') is None
+
+        github_cache.cache_candidate_data('hash1', {'id': 'hash1', 'title': 'subject1'})
+        github_cache.cache_candidate_data('hash2', {'id': '1', 'title': 'title1', 'assigned_teams': {'foo'}})
+        github_cache.duplicate_cached_candidate_data_from_pr_number('hash3', '1')
+
+        assert github_cache.get_cached_candidate_data_from_commit('hash1') == {'id': 'hash1', 'title': 'subject1'}
+        assert github_cache.get_cached_candidate_data_from_commit('hash2') == {
+            'id': '1',
+            'title': 'title1',
+            'assigned_teams': ['foo'],
+        }
+        assert github_cache.get_cached_candidate_data_from_commit('hash3') == {
+            'id': '1',
+            'title': 'title1',
+            'assigned_teams': ['foo'],
+        }
+        assert github_cache.get_cached_candidate_data_from_pr_number('1')['title'] == 'title1'
+        assert github_cache.get_cached_candidate_data_from_pr_number('2') is None
+
+    def test_migrate_directory_layout(self, github_cache):
+        commits_dir = github_cache.cache_dir / 'commits'
+        pull_requests_dir = github_cache.cache_dir / 'pull_requests'
+        (commits_dir / 'hash1').ensure_dir_exists()
+        (commits_dir / 'hash1' / 'no_pr.json').write_text('{"id": "hash1", "title": "subject1"}')
+        (commits_dir / 'hash2').ensure_dir_exists()
+        (commits_dir / 'hash2' / '1').touch()
+        pull_requests_dir.ensure_dir_exists()
+        (pull_requests_dir / '1.json').write_text('{"id": "1", "title": "title1"}')
+
+        assert github_cache.get_cached_candidate_data_from_commit('hash1') == {'id': 'hash1', 'title': 'subject1'}
+        assert github_cache.get_cached_candidate_data_from_commit('hash2') == {'id': '1', 'title': 'title1'}
+        assert not commits_dir.exists()
+        assert not pull_requests_dir.exists()
+
+    def test_migrate_http_responses(self, github_cache):
+        http_dir = github_cache.cache_dir / 'http'
+        http_dir.ensure_dir_exists()
+        url = 'https://api.github.com/repos/Datadog/test-repo/pulls/1'
+        (http_dir / 'response.json').write_text(
+            json.dumps({'url': url, 'validators': {'ETag': '"foo"'}, 'body': '{"number": 1}'})
+        )
+
+        assert github_cache.get_http_response(url) == {
+            'url': url,
+            'validators': {'ETag': '"foo"'},
+            'body': '{"number": 1}',
+        }
+        assert not http_dir.exists()
+
+    def test_migrate_pull_request_reviews(self, github_cache):
+        reviews_dir = github_cache.cache_dir / 'pull_request_reviews'
+        reviews_dir.ensure_dir_exists()
+        (reviews_dir / '1.json').write_text('[{"name": "username1", "association": "member"}]')
+
+        assert github_cache.get_pull_request_reviewers('1') == [{'name': 'username1', 'association': 'member'}]
+        assert github_cache.get_pull_request_reviewers('2') is None
+        assert not reviews_dir.exists()
+
+    def test_migrate_accessed_at(self, github_cache):
+        github_cache.cache_dir.ensure_dir_exists()
+        connection = sqlite3.connect(str(github_cache.database_file))
+        connection.execute('CREATE TABLE commits (hash TEXT PRIMARY KEY, pr TEXT, data TEXT)')
+        connection.execute(
+            'CREATE TABLE pull_requests (number TEXT PRIMARY KEY, data TEXT NOT NULL, fetched_at REAL, updated_at TEXT)'
+        )
+        connection.execute('INSERT INTO commits VALUES (?, NULL, ?)', ('hash1', '{"id": "hash1", "title": "subject1"}'))
+        connection.commit()
+        connection.close()
+
+        assert github_cache.get_cached_candidate_data_from_commit('hash1') == {'id': 'hash1', 'title': 'subject1'}
+        github_cache.save_access_times()
+        accessed_at = github_cache.database.execute('SELECT accessed_at FROM commits').fetchone()[0]
+        assert accessed_at is not None
+
+    def test_get_many(self, github_cache, mocker):
+        github_cache.cache_candidate_data('hash1', {'id': 'hash1', 'title': 'subject1'})
+        github_cache.cache_candidate_data('hash3', {'id': '1', 'title': 'title1'})
+        github_cache.duplicate_cached_candidate_data_from_pr_number('hash4', '1')
+        mocker.patch.object(github_cache, 'BULK_QUERY_SIZE', 2)
+
+        hits, misses = github_cache.get_many(['hash4', 'hash1', 'hash2', 'hash3', 'hash5'])
+        assert list(hits) == ['hash4', 'hash1', 'hash3']
+        assert hits['hash1'] == {'id': 'hash1', 'title': 'subject1'}
+        assert hits['hash3'] == hits['hash4'] == {'id': '1', 'title': 'title1'}
+        assert misses == ['hash2', 'hash5']
+
+    def test_access_times_saved_once(self, github_cache):
+        github_cache.cache_candidate_data('hash1', {'id': 'hash1', 'title': 'subject1'})
+        github_cache.cache_candidate_data('hash2', {'id': '1', 'title': 'title1'})
+        github_cache.cache_candidate_data('hash3', {'id': '2', 'title': 'title2'})
+        github_cache.database.execute('UPDATE commits SET accessed_at = 0')
+        github_cache.database.execute('UPDATE pull_requests SET accessed_at = 0')
+
+        github_cache.get_cached_candidate_data_from_commit('hash1')
+        github_cache.get_many(['hash2'])
+        github_cache.get_cached_candidate_data_from_pr_number('2')
+
+        # Reads do not write to the database
+        assert github_cache.database.execute('SELECT MAX(accessed_at) FROM commits').fetchone()[0] == 0
+        assert github_cache.database.execute('SELECT MAX(accessed_at) FROM pull_requests').fetchone()[0] == 0
+
+        github_cache.save_access_times()
+        assert dict(github_cache.database.execute('SELECT hash, accessed_at > 0 FROM commits')) == {
+            'hash1': 1,
+            'hash2': 1,
+            'hash3': 0,
+        }
+        assert dict(github_cache.database.execute('SELECT number, accessed_at > 0 FROM pull_requests')) == {
+            '1': 1,
+            '2': 1,
+        }
+
+
+class TestDeferredCandidateData:
+    def test_without_event_loop(self, github_cache):
+        candidate = Candidate(id='1', title='title1', url='')
+        github_cache.defer_candidate_data('hash1', candidate)
+
+        assert github_cache.get_cached_candidate_data_from_commit('hash1')['title'] == 'title1'
+
+    async def test_coalesced(self, github_cache, mocker):
+        mocker.patch.object(github_cache, 'DEFERRED_WRITE_DELAY', 0.1)
+        connect = mocker.spy(sqlite3, 'connect')
+        _ = github_cache.database
+
+        candidate = Candidate(id='1', title='title1', url='')
+        for team in ('foo', 'bar', 'baz'):
+            candidate.assigned_teams.add(team)
+            github_cache.defer_candidate_data('hash1', candidate)
+            await asyncio.sleep(0.05)
+
+        assert github_cache.get_cached_candidate_data_from_commit('hash1') is None
+
+        await asyncio.sleep(0.2)
+        github_cache.flush_deferred_candidate_data()
+        assert sorted(github_cache.get_cached_candidate_data_from_commit('hash1')['assigned_teams']) == [
+            'bar',
+            'baz',
+            'foo',
+        ]
+
+        # A single write with its own connection
+        assert connect.call_count == 2
+
+    async def test_limit(self, github_cache, mocker):
+        mocker.patch.object(github_cache, 'DEFERRED_WRITE_LIMIT', 2)
+
+        github_cache.defer_candidate_data('hash1', Candidate(id='hash1', title='subject1', url=''))
+        await asyncio.sleep(0)
+        assert github_cache.get_cached_candidate_data_from_commit('hash1') is None
+
+        github_cache.defer_candidate_data('hash2', Candidate(id='hash2', title='subject2', url=''))
+        await asyncio.sleep(0)
+        github_cache.flush_deferred_candidate_data()
+        assert github_cache.get_cached_candidate_data_from_commit('hash1')['title'] == 'subject1'
+        assert github_cache.get_cached_candidate_data_from_commit('hash2')['title'] == 'subject2'
+
+    async def test_ordered(self, github_cache, mocker):
+        mocker.patch.object(github_cache, 'DEFERRED_WRITE_LIMIT', 1)
+
+        for title in ('title1', 'title2', 'title3'):
+            github_cache.defer_candidate_data('hash1', Candidate(id='hash1', title=title, url=''))
+            await asyncio.sleep(0)
+
+        github_cache.defer_candidate_data('hash1', Candidate(id='hash1', title='title4', url=''))
+        github_cache.flush_deferred_candidate_data()
+        assert github_cache.get_cached_candidate_data_from_commit('hash1')['title'] == 'title4'
+
+    async def test_flush(self, github_cache):
+        github_cache.defer_candidate_data('hash1', Candidate(id='hash1', title='subject1', url=''))
+        assert github_cache.get_cached_candidate_data_from_commit('hash1') is None
+
+        github_cache.flush_deferred_candidate_data()
+        assert github_cache.get_cached_candidate_data_from_commit('hash1')['title'] == 'subject1'
+
+
+class TestHttpResponses:
+    def test_write_read(self, github_cache):
+        url = 'https://api.github.com/repos/Datadog/test-repo/pulls/1'
+        assert github_cache.get_http_response(url) is None
+
+        github_cache.save_http_response(url, {'ETag': '"foo"'}, 'body1')
+        github_cache.save_http_response(url, {'ETag': '"bar"'}, 'body2')
+
+        assert github_cache.get_http_response(url) == {'url': url, 'validators': {'ETag': '"bar"'}, 'body': 'body2'}
+        # Responses are stored in the database rather than in files of their own
+        assert not (github_cache.cache_dir / 'http').exists()
+
+
+class TestMergedPullRequests:
+    def test_resolved_commits_removed(self, github_cache):
+        github_cache.save_merged_pull_requests({'hash1': {'number': 1}, 'hash2': {'number': 2}})
+        github_cache.cache_candidate_data('hash1', {'id': '1', 'title': 'title1'})
+        github_cache.save_merged_pull_requests({'hash3': {'number': 3}})
+
+        assert github_cache.merged_pull_requests == {'hash2': {'number': 2}, 'hash3': {'number': 3}}
+        assert github_cache.get_merged_pull_request('hash1') is None
+
+
+def save_global_config(cache_dir: str, source: str) -> None:
+    github_repo = MagicMock()
+    github_repo.org = 'Datadog'
+    github_repo.repo_name = 'test-repo'
+    GitHubCache(Path(cache_dir), github_repo).save_global_config(HttpUrl(source), {'source': source})
+
+
+class TestConcurrentProcesses:
+    def test_global_config(self, github_cache, temp_dir):
+        sources = [f'https://foo.bar/{i}' for i in range(8)]
+        with ProcessPoolExecutor(max_workers=4, mp_context=multiprocessing.get_context('spawn')) as executor:
+            list(executor.map(save_global_config, [str(temp_dir)] * len(sources), sources))
+
+        for source in sources:
+            assert github_cache.load_global_config(source) == {'source': source}
@@ -0,0 +1,86 @@
+# SPDX-FileCopyrightText: 2023-present Datadog, Inc. <dev@datadoghq.com>
+#
+# SPDX-License-Identifier: MIT
+import os
+
+from ddqa.cache.memory import MemoryCache
+
+
+def load_text(path):
+    return path.read_text()
+
+
+class TestMemoryCache:
+    def test_missing(self, temp_dir):
+        assert MemoryCache().get(temp_dir / 'missing.txt', load_text) is None
+
+    def test_loaded_once(self, temp_dir, mocker):
+        path = temp_dir / 'foo.txt'
+        path.write_text('foo')
+        load = mocker.MagicMock(side_effect=load_text)
+
+        memory = MemoryCache()
+        assert memory.get(path, load) == 'foo'
+        assert memory.get(path, load) == 'foo'
+        assert load.call_count == 1
+
+    def test_invalidated_by_external_write(self, temp_dir):
+        path = temp_dir / 'foo.txt'
+        path.write_text('foo')
+
+        memory = MemoryCache()
+        assert memory.get(path, load_text) == 'foo'
+
+        path.write_text('foobar')
+        assert memory.get(path, load_text) == 'foobar'
+
+        path.unlink()
+        assert memory.get(path, load_text) is None
+        assert not len(memory)
+
+    def test_write_through(self, temp_dir, mocker):
+        path = temp_dir / 'foo.txt'
+        path.write_text('foo')
+        load = mocker.MagicMock(side_effect=load_text)
+
+        memory = MemoryCache()
+        memory.put(path, 'foo')
+        assert memory.get(path, load) == 'foo'
+        assert not load.called
+
+    def test_bounded(self, temp_dir, mocker):
+        mocker.patch.object(MemoryCache, 'MAX_ENTRIES', 2)
+        paths = [temp_dir / f'{i}.txt' for i in range(3)]
+        for path in paths:
+            path.write_text(path.stem)
+
+        memory = MemoryCache()
+        for path in paths:
+            memory.get(path, load_text)
+
+        assert len(memory) == 2
+
+        # The least recently used entry was dropped
+        load = mocker.MagicMock(side_effect=load_text)
+        memory.get(paths[2], load)
+        memory.get(paths[0], load)
+        assert load.call_args_list == [mocker.call(paths[0])]
+
+
+class TestGitHubCache:
+    def test_team_members_copied(self, github_cache):
+        github_cache.save_team_members('team1', {'m1', 'm2'})
+
+        members = github_cache.get_team_members('team1')
+        members.discard('m1')
+        assert github_cache.get_team_members('team1') == {'m1', 'm2'}
+
+    def test_global_config_invalidated(self, github_cache):
+        github_cache.save_global_config('https://foo.bar', {'foo': 'bar'})
+        assert github_cache.load_global_config('https://foo.bar') == {'foo': 'bar'}
+
+        # Written by another process
+        github_cache.global_config_file.write_text('{"https://foo.bar": {"foo": "baz"}}')
+        stat = github_cache.global_config_file.stat()
+        os.utime(github_cache.global_config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        assert github_cache.load_global_config('https://foo.bar') == {'foo': 'baz'}
@@ -0,0 +1,97 @@
+# SPDX-FileCopyrightText: 2023-present Datadog, Inc. <dev@datadoghq.com>
+#
+# SPDX-License-Identifier: MIT
+import json
+
+from ddqa.cache.prune import get_cache_entries, prune_cache
+
+
+def set_accessed_at(github_cache, **accessed_at):
+    for key, timestamp in accessed_at.items():
+        github_cache.database.execute('UPDATE pull_requests SET accessed_at = ? WHERE number = ?', (timestamp, key))
+        github_cache.database.execute('UPDATE commits SET accessed_at = ? WHERE hash = ?', (timestamp, key))
+
+
+def populate(github_cache):
+    github_cache.cache_candidate_data('hash1', {'id': '1', 'title': 'title1'})
+    github_cache.duplicate_cached_candidate_data_from_pr_number('hash2', '1')
+    github_cache.cache_candidate_data('hash3', {'id': '3', 'title': 'title3'})
+    github_cache.cache_candidate_data('hash4', {'id': 'hash4', 'title': 'subject4'})
+    github_cache.save_pull_request_reviewers('1', [])
+    github_cache.save_pull_request_reviewers('3', [])
+    github_cache.save_team_members('team1', {'m1'})
+
+    set_accessed_at(github_cache, **{'1': 100, 'hash1': 100, 'hash2': 100, '3': 300, 'hash3': 300, 'hash4': 200})
+
+
+def test_max_age(github_cache, temp_dir):
+    populate(github_cache)
+
+    result = prune_cache(temp_dir, max_age=150, now=400)
+
+    assert (result.pull_requests, result.commits) == (1, 1)
+    assert github_cache.get_many(['hash1', 'hash2', 'hash3', 'hash4'])[1] == ['hash1', 'hash2', 'hash4']
+    assert github_cache.get_pull_request_reviewers('1') is None
+    assert github_cache.get_pull_request_reviewers('3') == []
+    assert github_cache.get_team_members('team1') == {'m1'}
+
+
+def test_max_size_least_recently_used(github_cache, temp_dir):
+    populate(github_cache)
+    # Reading a commit counts as an access of its pull request
+    github_cache.get_cached_candidate_data_from_commit('hash2')
+    github_cache.save_access_times()
+    # Room for the pull request and both of its commits
+    max_size = next(entry.size for entry in get_cache_entries(github_cache.cache_dir) if entry.key == '1')
+
+    result = prune_cache(temp_dir, max_size=max_size)
+
+    assert (result.pull_requests, result.commits) == (1, 1)
+    hits, misses = github_cache.get_many(['hash1', 'hash2', 'hash3', 'hash4'])
+    assert list(hits) == ['hash1', 'hash2']
+    assert misses == ['hash3', 'hash4']
+
+
+def test_within_limits(github_cache, temp_dir):
+    populate(github_cache)
+
+    result = prune_cache(temp_dir, max_size=1_000_000, max_age=1_000_000, now=400)
+
+    assert (result.pull_requests, result.commits, result.bytes) == (0, 0, 0)
+    assert github_cache.get_many(['hash1', 'hash2', 'hash3', 'hash4'])[1] == []
+
+
+def test_evict(github_cache):
+    populate(github_cache)
+    github_cache.get_cached_candidate_data_from_pr_number('1')
+
+    github_cache.evict(0)
+
+    assert github_cache.get_many(['hash1', 'hash2', 'hash3', 'hash4'])[1] == ['hash1', 'hash2', 'hash3', 'hash4']
+    assert github_cache.get_team_members('team1') == {'m1'}
+
+
+def test_no_cache(temp_dir):
+    result = prune_cache(temp_dir / 'missing', max_size=0)
+
+    assert (result.pull_requests, result.commits, result.bytes) == (0, 0, 0)
+
+
+def test_orphaned_entries(github_cache, temp_dir):
+    populate(github_cache)
+    for number in ('1', '3'):
+        github_cache.save_http_response(f'https://api.github.com/repos/Datadog/test-repo/pulls/{number}', {}, '{}')
+    github_cache.save_merged_pull_requests(
+        {
+            'hash5': {'number': 1, 'merged_at': '1970-01-01T00:06:40Z'},
+            'hash6': {'number': 5, 'merged_at': '1970-01-01T00:01:40Z'},
+            'hash7': {'number': 6, 'merged_at': '1970-01-01T00:06:40Z'},
+        }
+    )
+
+    prune_cache(temp_dir, max_age=150, now=400)
+
+    assert github_cache.get_http_response('https://api.github.com/repos/Datadog/test-repo/pulls/1') is None
+    assert github_cache.get_http_response('https://api.github.com/repos/Datadog/test-repo/pulls/3') is not None
+    # Evicted pull requests and those merged too long ago are removed from the index
+    assert list(json.loads(github_cache.merged_pull_requests_file.read_text())) == ['hash7']
@@ -0,0 +1,64 @@
+# SPDX-FileCopyrightText: 2023-present Datadog, Inc. <dev@datadoghq.com>
+#
+# SPDX-License-Identifier: MIT
+from ddqa.cache.stats import CacheStats, get_cache_usage
+
+
+class TestCacheStats:
+    def test_record(self):
+        stats = CacheStats()
+        stats.record('github/commits', hits=2, misses=1)
+        stats.record('github/commits', hits=1)
+
+        assert stats.counts == {'github/commits': {'hits': 3, 'misses': 1}}
+
+    def test_save_runs(self, temp_dir):
+        github_stats = CacheStats()
+        github_stats.record('github/commits', hits=1, misses=1)
+        jira_stats = CacheStats()
+        jira_stats.record('jira/user_ids', hits=1)
+
+        CacheStats.save_run(temp_dir, github_stats, jira_stats)
+        runs = CacheStats.load_runs(temp_dir)
+
+        assert len(runs) == 1
+        assert runs[0]['counts'] == {
+            'github/commits': {'hits': 1, 'misses': 1},
+            'jira/user_ids': {'hits': 1, 'misses': 0},
+        }
+
+    def test_nothing_recorded(self, temp_dir):
+        CacheStats.save_run(temp_dir, CacheStats())
+
+        assert not CacheStats.get_file(temp_dir).exists()
+
+    def test_max_runs(self, temp_dir, mocker):
+        mocker.patch.object(CacheStats, 'MAX_RUNS', 2)
+        for hits in range(3):
+            stats = CacheStats()
+            stats.record('github/commits', hits=hits)
+            CacheStats.save_run(temp_dir, stats)
+
+        assert [run['counts']['github/commits']['hits'] for run in CacheStats.load_runs(temp_dir)] == [1, 2]
+
+
+def test_cache_usage(github_cache, temp_dir):
+    github_cache.cache_candidate_data('hash1', {'id': '1', 'title': 'title1'})
+    github_cache.cache_candidate_data('hash2', {'id': 'hash2', 'title': 'subject2'})
+    github_cache.save_team_members('team1', {'m1', 'm2'})
+
+    projects_dir = temp_dir / 'jira' / 'projects' / 'FOO'
+    projects_dir.mkdir(parents=True)
+    (projects_dir / 'Task.json').write_text('{}')
+
+    usage = get_cache_usage(temp_dir)
+
+    assert usage['github/commits'].entries == 2
+    assert usage['github/pull_requests'].entries == 1
+    assert usage['github/pull_requests'].bytes > 0
+    assert usage['github/pull_requests'].inodes == 0
+    assert usage['github/team_members'].entries == 1
+    assert usage['github/team_members'].inodes == 2
+    assert usage['jira/projects'].entries == 1
+    assert usage['jira/projects'].inodes == 3
+    assert usage['total'].bytes >= usage['github/team_members'].bytes + usage['jira/projects'].bytes
@@ -0,0 +1,24 @@
+# SPDX-FileCopyrightText: 2023-present Datadog, Inc. <dev@datadoghq.com>
+#
+# SPDX-License-Identifier: MIT
+import gzip
+import json
+
+
+def test(ddqa, temp_dir):
+    team_members_file = temp_dir / 'github' / 'org' / 'repo' / 'team_members' / 'team1.txt'
+    team_members_file.parent.ensure_dir_exists()
+    team_members_file.write_text('m1')
+    bundle_path = temp_dir.parent / 'cache.jsonl.gz'
+
+    result = ddqa('--cache-dir', temp_dir, 'cache', 'export', str(bundle_path))
+
+    assert result.exit_code == 0, result.output
+    assert result.output == f'Exported 0 pull request(s), 0 commit(s) and 1 file(s) to {bundle_path}\n'
+
+    with gzip.open(bundle_path, 'rt', encoding='utf-8') as bundle:
+        records = [json.loads(line) for line in bundle]
+
+    assert records[0] == {'format': 'ddqa-cache', 'version': 1}
+    assert records[1]['path'] == 'github/org/repo/team_members/team1.txt'
+    assert records[1]['content'] == 'm1'
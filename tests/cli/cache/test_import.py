@@ -0,0 +1,29 @@
+# SPDX-FileCopyrightText: 2023-present Datadog, Inc. <dev@datadoghq.com>
+#
+# SPDX-License-Identifier: MIT
+import gzip
+import json
+
+
+def test(ddqa, temp_dir):
+    bundle_path = temp_dir.parent / 'cache.jsonl.gz'
+    with gzip.open(bundle_path, 'wt', encoding='utf-8') as bundle:
+        bundle.write(f'{json.dumps({"format": "ddqa-cache", "version": 1})}\n')
+        bundle.write(f'{json.dumps({"type": "file", "path": "jira/user_ids.json", "mtime": 100, "content": "{}"})}\n')
+
+    result = ddqa('--cache-dir', temp_dir, 'cache', 'import', str(bundle_path))
+
+    assert result.exit_code == 0, result.output
+    assert result.output == f'Imported 0 pull request(s), 0 commit(s) and 1 file(s) from {bundle_path}\n'
+    assert (temp_dir / 'jira' / 'user_ids.json').read_text() == '{}'
+
+
+def test_not_a_bundle(ddqa, temp_dir):
+    bundle_path = temp_dir.parent / 'cache.jsonl.gz'
+    with gzip.open(bundle_path, 'wt', encoding='utf-8') as bundle:
+        bundle.write('{}\n')
+
+    result = ddqa('--cache-dir', temp_dir, 'cache', 'import', str(bundle_path))
+
+    assert result.exit_code == 1, result.output
+    assert result.output == f'Error: Not a cache bundle: {bundle_path}\n'
@@ -0,0 +1,30 @@
+# SPDX-FileCopyrightText: 2023-present Datadog, Inc. <dev@datadoghq.com>
+#
+# SPDX-License-Identifier: MIT
+from unittest.mock import MagicMock
+
+from ddqa.cache.github import GitHubCache
+
+
+def test(ddqa, temp_dir):
+    github_repo = MagicMock()
+    github_repo.org = 'Datadog'
+    github_repo.repo_name = 'test-repo'
+    github_cache = GitHubCache(temp_dir, github_repo)
+    github_cache.cache_candidate_data('hash1', {'id': '1', 'title': 'title1'})
+    github_cache.cache_candidate_data('hash2', {'id': 'hash2', 'title': 'subject2'})
+    github_cache.save_team_members('team1', {'m1'})
+    github_cache.database.close()
+
+    result = ddqa('--cache-dir', temp_dir, 'cache', 'prune', '--max-size', '0')
+
+    assert result.exit_code == 0, result.output
+    assert result.output.startswith('Removed 1 pull request(s) and 1 commit(s), freeing ')
+    assert github_cache.get_team_members('team1') == {'m1'}
+
+
+def test_no_limits(ddqa, temp_dir):
+    result = ddqa('--cache-dir', temp_dir, 'cache', 'prune')
+
+    assert result.exit_code == 2, result.output
+    assert 'At least one of `--max-size` or `--max-age` is required' in result.output
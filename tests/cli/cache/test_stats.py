@@ -0,0 +1,42 @@
+# SPDX-FileCopyrightText: 2023-present Datadog, Inc. <dev@datadoghq.com>
+#
+# SPDX-License-Identifier: MIT
+from ddqa.cache.stats import CacheStats
+
+
+def test_empty(ddqa, helpers, temp_dir):
+    result = ddqa('--cache-dir', temp_dir, 'cache', 'stats')
+
+    assert result.exit_code == 0, result.output
+    assert result.output == helpers.dedent(
+        """
+        Namespace              Entries         Bytes    Inodes
+        github/commits               0             0         0
+        github/pull_requests         0             0         0
+        github/team_members          0             0         0
+        jira/projects                0             0         0
+        total                        0             0         1
+
+        No hit rates recorded yet
+        """,
+        terminal=True,
+    )
+
+
+def test_hit_rates(ddqa, temp_dir):
+    for hits, misses in ((3, 1), (0, 0)):
+        stats = CacheStats()
+        stats.record('github/commits', hits=hits, misses=misses)
+        stats.record('jira/user_ids', hits=1)
+        CacheStats.save_run(temp_dir, stats)
+
+    result = ddqa('--cache-dir', temp_dir, 'cache', 'stats')
+
+    assert result.exit_code == 0, result.output
+    lines = result.output.splitlines()
+    index = lines.index('Hit rates of the last 2 runs:')
+    assert lines[index + 1 :] == [
+        'Namespace                 Hits    Misses     Rate',
+        'github/commits               3         1    75.0%',
+        'jira/user_ids                2         0   100.0%',
+    ]
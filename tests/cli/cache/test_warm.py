@@ -0,0 +1,70 @@
+# SPDX-FileCopyrightText: 2023-present Datadog, Inc. <dev@datadoghq.com>
+#
+# SPDX-License-Identifier: MIT
+from unittest import mock
+
+import pytest
+
+from ddqa.utils.git import GitCommit
+from ddqa.utils.github import GitHubRepository
+from ddqa.utils.network import ConsoleStatus
+
+
+@pytest.fixture(scope='module', autouse=True)
+def mock_remote_url():
+    with mock.patch('ddqa.utils.git.GitRepository.get_remote_url', return_value='https://github.com/org/repo.git'):
+        yield
+
+
+def test_bad_config(ddqa):
+    result = ddqa('cache', 'warm', 'foo', 'bar')
+
+    assert result.exit_code == 1, result.output
+    assert result.output.endswith('Error: Invalid configuration, run `ddqa` to fix it\n')
+
+
+def test_warm(ddqa, isolation, config_file, mocker):
+    config_file.model.data.update(
+        {
+            'repo': 'test',
+            'repos': {'test': {'path': str(isolation)}},
+            'github': {'user': 'foo', 'token': 'bar'},
+            'jira': {'email': 'foo', 'token': 'bar'},
+        }
+    )
+    config_file.save()
+
+    commits = [GitCommit(hash='hash1', subject='subject1'), GitCommit(hash='hash2', subject='subject2')]
+    mocker.patch('ddqa.utils.git.GitRepository.get_mutually_exclusive_commits', return_value=commits)
+
+    concurrency = []
+
+    async def warm_candidates(self, _client, warmed_commits, *_args):
+        assert warmed_commits == commits
+        concurrency.append(self.config.github_concurrency)
+        return 1, 1
+
+    mocker.patch.object(GitHubRepository, 'warm_candidates', warm_candidates)
+
+    result = ddqa('cache', 'warm', 'foo', 'bar', '--concurrency', '32')
+
+    assert result.exit_code == 0, result.output
+    assert result.output.splitlines() == [
+        'Warming the cache with 2 commit(s) for foo..bar',
+        'Cached 1 candidate(s), 1 ignored',
+    ]
+    assert concurrency == [32]
+
+
+def test_console_status():
+    printed = []
+    status = ConsoleStatus(printed.append)
+    status.update('Loading...')
+
+    for remaining in ('00:00:02.00', '00:00:01.90'):
+        status.update(f'Retrying in: {remaining}\n\nWaiting for the GitHub `core` rate limit')
+
+    status.update(status.render())
+
+    assert printed == ['Retrying in: 00:00:02.00\n\nWaiting for the GitHub `core` rate limit']
+    assert status.render() == 'Loading...'
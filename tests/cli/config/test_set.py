@@ -15,6 +15,16 @@ def test(ddqa, helpers):
         repo = ""
         cache_dir = ""
         pr_labels = []
+        github_concurrency = 8
+        github_graphql = false
+        github_subject_resolution = false
+        github_search_batch_size = 1
+        github_pr_sweep = false
+        github_lazy_reviews = true
+        github_cache_max_age = 0
+        github_cache_max_size = 0
+        jira_bulk_create = false
+        jira_concurrency = 1
 
         [github]
         user = "new-user"
@@ -14,6 +14,16 @@ def test_default_scrubbed(ddqa, config_file, helpers):
         repo = ""
         cache_dir = ""
         pr_labels = []
+        github_concurrency = 8
+        github_graphql = false
+        github_subject_resolution = false
+        github_search_batch_size = 1
+        github_pr_sweep = false
+        github_lazy_reviews = true
+        github_cache_max_age = 0
+        github_cache_max_size = 0
+        jira_bulk_create = false
+        jira_concurrency = 1
 
         [github]
         user = "foo"
@@ -27,6 +37,20 @@ def test_default_scrubbed(ddqa, config_file, helpers):
     )
 
 
+def test_scrubbed_token_pool(ddqa, config_file):
+    config_file.model.data.update(
+        {'github': {'user': 'foo', 'token': 'bar', 'tokens': ['baz', 'qux']}, 'jira': {'email': 'foo', 'token': 'bar'}}
+    )
+    config_file.save()
+
+    result = ddqa('config', 'show')
+
+    assert result.exit_code == 0, result.output
+    assert 'tokens = [\n    "*****",\n    "*****",\n]' in result.output
+    assert 'baz' not in result.output
+    assert 'qux' not in result.output
+
+
 def test_reveal(ddqa, config_file, helpers):
     config_file.model.data.update(config_file.model.app.model_dump())
     config_file.model.data.update({'github': {'user': 'foo', 'token': 'bar'}, 'jira': {'email': 'foo', 'token': 'bar'}})
@@ -40,6 +64,16 @@ def test_reveal(ddqa, config_file, helpers):
         repo = ""
         cache_dir = ""
         pr_labels = []
+        github_concurrency = 8
+        github_graphql = false
+        github_subject_resolution = false
+        github_search_batch_size = 1
+        github_pr_sweep = false
+        github_lazy_reviews = true
+        github_cache_max_age = 0
+        github_cache_max_size = 0
+        jira_bulk_create = false
+        jira_concurrency = 1
 
         [github]
         user = "foo"
@@ -1,6 +1,9 @@
 # SPDX-FileCopyrightText: 2023-present Datadog, Inc. <dev@datadoghq.com>
 #
 # SPDX-License-Identifier: MIT
+import pytest
+from pydantic import ValidationError
+
 from ddqa.models.config.auth import GitHubAuth, JiraAuth
 from ddqa.utils.structures import EnvVars
 
@@ -11,6 +14,20 @@ class TestGitHubAuth:
             auth = GitHubAuth()
             assert auth.user == 'my_user'
             assert auth.token == 'my_token'
+            assert auth.tokens == []
+
+    def test_token_pool(self):
+        with EnvVars(
+            {'DDQA_GITHUB_USER': 'my_user', 'DDQA_GITHUB_TOKEN': 'token1', 'DDQA_GITHUB_TOKENS': '["token2", "token3"]'}
+        ):
+            auth = GitHubAuth()
+            assert auth.tokens == ['token2', 'token3']
+            assert auth.token_pool == ['token1', 'token2', 'token3']
+
+    @pytest.mark.parametrize('tokens', [['token1'], ['token2', 'token2']])
+    def test_token_pool_repeated(self, tokens):
+        with pytest.raises(ValidationError, match='must not repeat any token'):
+            GitHubAuth(user='my_user', token='token1', tokens=tokens)
 
 
 class TestJiraAuth:
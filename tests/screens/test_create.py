@@ -1,7 +1,9 @@
 # SPDX-FileCopyrightText: 2023-present Datadog, Inc. <dev@datadoghq.com>
 #
 # SPDX-License-Identifier: MIT
+import asyncio
 import json
+import time
 from collections import defaultdict
 from unittest import mock
 
@@ -9,7 +11,7 @@ import pytest
 from httpx import Request, Response
 from rich.markdown import Markdown as RichMarkdown
 from textual.coordinate import Coordinate
-from textual.widgets import Markdown
+from textual.widgets import DataTable, Markdown
 
 from ddqa.models.github import TestCandidate as Candidate
 from ddqa.screens.create import (
@@ -71,6 +73,8 @@ def mock_pull_requests(mocker):
         bad_responses = 0
         valid_pull_request_commits = []
         responses = []
+        # Pull request number -> response, as reviews are only fetched for candidates that reach creation
+        review_responses = {}
 
         processed_pr_numbers = set()
         for i, pr in enumerate(pull_requests):
@@ -106,12 +110,22 @@ def mock_pull_requests(mocker):
 
             processed_pr_numbers.add(pr['number'])
 
-            responses.append(Response(200, request=Request('GET', ''), content=json.dumps(reviewers)))
+            review_responses[str(pr['number'])] = Response(
+                200, request=Request('GET', ''), content=json.dumps(reviewers)
+            )
+
+        search_responses = iter(responses)
+
+        def get(url, *_args, **_kwargs):
+            if url.endswith('/reviews'):
+                return review_responses[url.split('/')[-2]]
+
+            return next(search_responses)
 
         mocker.patch(
             'ddqa.utils.git.GitRepository.get_mutually_exclusive_commits', return_value=valid_pull_request_commits
         )
-        mocker.patch('httpx.AsyncClient.get', side_effect=responses)
+        mocker.patch('httpx.AsyncClient.get', side_effect=get)
 
     return perform_mock
 
@@ -465,7 +479,12 @@ class TestAssignment:
             },
         )
 
-        create_issues_mock = mocker.patch('ddqa.utils.jira.JiraClient.create_issues')
+        create_issues_mock = mocker.patch(
+            'ddqa.utils.jira.JiraClient.create_issues',
+            side_effect=lambda _client, candidate, _labels, assignments: {
+                team: f'https://foobarbaz.atlassian.net/browse/FOO-{candidate.id}' for team in assignments
+            },
+        )
 
         async with auto_mode_app.run_test() as pilot:
             await pilot.pause(helpers.ASYNC_WAIT)
@@ -474,8 +493,9 @@ class TestAssignment:
             table = sidebar.listing
             num_candidates = len(table.rows)
             assert num_candidates == 2
-            assert table.get_row_at(0) == ['✓', 'title2']
-            assert table.get_row_at(1) == ['', 'title1']
+            # Every candidate had its issue created
+            assert table.get_row_at(0) == [1, 'title2']
+            assert table.get_row_at(1) == [1, 'title1']
             assert [c.assigned for c in table.candidates.values()] == [
                 True,
                 True,
@@ -484,18 +504,20 @@ class TestAssignment:
             assert table.cursor_coordinate == Coordinate(0, 0)
 
             assert str(sidebar.label.render()) == f' 2 / {num_candidates} '
-            assert str(sidebar.status.render()) == 'Ready for creation'
+            assert str(sidebar.status.render()) == 'Finished'
+            assert str(sidebar.button.label) == 'Exit'
             assert not sidebar.button.disabled
 
+            # The issues that were created are shown for the highlighted candidate
             rendering = auto_mode_app.query_one(CandidateRendering)
-            assignments = list(rendering.candidate_assignments.query(LabeledSwitch).results())
-            assert len(assignments) == 2
-            assert str(assignments[0].label.render()) == 'foo'
-            assert assignments[0].switch.value
-            assert str(assignments[1].label.render()) == 'bar'
-            assert not assignments[1].switch.value
+            result = rendering.candidate_assignments.query_one('.assignment-result', DataTable)
+            assert [result.get_row_at(row)[0] for row in range(len(result.rows))] == ['foo']
 
-            assert create_issues_mock.call_count == 1
+            assert create_issues_mock.call_count == 2
+            assert [call.args[3] for call in create_issues_mock.call_args_list] == [
+                {'foo': 'jira-foo1'},
+                {'bar': 'jira-bar1'},
+            ]
 
             assert auto_mode_app.return_code == 0
 
@@ -798,6 +820,11 @@ class TestAssignment:
             assert str(sidebar.status.render()) == 'Ready for creation'
             assert not sidebar.button.disabled
 
+        # Assignments are written to the cache at the latest on exit
+        assert app.github.cache.get_cached_candidate_data_from_pr_number('2')['assigned_teams'] == []
+        assert app.github.cache.get_cached_candidate_data_from_pr_number('1')['assigned_teams'] == []
+        assert app.github.cache.get_cached_candidate_data_from_commit('hash3')['assigned_teams'] == ['bar']
+
     async def test_ignored_labels(self, app, git_repository, helpers, mock_pull_requests):
         app.configure(
             git_repository,
@@ -1112,6 +1139,452 @@ class TestCreation:
                 ),
             ]
 
+    async def test_lazy_reviews(self, app, git_repository, helpers, mocker):
+        app.configure(
+            git_repository,
+            caching=True,
+            data={
+                'github': {'user': 'foo', 'token': 'bar'},
+                'jira': {'email': 'foo@bar.baz', 'token': 'bar'},
+                'github_lazy_reviews': True,
+            },
+            github_teams={'foo-team': ['github-foo1', 'github-foo2', 'github-foo3']},
+        )
+        repo_config = dict(app.repo.model_dump())
+        repo_config['teams'] = {
+            'Foo Baz': {
+                'jira_project': 'FOO',
+                'jira_issue_type': 'Foo-Task',
+                'jira_statuses': {'TODO': 'Backlog', 'IN PROGRESS': 'Sprint', 'DONE': 'Done'},
+                'github_team': 'foo-team',
+                'github_labels': ['foo-label'],
+            },
+        }
+        app.save_repo_config(repo_config)
+
+        mocker.patch(
+            'ddqa.utils.git.GitRepository.get_mutually_exclusive_commits',
+            return_value=[GitCommit(hash='hash1', subject='subject1'), GitCommit(hash='hash2', subject='subject2')],
+        )
+        get_mock = mocker.patch(
+            'httpx.AsyncClient.get',
+            side_effect=[
+                Response(
+                    200,
+                    request=Request('GET', ''),
+                    content=json.dumps(
+                        {
+                            'items': [
+                                {
+                                    'number': '1',
+                                    'title': 'title1',
+                                    'user': {'login': 'github-foo1', 'html_url': 'https://github.com/github-foo1'},
+                                    'labels': [{'name': 'foo-label', 'color': '632ca6'}],
+                                    'body': None,
+                                },
+                            ],
+                        },
+                    ),
+                ),
+                Response(
+                    200,
+                    request=Request('GET', ''),
+                    content=json.dumps(
+                        {
+                            'items': [
+                                {
+                                    'number': '2',
+                                    'title': 'title2',
+                                    'user': {'login': 'github-foo1', 'html_url': 'https://github.com/github-foo1'},
+                                    'labels': [{'name': 'qa/done', 'color': '632ca6'}],
+                                    'body': None,
+                                },
+                            ],
+                        },
+                    ),
+                ),
+                Response(
+                    200,
+                    request=Request('GET', ''),
+                    content=json.dumps([{'user': {'login': 'github-foo2'}, 'author_association': 'MEMBER'}]),
+                ),
+            ],
+        )
+        request_mock = mocker.patch(
+            'httpx.AsyncClient.request',
+            return_value=Response(200, request=Request('POST', ''), content=json.dumps({'key': 'FOO-1'})),
+        )
+
+        async with app.run_test() as pilot:
+            await app.workers.wait_for_complete()
+            await pilot.pause(helpers.ASYNC_WAIT)
+
+            sidebar = app.query_one(CandidateSidebar)
+            assert len(sidebar.listing.rows) == 1
+
+            # Reviews are not fetched while loading candidates
+            assert len(get_mock.call_args_list) == 2
+
+            app.set_focus(sidebar.button)
+            await pilot.press('enter')
+            await app.workers.wait_for_complete()
+            await pilot.pause(helpers.ASYNC_WAIT)
+
+            assert str(sidebar.status.render()) == 'Finished'
+
+        # Only the reviews of the created candidate are fetched
+        assert get_mock.call_args_list[2:] == [
+            mocker.call('https://api.github.com/repos/org/repo/pulls/1/reviews', auth=('foo', 'bar')),
+        ]
+
+        # The reviewer is not preferred for assignment
+        assert request_mock.call_args_list[0].kwargs['json']['fields']['assignee'] == {'id': 'jira-foo3'}
+
+    async def test_stale_candidates_revalidated(self, app, git_repository, helpers, mocker):
+        app.configure(
+            git_repository,
+            caching=True,
+            data={
+                'github': {'user': 'foo', 'token': 'bar'},
+                'jira': {'email': 'foo@bar.baz', 'token': 'bar'},
+                'github_cache_max_age': 3600,
+            },
+            github_teams={'foo-team': ['github-foo1', 'github-foo2']},
+        )
+        repo_config = dict(app.repo.model_dump())
+        repo_config['teams'] = {
+            'Foo Baz': {
+                'jira_project': 'FOO',
+                'jira_issue_type': 'Foo-Task',
+                'jira_statuses': {'TODO': 'Backlog', 'IN PROGRESS': 'Sprint', 'DONE': 'Done'},
+                'github_team': 'foo-team',
+                'github_labels': ['foo-label'],
+            },
+        }
+        app.save_repo_config(repo_config)
+
+        for number, fetched_at in ((1, 0), (2, time.time())):
+            app.github.cache.cache_candidate_data(
+                f'hash{number}',
+                {
+                    'id': str(number),
+                    'title': f'title{number}',
+                    'url': f'https://github.com/org/repo/pull/{number}',
+                    'user': 'github-bar1',
+                    'labels': [{'name': 'foo-label', 'color': '632ca6'}],
+                    'reviewers': [],
+                },
+                fetched_at=fetched_at,
+                updated_at='v1',
+            )
+
+        mocker.patch(
+            'ddqa.utils.git.GitRepository.get_mutually_exclusive_commits',
+            return_value=[GitCommit(hash='hash1', subject='subject1'), GitCommit(hash='hash2', subject='subject2')],
+        )
+        get_mock = mocker.patch(
+            'httpx.AsyncClient.get',
+            side_effect=[
+                Response(
+                    200,
+                    request=Request('GET', ''),
+                    content=json.dumps(
+                        {
+                            'number': 1,
+                            'title': 'new title1',
+                            'user': {'login': 'github-bar1', 'html_url': 'https://github.com/github-bar1'},
+                            'labels': [],
+                            'body': None,
+                            'updated_at': 'v2',
+                        },
+                    ),
+                ),
+            ],
+        )
+
+        async with app.run_test() as pilot:
+            await app.workers.wait_for_complete()
+            await pilot.pause(helpers.ASYNC_WAIT)
+
+            sidebar = app.query_one(CandidateSidebar)
+            table = sidebar.listing
+            assert len(table.rows) == 2
+            assert table.get_row_at(0) == ['', 'new title1']
+            assert table.get_row_at(1) == ['✓', 'title2']
+            assert [c.assigned for c in table.candidates.values()] == [False, True]
+            assert str(sidebar.label.render()) == ' 1 / 2 '
+
+        # Only the stale candidate was fetched again
+        assert [call.args[0] for call in get_mock.call_args_list] == ['https://api.github.com/repos/org/repo/pulls/1']
+
+    async def test_stale_candidates_revalidated_ignored(self, app, git_repository, helpers, mocker):
+        app.configure(
+            git_repository,
+            caching=True,
+            data={
+                'github': {'user': 'foo', 'token': 'bar'},
+                'jira': {'email': 'foo@bar.baz', 'token': 'bar'},
+                'github_cache_max_age': 3600,
+            },
+            github_teams={'foo-team': ['github-foo1', 'github-foo2']},
+        )
+        repo_config = dict(app.repo.model_dump())
+        repo_config['teams'] = {
+            'Foo Baz': {
+                'jira_project': 'FOO',
+                'jira_issue_type': 'Foo-Task',
+                'jira_statuses': {'TODO': 'Backlog', 'IN PROGRESS': 'Sprint', 'DONE': 'Done'},
+                'github_team': 'foo-team',
+                'github_labels': ['foo-label'],
+            },
+        }
+        app.save_repo_config(repo_config)
+
+        for number, fetched_at in ((1, 0), (2, time.time())):
+            app.github.cache.cache_candidate_data(
+                f'hash{number}',
+                {
+                    'id': str(number),
+                    'title': f'title{number}',
+                    'url': f'https://github.com/org/repo/pull/{number}',
+                    'user': 'github-foo1',
+                    'labels': [],
+                    'reviewers': [],
+                },
+                fetched_at=fetched_at,
+                updated_at='v1',
+            )
+
+        mocker.patch(
+            'ddqa.utils.git.GitRepository.get_mutually_exclusive_commits',
+            return_value=[GitCommit(hash='hash1', subject='subject1'), GitCommit(hash='hash2', subject='subject2')],
+        )
+        get_mock = mocker.patch(
+            'httpx.AsyncClient.get',
+            side_effect=[
+                Response(
+                    200,
+                    request=Request('GET', ''),
+                    content=json.dumps(
+                        {
+                            'number': 1,
+                            'title': 'new title1',
+                            'user': {'login': 'github-foo1', 'html_url': 'https://github.com/github-foo1'},
+                            'labels': [{'name': 'qa/done', 'color': '632ca6'}],
+                            'body': None,
+                            'updated_at': 'v2',
+                        },
+                    ),
+                ),
+            ],
+        )
+
+        async with app.run_test() as pilot:
+            await app.workers.wait_for_complete()
+            await pilot.pause(helpers.ASYNC_WAIT)
+
+            sidebar = app.query_one(CandidateSidebar)
+            table = sidebar.listing
+            assert len(table.rows) == 1
+            assert table.get_row_at(0) == ['✓', 'title2']
+            assert [c.data.id for c in table.candidates.values()] == ['2']
+
+        assert [call.args[0] for call in get_mock.call_args_list] == ['https://api.github.com/repos/org/repo/pulls/1']
+
+        # The team that was assigned to the author before revalidation is not kept
+        app.github.cache.flush_deferred_candidate_data()
+        cached_data = app.github.cache.get_cached_candidate_data_from_pr_number('1')
+        assert cached_data['labels'] == [{'name': 'qa/done', 'color': '632ca6'}]
+        assert not cached_data['assigned_teams']
+
+    async def test_bulk(self, app, git_repository, helpers, mocker):
+        app.configure(
+            git_repository,
+            caching=True,
+            data={
+                'github': {'user': 'foo', 'token': 'bar'},
+                'jira': {'email': 'foo@bar.baz', 'token': 'bar'},
+                'jira_bulk_create': True,
+            },
+            github_teams={'foo-team': ['github-foo1', 'github-foo2']},
+        )
+        repo_config = dict(app.repo.model_dump())
+        repo_config['teams'] = {
+            'Foo Baz': {
+                'jira_project': 'FOO',
+                'jira_issue_type': 'Foo-Task',
+                'jira_statuses': {'TODO': 'Backlog', 'IN PROGRESS': 'Sprint', 'DONE': 'Done'},
+                'github_team': 'foo-team',
+                'github_labels': ['foo-label'],
+            },
+        }
+        app.save_repo_config(repo_config)
+
+        mocker.patch(
+            'ddqa.utils.git.GitRepository.get_mutually_exclusive_commits',
+            return_value=[GitCommit(hash='hash1', subject='subject1'), GitCommit(hash='hash2', subject='subject2')],
+        )
+        mocker.patch(
+            'httpx.AsyncClient.get',
+            side_effect=[
+                *(
+                    Response(
+                        200,
+                        request=Request('GET', ''),
+                        content=json.dumps(
+                            {
+                                'items': [
+                                    {
+                                        'number': str(number),
+                                        'title': f'title{number}',
+                                        'user': {'login': 'username1', 'html_url': 'https://github.com/username1'},
+                                        'labels': [{'name': 'foo-label', 'color': '632ca6'}],
+                                        'body': None,
+                                    },
+                                ],
+                            },
+                        ),
+                    )
+                    for number in (1, 2)
+                ),
+                # Reviews are only fetched once issues are created
+                *(Response(200, request=Request('GET', ''), content=json.dumps([])) for _ in (1, 2)),
+            ],
+        )
+        request_mock = mocker.patch(
+            'httpx.AsyncClient.request',
+            return_value=Response(
+                201,
+                request=Request('POST', ''),
+                content=json.dumps(
+                    {
+                        'issues': [{'id': '1', 'key': 'FOO-1'}],
+                        'errors': [
+                            {
+                                'status': 400,
+                                'elementErrors': {'errorMessages': ['Issue type is invalid'], 'errors': {}},
+                                'failedElementNumber': 1,
+                            },
+                        ],
+                    },
+                ),
+            ),
+        )
+
+        async with app.run_test() as pilot:
+            await app.workers.wait_for_complete()
+            await pilot.pause(helpers.ASYNC_WAIT)
+
+            sidebar = app.query_one(CandidateSidebar)
+            table = sidebar.listing
+            assert len(table.rows) == 2
+
+            app.set_focus(sidebar.button)
+            await pilot.press('enter')
+            await app.workers.wait_for_complete()
+            await pilot.pause(helpers.ASYNC_WAIT)
+
+            assert str(sidebar.status.render()) == 'Finished'
+            assert table.get_row_at(0) == [1, 'title1']
+            assert table.get_row_at(1) == [0, 'title2']
+
+        # The issues of every candidate are created at once
+        assert request_mock.call_count == 1
+        assert request_mock.call_args.args == ('POST', 'https://foobarbaz.atlassian.net/rest/api/2/issue/bulk')
+        assert [
+            issue_update['fields']['summary'] for issue_update in request_mock.call_args.kwargs['json']['issueUpdates']
+        ] == ['title1', 'title2']
+
+    async def test_concurrency(self, app, git_repository, helpers, mocker):
+        app.configure(
+            git_repository,
+            caching=True,
+            data={
+                'github': {'user': 'foo', 'token': 'bar'},
+                'jira': {'email': 'foo@bar.baz', 'token': 'bar'},
+                'jira_concurrency': 2,
+            },
+            github_teams={'foo-team': ['github-foo1', 'github-foo2']},
+        )
+        repo_config = dict(app.repo.model_dump())
+        repo_config['teams'] = {
+            'Foo Baz': {
+                'jira_project': 'FOO',
+                'jira_issue_type': 'Foo-Task',
+                'jira_statuses': {'TODO': 'Backlog', 'IN PROGRESS': 'Sprint', 'DONE': 'Done'},
+                'github_team': 'foo-team',
+                'github_labels': ['foo-label'],
+            },
+        }
+        app.save_repo_config(repo_config)
+
+        mocker.patch(
+            'ddqa.utils.git.GitRepository.get_mutually_exclusive_commits',
+            return_value=[GitCommit(hash=f'hash{number}', subject=f'subject{number}') for number in (1, 2, 3)],
+        )
+        mocker.patch(
+            'httpx.AsyncClient.get',
+            side_effect=[
+                *(
+                    Response(
+                        200,
+                        request=Request('GET', ''),
+                        content=json.dumps(
+                            {
+                                'items': [
+                                    {
+                                        'number': str(number),
+                                        'title': f'title{number}',
+                                        'user': {'login': 'username1', 'html_url': 'https://github.com/username1'},
+                                        'labels': [{'name': 'foo-label', 'color': '632ca6'}],
+                                        'body': None,
+                                    },
+                                ],
+                            },
+                        ),
+                    )
+                    for number in (1, 2, 3)
+                ),
+                # Reviews are only fetched once issues are created
+                *(Response(200, request=Request('GET', ''), content=json.dumps([])) for _ in (1, 2, 3)),
+            ],
+        )
+
+        started: list[str] = []
+        second_started = asyncio.Event()
+
+        async def create_issues(_client, candidate, _labels, assignments):
+            started.append(candidate.id)
+            if candidate.id == '1':
+                # The first issue is only created once the next candidate is being created
+                await asyncio.wait_for(second_started.wait(), timeout=5)
+            else:
+                second_started.set()
+
+            return {team: f'https://foobarbaz.atlassian.net/browse/FOO-{candidate.id}' for team in assignments}
+
+        mocker.patch('ddqa.utils.jira.JiraClient.create_issues', side_effect=create_issues)
+
+        async with app.run_test() as pilot:
+            await app.workers.wait_for_complete()
+            await pilot.pause(helpers.ASYNC_WAIT)
+
+            sidebar = app.query_one(CandidateSidebar)
+            table = sidebar.listing
+            assert len(table.rows) == 3
+
+            app.set_focus(sidebar.button)
+            await pilot.press('enter')
+            await app.workers.wait_for_complete()
+            await pilot.pause(helpers.ASYNC_WAIT)
+
+            assert str(sidebar.status.render()) == 'Finished'
+            assert str(sidebar.label.render()) == ' 3 / 3 '
+            assert [table.get_row_at(index) for index in range(3)] == [[1, 'title1'], [1, 'title2'], [1, 'title3']]
+
+        # Candidates are started in order
+        assert started == ['1', '2', '3']
+
 
 class TestGetAssignee:
     def test_no_team_members_in_github(self, jira_config, team_config):
@@ -7,7 +7,7 @@ from unittest.mock import MagicMock
 from zoneinfo import ZoneInfo
 
 import pytest
-from textual.widgets import Select
+from textual.widgets import RadioSet, Select
 
 from ddqa.models.jira import Assignee, JiraIssue, Status
 from ddqa.screens.status import FilterSelect, IssueFilter, StatusScreen
@@ -15,7 +15,7 @@ from ddqa.screens.status import FilterSelect, IssueFilter, StatusScreen
 
 @pytest.fixture
 def app(app):
-    app.select_screen('sync', StatusScreen('7.50.0-qa'))
+    app.select_screen('sync', StatusScreen(('7.50.0-qa',)))
     return app
 
 
@@ -289,3 +289,155 @@ class TestStatus:
             row = screen.statuses['DONE'].table.get_row_at(0)
             assert row[0] == 'i3'
             assert row[1] == 'jira-foo1'
+
+    async def test_refresh(self, app, git_repository, helpers, mocker):
+        app.configure(
+            git_repository,
+            caching=True,
+            data={'github': {'user': 'foo', 'token': 'bar'}, 'jira': {'email': 'foo@bar.baz', 'token': 'bar'}},
+            github_teams={'foo-team': ['github-foo1']},
+        )
+        repo_config = dict(app.repo.model_dump())
+        repo_config['teams'] = {
+            'foo': {
+                'jira_project': 'FOO',
+                'jira_issue_type': 'Foo-Task',
+                'jira_statuses': {'TODO': 'Backlog', 'IN PROGRESS': 'Sprint', 'DONE': 'Done'},
+                'github_team': 'foo-team',
+            },
+        }
+        app.save_repo_config(repo_config)
+
+        def construct_issue(key, status, assignee_id):
+            return JiraIssue.model_construct(
+                key=key,
+                project='FOO',
+                components=[],
+                labels=['7.50.0-qa'],
+                summary='',
+                updated=datetime.now(tz=ZoneInfo('UTC')),
+                status=Status.model_construct(name=status),
+                assignee=Assignee.model_construct(id=assignee_id, name=f'jira-foo{assignee_id}'),
+            )
+
+        issue1 = construct_issue('i1', 'Backlog', '1')
+        issue2 = construct_issue('i2', 'Sprint', '2')
+        issue3 = construct_issue('i3', 'Done', '1')
+        updated_issue1 = construct_issue('i1', 'Done', '1')
+        updated_issue2 = construct_issue('i2', 'Sprint', '1')
+        issue4 = construct_issue('i4', 'Backlog', '3')
+
+        jira_mock = MagicMock()
+        jira_mock.__aiter__.return_value = [issue1, issue2, issue3]
+        refresh_mock = MagicMock()
+        refresh_mock.__aiter__.return_value = [updated_issue1, updated_issue2, issue4]
+        search_mock = mocker.patch('ddqa.utils.jira.JiraClient.search_issues', side_effect=[jira_mock, refresh_mock])
+        mocker.patch('ddqa.utils.jira.JiraClient.get_current_user_id', return_value='current_user_id')
+
+        async with app.run_test() as pilot:
+            await pilot.pause(helpers.ASYNC_WAIT)
+            screen = app.query_one(StatusScreen)
+
+            select = app.query_one('#member_select')
+            select.value = 'jira-foo1'
+            await screen.on_select_changed(Select.Changed(select, 'jira-foo1'))
+            await pilot.pause(helpers.ASYNC_WAIT)
+
+            await pilot.click('#refresh-submission')
+            await app.workers.wait_for_complete()
+            await pilot.pause(helpers.ASYNC_WAIT)
+
+            # The screen is updated in place
+            assert app.query_one(StatusScreen) is screen
+            assert search_mock.call_args.kwargs['updated_since'] > 0
+
+            assert screen.cached_issues == {'i1': updated_issue1, 'i2': updated_issue2, 'i3': issue3, 'i4': issue4}
+            assert screen.member_filter.issues == {
+                'jira-foo1': {'i1': updated_issue1, 'i2': updated_issue2, 'i3': issue3},
+                'jira-foo2': {},
+                'jira-foo3': {'i4': issue4},
+            }
+            assert screen.team_filter.issues == {
+                'foo': {'i1': updated_issue1, 'i2': updated_issue2, 'i3': issue3, 'i4': issue4}
+            }
+
+            # Only the issues matching the selected member are displayed
+            assert select.value == 'jira-foo1'
+            assert ('jira-foo3', 'jira-foo3') in select._options
+            assert screen.statuses['TODO'].table.row_count == 0
+            assert screen.statuses['IN PROGRESS'].table.row_count == 1
+            assert screen.statuses['IN PROGRESS'].table.get_row_at(0)[0] == 'i2'
+            assert sorted(str(row_key.value) for row_key in screen.statuses['DONE'].table.rows) == ['i1', 'i3']
+            assert str(screen.sidebar.status.render()) == '2 / 3 (66.67%)'
+
+    async def test_refresh_removed_issues(self, app, git_repository, helpers, mocker):
+        app.configure(
+            git_repository,
+            caching=True,
+            data={'github': {'user': 'foo', 'token': 'bar'}, 'jira': {'email': 'foo@bar.baz', 'token': 'bar'}},
+            github_teams={'foo-team': ['github-foo1']},
+        )
+        repo_config = dict(app.repo.model_dump())
+        repo_config['teams'] = {
+            'foo': {
+                'jira_project': 'FOO',
+                'jira_issue_type': 'Foo-Task',
+                'jira_statuses': {'TODO': 'Backlog', 'IN PROGRESS': 'Sprint', 'DONE': 'Done'},
+                'github_team': 'foo-team',
+            },
+        }
+        app.save_repo_config(repo_config)
+
+        def construct_issue(key, status, *, project='FOO', labels=('7.50.0-qa',)):
+            return JiraIssue.model_construct(
+                key=key,
+                project=project,
+                components=[],
+                labels=list(labels),
+                summary=f'summary {key}',
+                updated=datetime.now(tz=ZoneInfo('UTC')),
+                status=Status.model_construct(name=status),
+                assignee=Assignee.model_construct(id='1', name='jira-foo1'),
+            )
+
+        issue1 = construct_issue('i1', 'Backlog')
+        issue2 = construct_issue('i2', 'Sprint')
+        issue3 = construct_issue('i3', 'Done')
+
+        jira_mock = MagicMock()
+        jira_mock.__aiter__.return_value = [issue1, issue2, issue3]
+        refresh_mock = MagicMock()
+        refresh_mock.__aiter__.return_value = [
+            # The highlighted issue no longer belongs to a team
+            construct_issue('i1', 'Backlog', project='BAR'),
+            construct_issue('i2', 'Sprint', labels=()),
+            # Issues without the labels that were never displayed are ignored
+            construct_issue('i4', 'Backlog', labels=('7.51.0-qa',)),
+        ]
+        mocker.patch('ddqa.utils.jira.JiraClient.search_issues', side_effect=[jira_mock, refresh_mock])
+        mocker.patch('ddqa.utils.jira.JiraClient.get_current_user_id', return_value='1')
+
+        async with app.run_test() as pilot:
+            await pilot.pause(helpers.ASYNC_WAIT)
+            screen = app.query_one(StatusScreen)
+            assert str(screen.issues.label.render()).strip() == 'i1'
+
+            await pilot.click('#refresh-submission')
+            await app.workers.wait_for_complete()
+            await pilot.pause(helpers.ASYNC_WAIT)
+
+            assert screen.cached_issues == {'i3': issue3}
+            assert screen.member_filter.issues == {'jira-foo1': {'i3': issue3}}
+            assert screen.team_filter.issues == {'foo': {'i3': issue3}}
+            assert screen.statuses['TODO'].table.row_count == 0
+            assert screen.statuses['IN PROGRESS'].table.row_count == 0
+            assert screen.statuses['DONE'].table.get_row_at(0)[0] == 'i3'
+            assert str(screen.sidebar.status.render()) == '1 / 1 (100%)'
+
+            # The details show the first remaining issue rather than the removed one
+            assert str(screen.issues.label.render()).strip() == 'i3'
+            assert str(screen.issues.info.render()) == 'summary i3'
+            await screen.on_radio_set_changed(
+                RadioSet.Changed(screen.status_changer.radio_set, screen.status_changer.radio_buttons['TODO'])
+            )
+            assert not screen.status_changer.button.disabled
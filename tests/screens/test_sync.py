@@ -6,9 +6,10 @@ from unittest.mock import MagicMock
 
 import pytest
 from httpx import Request, Response
-from textual.widgets import Button, Label, RichLog
+from textual.widgets import Button, Label, RichLog, Static
 
 from ddqa.screens.sync import InteractiveSidebar, SyncScreen
+from ddqa.utils.network import ResponsiveNetworkClient
 from tests.common import assert_return_code
 
 
@@ -178,6 +179,105 @@ async def test_save_members(application, auto_mode, request, git_repository, hel
     assert_return_code(app, auto_mode)
 
 
+async def test_multi_team_members(app, git_repository, helpers, mocker):
+    app.configure(
+        git_repository,
+        caching=True,
+        data={'github': {'user': 'foo', 'token': 'bar'}, 'jira': {'email': 'foo@bar.baz', 'token': 'bar'}},
+    )
+    mocker.patch(
+        'httpx.AsyncClient.get',
+        side_effect=[
+            Response(
+                200,
+                request=Request('GET', ''),
+                content=helpers.dedent("""
+                    jira_server = "https://foo.atlassian.net"
+
+                    [members]
+                    g = "j"
+                    foo1 = "jira-foo1"
+                    bar1 = "jira-bar1"
+                    """),
+            ),
+        ],
+    )
+    mocker.patch('ddqa.utils.github.GitHubRepository.get_team_members', side_effect=(['bar1', 'g'], ['foo1', 'g']))
+    mocker.patch('ddqa.utils.jira.JiraClient.get_deactivated_users', return_value=MagicMock(return_value=[]))
+
+    repo_config = dict(app.repo.model_dump())
+    repo_config['teams'] = {
+        'foo': {
+            'jira_project': 'FOO',
+            'jira_issue_type': 'Foo-Task',
+            'jira_statuses': {'TODO': 'Backlog', 'IN PROGRESS': 'Sprint', 'DONE': 'Done'},
+            'github_team': 'foo-team',
+        },
+        'bar': {
+            'jira_project': 'BAR',
+            'jira_issue_type': 'Bar-Task',
+            'jira_statuses': {'TODO': 'Backlog', 'IN PROGRESS': 'Sprint', 'DONE': 'Done'},
+            'github_team': 'bar-team',
+        },
+    }
+    app.save_repo_config(repo_config)
+
+    async with app.run_test():
+        sidebar = app.query_one(InteractiveSidebar)
+
+        text_log = sidebar.query_one(RichLog)
+        assert '\n'.join(line.text for line in text_log.lines) == helpers.dedent(f"""
+            Fetching global config from: {app.repo.global_config_source}
+            Refreshing members for team: bar-team
+            Refreshing members for team: foo-team
+            GitHub user g belongs to several teams, the first will be used for assignment: foo, bar
+            Validating the github-metadata configuration...
+            Validating 3 Jira users...
+            Sync finished correctly
+            """)
+
+        client = ResponsiveNetworkClient(Static())
+        assert await app.github.get_author_teams(client, 'g', app.repo.teams) == ['foo', 'bar']
+        assert await app.github.get_author_team(client, 'bar1', app.repo.teams) == 'bar'
+
+
+async def test_global_config_not_modified(app, git_repository, helpers, mocker):
+    app.configure(
+        git_repository,
+        caching=True,
+        data={'github': {'user': 'foo', 'token': 'bar'}, 'jira': {'email': 'foo@bar.baz', 'token': 'bar'}},
+    )
+    global_config_source = str(app.repo.global_config_source)
+    app.github.cache.save_http_response(
+        global_config_source,
+        {'ETag': '"abc"'},
+        helpers.dedent("""
+            jira_server = "https://foo.atlassian.net"
+
+            [members]
+            g = "j"
+            """),
+    )
+    response_mock = mocker.patch(
+        'httpx.AsyncClient.get',
+        side_effect=[
+            Response(304, request=Request('GET', '')),
+            Response(500, request=Request('GET', '')),
+        ],
+    )
+    mocker.patch('ddqa.utils.github.GitHubRepository.get_team_members', side_effect=[])
+
+    async with app.run_test():
+        assert app.github.load_global_config(app.repo.global_config_source) == {
+            'jira_server': 'https://foo.atlassian.net',
+            'members': {'g': 'j'},
+        }
+
+    assert response_mock.call_args_list[0] == mocker.call(
+        global_config_source, auth=('foo', 'bar'), headers={'If-None-Match': '"abc"'}
+    )
+
+
 @pytest.mark.parametrize(
     'application,auto_mode',
     [
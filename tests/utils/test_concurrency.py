@@ -0,0 +1,81 @@
+# SPDX-FileCopyrightText: 2023-present Datadog, Inc. <dev@datadoghq.com>
+#
+# SPDX-License-Identifier: MIT
+import asyncio
+
+import pytest
+
+from ddqa.utils.concurrency import PendingCalls
+
+
+class TestPendingCalls:
+    async def test_shared_result(self):
+        pending_calls = PendingCalls()
+        started = asyncio.Event()
+        finish = asyncio.Event()
+
+        async def call():
+            started.set()
+            await finish.wait()
+            return 9000
+
+        assert pending_calls.get('foo') is None
+
+        task = asyncio.create_task(pending_calls.run('foo', call()))
+        await started.wait()
+        pending = pending_calls.get('foo')
+        assert pending is not None
+        assert pending_calls.get('bar') is None
+
+        finish.set()
+        assert await pending == 9000
+        assert await task == 9000
+        assert pending_calls.get('foo') is None
+
+    async def test_shared_error(self):
+        pending_calls = PendingCalls()
+        started = asyncio.Event()
+        finish = asyncio.Event()
+
+        async def call():
+            started.set()
+            await finish.wait()
+            message = 'foo'
+            raise ValueError(message)
+
+        task = asyncio.create_task(pending_calls.run('foo', call()))
+        await started.wait()
+        pending = pending_calls.get('foo')
+
+        finish.set()
+        with pytest.raises(ValueError, match='foo'):
+            await task
+        with pytest.raises(ValueError, match='foo'):
+            await pending
+        assert pending_calls.get('foo') is None
+
+    async def test_waiter_cancelled(self):
+        pending_calls = PendingCalls()
+        started = asyncio.Event()
+        finish = asyncio.Event()
+
+        async def call():
+            started.set()
+            await finish.wait()
+            return 9000
+
+        task = asyncio.create_task(pending_calls.run('foo', call()))
+        await started.wait()
+
+        async def wait():
+            return await pending_calls.get('foo')
+
+        waiter = asyncio.create_task(wait())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+        # The call itself keeps running
+        finish.set()
+        assert await task == 9000
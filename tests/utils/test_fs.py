@@ -3,6 +3,8 @@
 # SPDX-License-Identifier: MIT
 import os
 import pathlib
+import threading
+import time
 
 from ddqa.utils.fs import Path
 
@@ -71,3 +73,25 @@ class TestPath:
         assert not path.exists()
         path.remove()
         assert not path.exists()
+
+    def test_lock(self, tmp_path):
+        path = Path(tmp_path, 'foo.json')
+        events = []
+
+        def hold_lock():
+            with path.lock():
+                events.append('acquired')
+                time.sleep(0.2)
+                events.append('released')
+
+        thread = threading.Thread(target=hold_lock)
+        thread.start()
+        while not events:
+            time.sleep(0.01)
+
+        with path.lock():
+            events.append('waited')
+
+        thread.join()
+        assert events == ['acquired', 'released', 'waited']
+        assert Path(tmp_path, 'foo.json.lock').is_file()
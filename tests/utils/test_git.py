@@ -68,3 +68,19 @@ def test_mutually_exclusive_commits(app, git_repository):
     # Just make sure the output doesn't depend on the current branch
     app.git.capture('checkout', head_ref)
     assert [(c.hash, c.subject) for c in app.git.get_mutually_exclusive_commits(upstream_ref, head_ref)] == commits
+
+
+def test_get_commit_timestamps(app, git_repository):
+    app.configure(git_repository)
+
+    commit_hashes = []
+    for i, timestamp in enumerate((1600000000, 1700000000)):
+        (app.git.path / f'test{i}.txt').touch()
+        app.git.capture('add', '.')
+        app.git.capture('commit', '-m', f'test{i}', '--date', f'@{timestamp}')
+        commit_hashes.append(app.git.get_latest_commit_hash())
+
+    timestamps = app.git.get_commit_timestamps(commit_hashes)
+    assert list(timestamps) == commit_hashes
+    assert all(isinstance(timestamp, int) for timestamp in timestamps.values())
+    assert app.git.get_commit_timestamps([]) == {}
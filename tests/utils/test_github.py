@@ -1,6 +1,7 @@
 # SPDX-FileCopyrightText: 2023-present Datadog, Inc. <dev@datadoghq.com>
 #
 # SPDX-License-Identifier: MIT
+import asyncio
 import json
 import time
 from unittest import mock
@@ -13,7 +14,8 @@ from ddqa.models.config.team import TeamConfig
 from ddqa.models.github import PullRequestLabel
 from ddqa.models.github import TestCandidate as Candidate
 from ddqa.utils.git import GitCommit
-from ddqa.utils.network import ResponsiveNetworkClient
+from ddqa.utils.github import GitHubRepository
+from ddqa.utils.network import BearerAuth, ResponsiveNetworkClient
 
 
 @pytest.fixture(scope='module', autouse=True)
@@ -41,7 +43,11 @@ class TestCandidates:
         app.configure(
             git_repository,
             caching=True,
-            data={'github': {'user': 'foo', 'token': 'bar'}, 'jira': {'email': 'foo@bar.baz', 'token': 'bar'}},
+            data={
+                'github': {'user': 'foo', 'token': 'bar'},
+                'jira': {'email': 'foo@bar.baz', 'token': 'bar'},
+                'github_lazy_reviews': False,
+            },
         )
 
         response_mock = mocker.patch(
@@ -124,7 +130,11 @@ class TestCandidates:
         app.configure(
             git_repository,
             caching=True,
-            data={'github': {'user': 'foo', 'token': 'bar'}, 'jira': {'email': 'foo@bar.baz', 'token': 'bar'}},
+            data={
+                'github': {'user': 'foo', 'token': 'bar'},
+                'jira': {'email': 'foo@bar.baz', 'token': 'bar'},
+                'github_lazy_reviews': False,
+            },
         )
 
         response_mock = mocker.patch(
@@ -219,7 +229,11 @@ class TestCandidates:
         app.configure(
             git_repository,
             caching=True,
-            data={'github': {'user': 'foo', 'token': 'bar'}, 'jira': {'email': 'foo@bar.baz', 'token': 'bar'}},
+            data={
+                'github': {'user': 'foo', 'token': 'bar'},
+                'jira': {'email': 'foo@bar.baz', 'token': 'bar'},
+                'github_lazy_reviews': False,
+            },
         )
 
         response_mock = mocker.patch(
@@ -295,7 +309,11 @@ class TestCandidates:
         app.configure(
             git_repository,
             caching=True,
-            data={'github': {'user': 'foo', 'token': 'bar'}, 'jira': {'email': 'foo@bar.baz', 'token': 'bar'}},
+            data={
+                'github': {'user': 'foo', 'token': 'bar'},
+                'jira': {'email': 'foo@bar.baz', 'token': 'bar'},
+                'github_lazy_reviews': False,
+            },
         )
 
         response_mock = mocker.patch(
@@ -362,7 +380,11 @@ class TestCandidates:
         app.configure(
             git_repository,
             caching=True,
-            data={'github': {'user': 'foo', 'token': 'bar'}, 'jira': {'email': 'foo@bar.baz', 'token': 'bar'}},
+            data={
+                'github': {'user': 'foo', 'token': 'bar'},
+                'jira': {'email': 'foo@bar.baz', 'token': 'bar'},
+                'github_lazy_reviews': False,
+            },
         )
 
         response_mock = mocker.patch(
@@ -565,12 +587,860 @@ class TestCandidates:
             )
         ]
 
-    async def test_caching(self, app, git_repository, mocker):
+    async def test_get_candidates_concurrency(self, app, git_repository, mocker):
+        app.configure(
+            git_repository,
+            caching=True,
+            data={
+                'github_concurrency': 2,
+                'github': {'user': 'foo', 'token': 'bar'},
+                'github_lazy_reviews': False,
+                'jira': {'email': 'foo@bar.baz', 'token': 'bar'},
+            },
+        )
+
+        # The last commit is resolved first to ensure that candidates are still yielded in commit order
+        delays = {'hash1': 0.2, 'hash2': 0.1, 'hash3': 0.1, 'hash4': 0}
+        pull_requests = {'hash1': 1, 'hash2': 2, 'hash3': 2, 'hash4': 3}
+        in_flight = []
+        max_in_flight = 0
+
+        async def get(url, **kwargs):
+            nonlocal max_in_flight
+
+            in_flight.append(url)
+            max_in_flight = max(max_in_flight, len(in_flight))
+            try:
+                if url.endswith('/reviews'):
+                    await asyncio.sleep(0.1)
+                    return Response(200, request=Request('GET', ''), content=json.dumps([]))
+
+                commit_hash = kwargs['params']['q'].split()[0]
+                await asyncio.sleep(delays[commit_hash])
+                number = pull_requests[commit_hash]
+                item = {
+                    'number': number,
+                    'title': f'title{number}',
+                    'user': {'login': 'username', 'html_url': 'https://github.com/username'},
+                    'labels': [],
+                    'body': None,
+                }
+                return Response(200, request=Request('GET', ''), content=json.dumps({'items': [item]}))
+            finally:
+                in_flight.remove(url)
+
+        response_mock = mocker.patch('httpx.AsyncClient.get', side_effect=get)
+
+        candidates = []
+        async for model, index, ignore in app.github.get_candidates(
+            ResponsiveNetworkClient(Static()),
+            [GitCommit(hash=f'hash{i}', subject=f'subject{i}') for i in range(1, 5)],
+        ):
+            candidates.append((model.id, index, ignore))
+
+        assert candidates == [('1', 0, 0), ('2', 1, 0), ('3', 3, 1)]
+        assert max_in_flight == 2
+
+        # The pull request shared by two commits only has its reviews fetched once
+        review_calls = [call for call in response_mock.call_args_list if call.args[0].endswith('/reviews')]
+        assert len(review_calls) == 3
+
+    async def test_get_candidate_shared_error(self, app, git_repository, mocker):
+        app.configure(
+            git_repository,
+            caching=True,
+            data={
+                'github': {'user': 'foo', 'token': 'bar'},
+                'jira': {'email': 'foo@bar.baz', 'token': 'bar'},
+                'github_lazy_reviews': False,
+            },
+        )
+
+        async def get(url, **_):
+            await asyncio.sleep(0)
+            if url.endswith('/reviews'):
+                return Response(200, request=Request('GET', ''), content='invalid')
+
+            item = {
+                'number': 2,
+                'title': 'title2',
+                'user': {'login': 'username', 'html_url': 'https://github.com/username'},
+                'labels': [],
+                'body': None,
+            }
+            return Response(200, request=Request('GET', ''), content=json.dumps({'items': [item]}))
+
+        mocker.patch('httpx.AsyncClient.get', side_effect=get)
+
+        client = ResponsiveNetworkClient(Static())
+        results = await asyncio.gather(
+            *(app.github.get_candidate(client, GitCommit(hash=f'hash{i}', subject=f'subject{i}')) for i in (1, 2)),
+            return_exceptions=True,
+        )
+
+        # The commit waiting for the other one to resolve the same PR gets the same error
+        assert [type(result) for result in results] == [json.JSONDecodeError, json.JSONDecodeError]
+
+    async def test_get_candidates_cached_in_order(self, app, git_repository, mocker):
         app.configure(
             git_repository,
             caching=True,
             data={'github': {'user': 'foo', 'token': 'bar'}, 'jira': {'email': 'foo@bar.baz', 'token': 'bar'}},
         )
+        app.github.cache.cache_candidate_data('hash2', {'id': 'hash2', 'title': 'subject2', 'url': ''})
+        app.github.cache.cache_candidate_data('hash4', {'id': '4', 'title': 'title4', 'url': ''})
+
+        response_mock = mocker.patch(
+            'httpx.AsyncClient.get',
+            side_effect=[
+                Response(200, request=Request('GET', ''), content=json.dumps({'items': []})),
+                Response(200, request=Request('GET', ''), content=json.dumps({'items': []})),
+            ],
+        )
+        get_many = mocker.spy(app.github.cache, 'get_many')
+
+        candidates = []
+        async for model, index, _ in app.github.get_candidates(
+            ResponsiveNetworkClient(Static()),
+            [GitCommit(hash=f'hash{i}', subject=f'subject{i}') for i in range(1, 5)],
+        ):
+            candidates.append((model.id, index))
+
+        # Cached candidates are yielded in commit order along with the others
+        assert candidates == [('hash1', 0), ('hash2', 1), ('hash3', 2), ('4', 3)]
+        assert get_many.call_count == 1
+        assert [call.kwargs['params']['q'].split()[0] for call in response_mock.call_args_list] == ['hash1', 'hash3']
+
+        # A fully cached range requires no network request
+        response_mock.reset_mock()
+        candidates = [
+            model.id
+            async for model, _, _ in app.github.get_candidates(
+                ResponsiveNetworkClient(Static()),
+                [GitCommit(hash=f'hash{i}', subject=f'subject{i}') for i in range(1, 5)],
+            )
+        ]
+        assert candidates == ['hash1', 'hash2', 'hash3', '4']
+        assert not response_mock.call_args_list
+
+    async def test_get_candidates_cached_without_waiting(self, app, git_repository, mocker):
+        app.configure(
+            git_repository,
+            caching=True,
+            data={'github': {'user': 'foo', 'token': 'bar'}, 'jira': {'email': 'foo@bar.baz', 'token': 'bar'}},
+        )
+        app.github.cache.cache_candidate_data('hash1', {'id': 'hash1', 'title': 'subject1', 'url': ''})
+
+        resolved = asyncio.Event()
+
+        async def get(*_args, **_kwargs):
+            await resolved.wait()
+            return Response(200, request=Request('GET', ''), content=json.dumps({'items': []}))
+
+        mocker.patch('httpx.AsyncClient.get', side_effect=get)
+
+        candidates = app.github.get_candidates(
+            ResponsiveNetworkClient(Static()),
+            [GitCommit(hash=f'hash{i}', subject=f'subject{i}') for i in range(1, 3)],
+        )
+
+        # The leading cached candidate does not wait for the uncached one
+        model, index, _ = await asyncio.wait_for(anext(candidates), 5)
+        assert (model.id, index) == ('hash1', 0)
+
+        resolved.set()
+        model, index, _ = await asyncio.wait_for(anext(candidates), 5)
+        assert (model.id, index) == ('hash2', 1)
+
+    async def test_get_candidates_graphql(self, app, git_repository, mocker):
+        app.configure(
+            git_repository,
+            caching=True,
+            data={
+                'github_graphql': True,
+                'github': {'user': 'foo', 'token': 'bar'},
+                'jira': {'email': 'foo@bar.baz', 'token': 'bar'},
+            },
+        )
+
+        post_mock = mocker.patch(
+            'httpx.AsyncClient.post',
+            return_value=Response(
+                200,
+                request=Request('POST', ''),
+                content=json.dumps(
+                    {
+                        'data': {
+                            'repository': {
+                                'c0': {
+                                    'associatedPullRequests': {
+                                        'nodes': [
+                                            {
+                                                'number': 123,
+                                                'title': 'title123',
+                                                'body': 'foo\r\nbar',
+                                                'merged': True,
+                                                'author': {
+                                                    'login': 'username123',
+                                                    'url': 'https://github.com/username123',
+                                                },
+                                                'labels': {'nodes': [{'name': 'label1', 'color': '632ca6'}]},
+                                                'reviews': {
+                                                    'nodes': [
+                                                        {
+                                                            'author': {'login': 'username1'},
+                                                            'authorAssociation': 'MEMBER',
+                                                        },
+                                                        {'author': None, 'authorAssociation': 'NONE'},
+                                                        {
+                                                            'author': {'login': 'username1'},
+                                                            'authorAssociation': 'MEMBER',
+                                                        },
+                                                    ],
+                                                },
+                                            },
+                                        ],
+                                    },
+                                },
+                                'c1': {'associatedPullRequests': {'nodes': []}},
+                                'c2': None,
+                            },
+                        },
+                    },
+                ),
+            ),
+        )
+        get_mock = mocker.patch(
+            'httpx.AsyncClient.get',
+            return_value=Response(200, request=Request('GET', ''), content=json.dumps({'items': []})),
+        )
+
+        candidates = []
+        async for model, index, ignore in app.github.get_candidates(
+            ResponsiveNetworkClient(Static()),
+            [GitCommit(hash=f'hash{i}', subject=f'subject{i}') for i in range(1, 4)],
+        ):
+            candidates.append((model.model_dump(), index, ignore))
+
+        assert len(post_mock.call_args_list) == 1
+        assert post_mock.call_args.args == ('https://api.github.com/graphql',)
+        assert post_mock.call_args.kwargs['json']['variables'] == {'owner': 'org', 'name': 'repo'}
+        query = post_mock.call_args.kwargs['json']['query']
+        assert 'c0: object(oid: "hash1")' in query
+        assert 'c1: object(oid: "hash2")' in query
+        assert 'c2: object(oid: "hash3")' in query
+
+        # Only the commit unknown to GitHub falls back to the search API
+        assert get_mock.call_args_list == [
+            mocker.call(
+                'https://api.github.com/search/issues',
+                auth=('foo', 'bar'),
+                params={'q': 'hash3 AND repo:org/repo AND is:merged AND is:pull-request', 'advanced_search': True},
+            ),
+        ]
+
+        assert candidates == [
+            (
+                {
+                    'id': '123',
+                    'title': 'title123',
+                    'url': 'https://github.com/org/repo/pull/123',
+                    'user': 'username123',
+                    'user_url': 'https://github.com/username123',
+                    'labels': [{'name': 'label1', 'color': '632ca6'}],
+                    'body': 'foo\nbar',
+                    'reviewers': [{'name': 'username1', 'association': 'member'}],
+                    'assigned_teams': set(),
+                },
+                0,
+                0,
+            ),
+            (
+                {
+                    'id': 'hash2',
+                    'title': 'subject2',
+                    'url': 'https://github.com/org/repo/commit/hash2',
+                    'user': '',
+                    'user_url': '',
+                    'labels': [],
+                    'body': '',
+                    'reviewers': [],
+                    'assigned_teams': set(),
+                },
+                1,
+                0,
+            ),
+            (
+                {
+                    'id': 'hash3',
+                    'title': 'subject3',
+                    'url': 'https://github.com/org/repo/commit/hash3',
+                    'user': '',
+                    'user_url': '',
+                    'labels': [],
+                    'body': '',
+                    'reviewers': [],
+                    'assigned_teams': set(),
+                },
+                2,
+                0,
+            ),
+        ]
+
+        assert app.github.cache.get_cached_candidate_data_from_commit('hash1') == {
+            'id': '123',
+            'title': 'title123',
+            'url': 'https://github.com/org/repo/pull/123',
+            'user': 'username123',
+            'user_url': 'https://github.com/username123',
+            'labels': [{'name': 'label1', 'color': '632ca6'}],
+            'body': 'foo\nbar',
+            'reviewers': [{'name': 'username1', 'association': 'member'}],
+        }
+
+    @pytest.mark.parametrize(
+        'subject, number',
+        [
+            ('Fix foo (#123)', '123'),
+            ('Fix foo (#123) ', '123'),
+            ('Merge pull request #456 from org/branch', '456'),
+            ('Fix foo (#123) and bar', None),
+            ('Fix #123', None),
+        ],
+    )
+    def test_parse_pr_number(self, subject, number):
+        assert GitHubRepository.parse_pr_number(subject) == number
+
+    async def test_subject_resolution(self, app, git_repository, mocker):
+        app.configure(
+            git_repository,
+            caching=True,
+            data={
+                'github_subject_resolution': True,
+                'github': {'user': 'foo', 'token': 'bar'},
+                'github_lazy_reviews': False,
+                'jira': {'email': 'foo@bar.baz', 'token': 'bar'},
+            },
+        )
+
+        response_mock = mocker.patch(
+            'httpx.AsyncClient.get',
+            side_effect=[
+                Response(
+                    200,
+                    request=Request('GET', ''),
+                    content=json.dumps(
+                        {
+                            'number': 123,
+                            'title': 'title123',
+                            'user': {'login': 'username123', 'html_url': 'https://github.com/username123'},
+                            'labels': [{'name': 'label1', 'color': '632ca6'}],
+                            'body': 'foo\r\nbar',
+                            'merged_at': '2023-01-01T00:00:00Z',
+                        },
+                    ),
+                ),
+                Response(
+                    200,
+                    request=Request('GET', ''),
+                    content=json.dumps([{'user': {'login': 'username1'}, 'author_association': 'MEMBER'}]),
+                ),
+            ],
+        )
+
+        candidate = await app.github.get_candidate(
+            ResponsiveNetworkClient(Static()), GitCommit(hash='hash1', subject='subject1 (#123)')
+        )
+        assert response_mock.call_args_list == [
+            mocker.call('https://api.github.com/repos/org/repo/pulls/123', auth=('foo', 'bar')),
+            mocker.call('https://api.github.com/repos/org/repo/pulls/123/reviews', auth=('foo', 'bar')),
+        ]
+        assert candidate.model_dump() == {
+            'id': '123',
+            'title': 'title123',
+            'url': 'https://github.com/org/repo/pull/123',
+            'user': 'username123',
+            'user_url': 'https://github.com/username123',
+            'labels': [{'name': 'label1', 'color': '632ca6'}],
+            'body': 'foo\nbar',
+            'reviewers': [{'name': 'username1', 'association': 'member'}],
+            'assigned_teams': set(),
+        }
+
+        # Another commit referencing the same pull request is served from the cache
+        response_mock = mocker.patch('httpx.AsyncClient.get', return_value=Response(500, request=Request('GET', '')))
+        candidate = await app.github.get_candidate(
+            ResponsiveNetworkClient(Static()), GitCommit(hash='hash2', subject='Merge pull request #123 from org/foo')
+        )
+        assert not response_mock.call_args_list
+        assert candidate.id == '123'
+        assert app.github.cache.get_cached_candidate_data_from_commit('hash2')['id'] == '123'
+
+    @pytest.mark.parametrize(
+        'response',
+        [
+            Response(404, request=Request('GET', '')),
+            Response(200, request=Request('GET', ''), content=json.dumps({'number': 123, 'merged_at': None})),
+        ],
+    )
+    async def test_subject_resolution_fallback(self, app, git_repository, mocker, response):
+        app.configure(
+            git_repository,
+            caching=True,
+            data={
+                'github_subject_resolution': True,
+                'github': {'user': 'foo', 'token': 'bar'},
+                'jira': {'email': 'foo@bar.baz', 'token': 'bar'},
+            },
+        )
+
+        response_mock = mocker.patch(
+            'httpx.AsyncClient.get',
+            side_effect=[
+                response,
+                Response(200, request=Request('GET', ''), content=json.dumps({'items': []})),
+            ],
+        )
+
+        candidate = await app.github.get_candidate(
+            ResponsiveNetworkClient(Static()), GitCommit(hash='hash1', subject='subject1 (#123)')
+        )
+        assert response_mock.call_args_list == [
+            mocker.call('https://api.github.com/repos/org/repo/pulls/123', auth=('foo', 'bar')),
+            mocker.call(
+                'https://api.github.com/search/issues',
+                auth=('foo', 'bar'),
+                params={'q': 'hash1 AND repo:org/repo AND is:merged AND is:pull-request', 'advanced_search': True},
+            ),
+        ]
+        assert candidate.id == 'hash1'
+
+    async def test_get_candidates_search_batch(self, app, git_repository, mocker):
+        app.configure(
+            git_repository,
+            caching=True,
+            data={
+                'github_search_batch_size': 2,
+                'github': {'user': 'foo', 'token': 'bar'},
+                'jira': {'email': 'foo@bar.baz', 'token': 'bar'},
+            },
+        )
+
+        hashes = [f'{i}' * 40 for i in range(1, 4)]
+
+        def get(url, **kwargs):
+            if url == 'https://api.github.com/search/issues':
+                query = kwargs['params']['q']
+                if query.endswith(f'({hashes[0][:12]} OR {hashes[1][:12]})'):
+                    # The second result was merged through another commit, e.g. a rebase merge
+                    items = [{'number': 1}, {'number': 2}]
+                else:
+                    items = []
+
+                return Response(200, request=Request('GET', ''), content=json.dumps({'items': items}))
+            elif url.endswith('/reviews'):
+                return Response(200, request=Request('GET', ''), content=json.dumps([]))
+
+            number = int(url.rpartition('/')[2])
+            pr_data = {
+                'number': number,
+                'title': f'title{number}',
+                'user': {'login': 'username', 'html_url': 'https://github.com/username'},
+                'labels': [],
+                'body': None,
+                'merged_at': '2023-01-01T00:00:00Z',
+                'merge_commit_sha': hashes[0] if number == 1 else 'f' * 40,
+            }
+            return Response(200, request=Request('GET', ''), content=json.dumps(pr_data))
+
+        response_mock = mocker.patch('httpx.AsyncClient.get', side_effect=get)
+
+        candidates = []
+        async for model, _, _ in app.github.get_candidates(
+            ResponsiveNetworkClient(Static()),
+            [GitCommit(hash=commit_hash, subject=f'subject{i}') for i, commit_hash in enumerate(hashes, 1)],
+        ):
+            candidates.append(model.id)
+
+        assert candidates == ['1', hashes[1], hashes[2]]
+
+        search_queries = [
+            call.kwargs['params']['q']
+            for call in response_mock.call_args_list
+            if call.args[0] == 'https://api.github.com/search/issues'
+        ]
+        assert sorted(search_queries) == sorted(
+            [
+                f'repo:org/repo is:merged is:pull-request ({hashes[0][:12]} OR {hashes[1][:12]})',
+                f'repo:org/repo is:merged is:pull-request ({hashes[2][:12]})',
+                # Only the commit that could not be mapped back to a pull request is searched individually
+                f'{hashes[1]} AND repo:org/repo AND is:merged AND is:pull-request',
+            ]
+        )
+
+    async def test_get_candidates_search_batch_operator_limit(self, app, git_repository, mocker):
+        app.configure(
+            git_repository,
+            caching=True,
+            data={
+                'github_search_batch_size': 10,
+                'github': {'user': 'foo', 'token': 'bar'},
+                'jira': {'email': 'foo@bar.baz', 'token': 'bar'},
+            },
+        )
+
+        hashes = [f'{i}' * 40 for i in range(1, 8)]
+        response_mock = mocker.patch(
+            'httpx.AsyncClient.get',
+            return_value=Response(200, request=Request('GET', ''), content=json.dumps({'items': []})),
+        )
+
+        candidates = []
+        async for model, _, _ in app.github.get_candidates(
+            ResponsiveNetworkClient(Static()),
+            [GitCommit(hash=commit_hash, subject=f'subject{i}') for i, commit_hash in enumerate(hashes, 1)],
+        ):
+            candidates.append(model.id)
+
+        assert candidates == hashes
+        assert [call.kwargs['params']['q'] for call in response_mock.call_args_list] == [
+            f'repo:org/repo is:merged is:pull-request ({" OR ".join(h[:12] for h in hashes[:6])})',
+            f'repo:org/repo is:merged is:pull-request ({hashes[6][:12]})',
+        ]
+
+    async def test_get_candidates_search_batch_cached_pull_request(self, app, git_repository, mocker):
+        app.configure(
+            git_repository,
+            caching=True,
+            data={
+                'github_search_batch_size': 2,
+                'github': {'user': 'foo', 'token': 'bar'},
+                'jira': {'email': 'foo@bar.baz', 'token': 'bar'},
+            },
+        )
+
+        hashes = [f'{i}' * 40 for i in range(1, 3)]
+        pr_data = {
+            'number': 1,
+            'title': 'title1',
+            'user': {'login': 'username', 'html_url': 'https://github.com/username'},
+            'labels': [],
+            'body': None,
+            'merged_at': '2023-01-01T00:00:00Z',
+            'merge_commit_sha': hashes[0],
+        }
+        app.github.cache.save_http_response(
+            'https://api.github.com/repos/org/repo/pulls/1', {'ETag': '"etag"'}, json.dumps(pr_data)
+        )
+
+        def get(url, **kwargs):
+            if url == 'https://api.github.com/search/issues':
+                items = [{'number': 1}] if kwargs['params']['q'].endswith(f'{hashes[1][:12]})') else []
+                return Response(200, request=Request('GET', ''), content=json.dumps({'items': items}))
+            elif url.endswith('/reviews'):
+                return Response(200, request=Request('GET', ''), content=json.dumps([]))
+
+            raise AssertionError(url)
+
+        response_mock = mocker.patch('httpx.AsyncClient.get', side_effect=get)
+
+        candidates = []
+        async for model, _, _ in app.github.get_candidates(
+            ResponsiveNetworkClient(Static()),
+            [GitCommit(hash=commit_hash, subject=f'subject{i}') for i, commit_hash in enumerate(hashes, 1)],
+        ):
+            candidates.append(model.id)
+
+        assert candidates == ['1', hashes[1]]
+        assert 'https://api.github.com/repos/org/repo/pulls/1' not in [
+            call.args[0] for call in response_mock.call_args_list
+        ]
+
+    async def test_get_candidates_pr_sweep(self, app, git_repository, mocker):
+        app.configure(
+            git_repository,
+            caching=True,
+            data={
+                'github_pr_sweep': True,
+                'github': {'user': 'foo', 'token': 'bar'},
+                'github_lazy_reviews': False,
+                'jira': {'email': 'foo@bar.baz', 'token': 'bar'},
+            },
+        )
+        mocker.patch(
+            'ddqa.utils.git.GitRepository.get_commit_timestamps',
+            return_value={'hash1': 1672574400, 'hash2': 1672578000},
+        )
+
+        def pull_request(number, merged_at, updated_at, merge_commit_sha):
+            return {
+                'number': number,
+                'title': f'title{number}',
+                'user': {'login': 'username', 'html_url': 'https://github.com/username'},
+                'labels': [{'name': 'label1', 'color': '632ca6'}],
+                'body': 'foo\r\nbar',
+                'merged_at': merged_at,
+                'updated_at': updated_at,
+                'merge_commit_sha': merge_commit_sha,
+            }
+
+        first_page = [pull_request(3, None, '2023-01-03T00:00:00Z', 'hash3')]
+        first_page.extend(
+            pull_request(i, '2022-12-01T00:00:00Z', '2023-01-02T00:00:00Z', f'old{i}') for i in range(4, 103)
+        )
+        response_mock = mocker.patch(
+            'httpx.AsyncClient.get',
+            side_effect=[
+                Response(200, request=Request('GET', ''), content=json.dumps(first_page)),
+                Response(
+                    200,
+                    request=Request('GET', ''),
+                    content=json.dumps(
+                        [
+                            pull_request(1, '2023-01-01T12:00:00Z', '2023-01-01T12:00:00Z', 'hash1'),
+                            pull_request(2, '2022-06-01T00:00:00Z', '2022-06-01T00:00:00Z', 'hash2'),
+                        ]
+                    ),
+                ),
+                Response(200, request=Request('GET', ''), content=json.dumps([])),
+                Response(200, request=Request('GET', ''), content=json.dumps({'items': []})),
+            ],
+        )
+
+        candidates = []
+        async for model, _, _ in app.github.get_candidates(
+            ResponsiveNetworkClient(Static()),
+            [GitCommit(hash='hash1', subject='subject1'), GitCommit(hash='hash2', subject='subject2')],
+        ):
+            candidates.append(model.model_dump())
+
+        assert response_mock.call_args_list == [
+            mocker.call(
+                'https://api.github.com/repos/org/repo/pulls',
+                auth=('foo', 'bar'),
+                params={'state': 'closed', 'sort': 'updated', 'direction': 'desc', 'per_page': 100, 'page': 1},
+            ),
+            mocker.call(
+                'https://api.github.com/repos/org/repo/pulls',
+                auth=('foo', 'bar'),
+                params={'state': 'closed', 'sort': 'updated', 'direction': 'desc', 'per_page': 100, 'page': 2},
+            ),
+            # Only the reviews are fetched for the indexed commit
+            mocker.call('https://api.github.com/repos/org/repo/pulls/1/reviews', auth=('foo', 'bar')),
+            # The commit merged outside of the commit range falls back to searching
+            mocker.call(
+                'https://api.github.com/search/issues',
+                auth=('foo', 'bar'),
+                params={'q': 'hash2 AND repo:org/repo AND is:merged AND is:pull-request', 'advanced_search': True},
+            ),
+        ]
+        assert [candidate['id'] for candidate in candidates] == ['1', 'hash2']
+        assert candidates[0]['body'] == 'foo\nbar'
+        assert list(app.github.cache.merged_pull_requests) == ['hash1']
+
+    async def test_lazy_reviews(self, app, git_repository, mocker):
+        app.configure(
+            git_repository,
+            caching=True,
+            data={
+                'github': {'user': 'foo', 'token': 'bar'},
+                'jira': {'email': 'foo@bar.baz', 'token': 'bar'},
+                'github_lazy_reviews': True,
+            },
+        )
+
+        response_mock = mocker.patch(
+            'httpx.AsyncClient.get',
+            side_effect=[
+                Response(
+                    200,
+                    request=Request('GET', ''),
+                    content=json.dumps(
+                        {
+                            'items': [
+                                {
+                                    'number': '123',
+                                    'title': 'title123',
+                                    'user': {'login': 'username123', 'html_url': 'https://github.com/username123'},
+                                    'labels': [],
+                                    'body': None,
+                                },
+                            ],
+                        },
+                    ),
+                ),
+                Response(
+                    200,
+                    request=Request('GET', ''),
+                    content=json.dumps(
+                        [
+                            {'user': {'login': 'username1'}, 'author_association': 'MEMBER'},
+                            {'user': None, 'author_association': 'NONE'},
+                            {'user': {'login': 'username1'}, 'author_association': 'MEMBER'},
+                        ],
+                    ),
+                ),
+            ],
+        )
+
+        client = ResponsiveNetworkClient(Static())
+        candidate = await app.github.get_candidate(client, GitCommit(hash='hash9000', subject='subject9000'))
+        assert len(response_mock.call_args_list) == 1
+        assert candidate.reviewers is None
+
+        # The candidate is cached without its reviewers
+        candidate = await app.github.get_candidate(client, GitCommit(hash='hash9000', subject='subject9000'))
+        assert candidate.reviewers is None
+
+        for _ in range(2):
+            reviewers = await app.github.get_pull_request_reviewers(client, '123')
+            assert reviewers == [{'name': 'username1', 'association': 'member'}]
+
+        assert response_mock.call_args_list[1:] == [
+            mocker.call('https://api.github.com/repos/org/repo/pulls/123/reviews', auth=('foo', 'bar')),
+        ]
+        assert app.github.cache.get_pull_request_reviewers('123') == reviewers
+
+    async def test_warm_candidates(self, app, git_repository, mocker):
+        app.configure(
+            git_repository,
+            caching=True,
+            data={
+                'github': {'user': 'foo', 'token': 'bar'},
+                'jira': {'email': 'foo@bar.baz', 'token': 'bar'},
+                'github_lazy_reviews': True,
+            },
+        )
+
+        def search_response(number, labels):
+            return Response(
+                200,
+                request=Request('GET', ''),
+                content=json.dumps(
+                    {
+                        'items': [
+                            {
+                                'number': number,
+                                'title': f'title{number}',
+                                'user': {'login': 'username1', 'html_url': 'https://github.com/username1'},
+                                'labels': [{'name': label, 'color': '000000'} for label in labels],
+                                'body': None,
+                            },
+                        ],
+                    },
+                ),
+            )
+
+        response_mock = mocker.patch(
+            'httpx.AsyncClient.get',
+            side_effect=[
+                search_response('1', []),
+                search_response('2', ['qa/done']),
+                Response(
+                    200,
+                    request=Request('GET', ''),
+                    content=json.dumps([{'user': {'login': 'username2'}, 'author_association': 'MEMBER'}]),
+                ),
+            ],
+        )
+
+        client = ResponsiveNetworkClient(Static())
+        commits = [GitCommit(hash='hash1', subject='subject1'), GitCommit(hash='hash2', subject='subject2')]
+        assert await app.github.warm_candidates(client, commits) == (1, 1)
+
+        # Reviews are only fetched for candidates that are not ignored
+        assert response_mock.call_args_list[2:] == [
+            mocker.call('https://api.github.com/repos/org/repo/pulls/1/reviews', auth=('foo', 'bar')),
+        ]
+        assert app.github.cache.get_pull_request_reviewers('1') == [{'name': 'username2', 'association': 'member'}]
+        assert app.github.cache.get_many(['hash1', 'hash2'])[1] == []
+
+    async def test_revalidation(self, app, git_repository, mocker):
+        app.configure(
+            git_repository,
+            caching=True,
+            data={
+                'github': {'user': 'foo', 'token': 'bar'},
+                'github_lazy_reviews': False,
+                'jira': {'email': 'foo@bar.baz', 'token': 'bar'},
+                'github_cache_max_age': 3600,
+            },
+        )
+
+        def pull_request(labels, updated_at):
+            return {
+                'number': 123,
+                'title': 'title123',
+                'user': {'login': 'username123', 'html_url': 'https://github.com/username123'},
+                'labels': [{'name': label, 'color': '632ca6'} for label in labels],
+                'body': None,
+                'merged_at': '2023-10-01T00:00:00Z',
+                'updated_at': updated_at,
+            }
+
+        response_mock = mocker.patch(
+            'httpx.AsyncClient.get',
+            side_effect=[
+                Response(200, request=Request('GET', ''), content=json.dumps({'items': [pull_request([], 'v1')]})),
+                Response(200, request=Request('GET', ''), content=json.dumps([])),
+                Response(200, request=Request('GET', ''), content=json.dumps(pull_request([], 'v1'))),
+                Response(200, request=Request('GET', ''), content=json.dumps(pull_request(['qa/skip'], 'v2'))),
+                Response(200, request=Request('GET', ''), content=json.dumps([])),
+            ],
+        )
+
+        client = ResponsiveNetworkClient(Static())
+        candidate = await app.github.get_candidate(client, GitCommit(hash='hash1', subject='subject1'))
+        assert not app.github.is_stale(candidate)
+
+        fetched_at, updated_at = app.github.cache.get_pull_request_freshness('123')
+        assert updated_at == 'v1'
+
+        # Unchanged
+        app.github.cache.touch_pull_request('123', fetched_at - 3601)
+        assert app.github.is_stale(candidate)
+        assert await app.github.revalidate_candidate(client, candidate) is None
+        assert not app.github.is_stale(candidate)
+
+        # Changed
+        app.github.cache.touch_pull_request('123', fetched_at - 3601)
+        updated_candidate = await app.github.revalidate_candidate(client, candidate)
+        assert [label.name for label in updated_candidate.labels] == ['qa/skip']
+        assert not app.github.is_stale(updated_candidate)
+        assert app.github.cache.get_pull_request_freshness('123')[1] == 'v2'
+        assert app.github.cache.get_cached_candidate_data_from_commit('hash1')['labels'] == [
+            {'name': 'qa/skip', 'color': '632ca6'}
+        ]
+
+        assert [call.args[0] for call in response_mock.call_args_list[2:]] == [
+            'https://api.github.com/repos/org/repo/pulls/123',
+            'https://api.github.com/repos/org/repo/pulls/123',
+            'https://api.github.com/repos/org/repo/pulls/123/reviews',
+        ]
+
+    async def test_revalidation_disabled(self, app, git_repository):
+        app.configure(
+            git_repository,
+            caching=True,
+            data={'github': {'user': 'foo', 'token': 'bar'}, 'jira': {'email': 'foo@bar.baz', 'token': 'bar'}},
+        )
+        app.github.cache.cache_candidate_data('hash1', {'id': '123', 'title': 'title123', 'url': ''}, fetched_at=0)
+
+        candidate = await app.github.get_candidate(
+            ResponsiveNetworkClient(Static()), GitCommit(hash='hash1', subject='subject1')
+        )
+        assert not app.github.is_stale(candidate)
+
+    async def test_caching(self, app, git_repository, mocker):
+        app.configure(
+            git_repository,
+            caching=True,
+            data={
+                'github': {'user': 'foo', 'token': 'bar'},
+                'jira': {'email': 'foo@bar.baz', 'token': 'bar'},
+                'github_lazy_reviews': False,
+            },
+        )
         repo_cache_dir = app.cache_dir / 'github' / 'org' / 'repo'
         assert not repo_cache_dir.is_dir()
 
@@ -713,33 +1583,26 @@ class TestCandidates:
         }
 
         assert repo_cache_dir.is_dir()
-        assert sorted(entry.name for entry in repo_cache_dir.iterdir()) == ['commits', 'pull_requests']
-
-        commits_dir = repo_cache_dir / 'commits'
-        assert commits_dir.is_dir()
-        assert sorted(entry.name for entry in commits_dir.iterdir()) == ['hash1', 'hash2', 'hash3']
-
-        commit1_dir = commits_dir / 'hash1'
-        assert [entry.name for entry in commit1_dir.iterdir()] == ['no_pr.json']
-        assert json.loads((commit1_dir / 'no_pr.json').read_text()) == {
+        assert 'cache.db' in [entry.name for entry in repo_cache_dir.iterdir()]
+
+        database = app.github.cache.database
+        commits = database.execute('SELECT hash, pr, data FROM commits ORDER BY hash').fetchall()
+        assert [(commit_hash, pr) for commit_hash, pr, _ in commits] == [
+            ('hash1', None),
+            ('hash2', '123'),
+            ('hash3', '123'),
+        ]
+        assert json.loads(commits[0][2]) == {
             'id': 'hash1',
             'title': 'subject1',
             'url': 'https://github.com/org/repo/commit/hash1',
         }
+        assert commits[1][2] is None
+        assert commits[2][2] is None
 
-        commit2_dir = commits_dir / 'hash2'
-        assert [entry.name for entry in commit2_dir.iterdir()] == ['123']
-        assert not (commit2_dir / '123').read_text()
-
-        commit3_dir = commits_dir / 'hash3'
-        assert [entry.name for entry in commit3_dir.iterdir()] == ['123']
-        assert not (commit3_dir / '123').read_text()
-
-        pull_requests_dir = repo_cache_dir / 'pull_requests'
-        assert pull_requests_dir.is_dir()
-        assert sorted(entry.name for entry in pull_requests_dir.iterdir()) == ['123.json']
-
-        assert json.loads((pull_requests_dir / '123.json').read_text()) == {
+        pull_requests = database.execute('SELECT number, data FROM pull_requests').fetchall()
+        assert [number for number, _ in pull_requests] == ['123']
+        assert json.loads(pull_requests[0][1]) == {
             'id': '123',
             'title': 'title123',
             'url': 'https://github.com/org/repo/pull/123',
@@ -946,12 +1809,55 @@ class TestTeamMembers:
 
         assert team_members == {'foobarbaz'}
 
+    async def test_refresh_conditional_request(self, app, git_repository, mocker):
+        app.configure(
+            git_repository,
+            caching=True,
+            data={'github': {'user': 'foo', 'token': 'bar'}, 'jira': {'email': 'foo@bar.baz', 'token': 'bar'}},
+        )
+
+        response_mock = mocker.patch(
+            'httpx.AsyncClient.get',
+            side_effect=[
+                Response(
+                    200,
+                    request=Request('GET', ''),
+                    headers={'ETag': '"abc"', 'Last-Modified': 'Wed, 11 Oct 2023 00:00:00 GMT'},
+                    content=json.dumps([{'login': 'foo', 'type': 'User'}, {'login': 'bot', 'type': 'other'}]),
+                ),
+                Response(304, request=Request('GET', ''), headers={'ETag': '"abc"'}),
+            ],
+        )
+
+        client = ResponsiveNetworkClient(Static())
+        team_members = await app.github.get_team_members(client, 'a-team')
+        assert team_members == {'foo'}
+
+        # The team is unchanged so the cached body is used
+        app.github.cache.get_team_members_file('a-team').unlink()
+        team_members = await app.github.get_team_members(client, 'a-team', refresh=True)
+        assert team_members == {'foo'}
+        assert app.github.cache.get_team_members('a-team') == {'foo'}
+
+        assert response_mock.call_args_list == [
+            mocker.call('https://api.github.com/orgs/org/teams/a-team/members', auth=('foo', 'bar')),
+            mocker.call(
+                'https://api.github.com/orgs/org/teams/a-team/members',
+                auth=('foo', 'bar'),
+                headers={'If-None-Match': '"abc"', 'If-Modified-Since': 'Wed, 11 Oct 2023 00:00:00 GMT'},
+            ),
+        ]
+
 
 async def test_rate_limit_handling(app, git_repository, mocker):
     app.configure(
         git_repository,
         caching=True,
-        data={'github': {'user': 'foo', 'token': 'bar'}, 'jira': {'email': 'foo@bar.baz', 'token': 'bar'}},
+        data={
+            'github': {'user': 'foo', 'token': 'bar'},
+            'jira': {'email': 'foo@bar.baz', 'token': 'bar'},
+            'github_lazy_reviews': False,
+        },
     )
 
     start = time.time()
@@ -1034,6 +1940,49 @@ async def test_rate_limit_handling(app, git_repository, mocker):
     }
 
 
+async def test_token_pool(app, git_repository, mocker):
+    app.configure(
+        git_repository,
+        caching=True,
+        data={
+            'github': {'user': 'foo', 'token': 'bar', 'tokens': ['baz']},
+            'jira': {'email': 'foo@bar.baz', 'token': 'bar'},
+        },
+    )
+
+    reset = f'{time.time() + 3600}'
+    remaining = {'bar': 10, 'baz': 4000}
+
+    def get(_url, auth, **_kwargs):
+        token = auth[1] if isinstance(auth, tuple) else auth.token
+        remaining[token] -= 1
+        return Response(
+            200,
+            request=Request('GET', ''),
+            headers={
+                'X-RateLimit-Limit': '5000',
+                'X-RateLimit-Remaining': str(remaining[token]),
+                'X-RateLimit-Reset': reset,
+                'X-RateLimit-Resource': 'core',
+            },
+            content=json.dumps([]),
+        )
+
+    response_mock = mocker.patch('httpx.AsyncClient.get', side_effect=get)
+
+    client = ResponsiveNetworkClient(Static())
+    for team in ('a-team', 'b-team', 'c-team', 'd-team'):
+        await app.github.get_team_members(client, team, refresh=True)
+
+    # The main token is used first, then each token's budget is learned and the one with the most headroom is used
+    auths = [call.kwargs['auth'] for call in response_mock.call_args_list]
+    assert auths[0] == ('foo', 'bar')
+    # Tokens of the pool are not paired with the main user
+    assert [(type(auth), auth.token) for auth in auths[1:]] == [(BearerAuth, 'baz')] * 3
+    assert app.github.rate_limiters['bar'].buckets['core'].remaining == 9
+    assert app.github.rate_limiters['baz'].buckets['core'].remaining == 3997
+
+
 class TestAuthorTeam:
     @pytest.fixture
     def teams(self):
@@ -1129,3 +2078,48 @@ class TestAuthorTeam:
 
         result = await app.github.get_author_team(ResponsiveNetworkClient(Static()), 'unknown-user', teams)
         assert result is None
+
+    async def test_index_built_once(self, app, git_repository, mocker, teams):
+        app.configure(
+            git_repository,
+            caching=True,
+            data={'github': {'user': 'foo', 'token': 'bar'}, 'jira': {'email': 'foo@bar.baz', 'token': 'bar'}},
+        )
+
+        get_team_members = mocker.patch.object(
+            app.github, 'get_team_members', side_effect=[{'alice', 'bob'}, {'bob', 'charlie'}]
+        )
+
+        client = ResponsiveNetworkClient(Static())
+        assert await app.github.get_author_team(client, 'alice', teams) == 'foo'
+        assert await app.github.get_author_team(client, 'charlie', teams) == 'bar'
+        assert await app.github.get_author_teams(client, 'bob', teams) == ['foo', 'bar']
+        assert await app.github.get_author_team(client, 'unknown-user', teams) is None
+
+        assert get_team_members.call_args_list == [
+            mocker.call(client, 'foo-team', refresh=False),
+            mocker.call(client, 'bar-team', refresh=False),
+        ]
+
+    async def test_index_invalidated_on_refresh(self, app, git_repository, mocker, teams):
+        app.configure(
+            git_repository,
+            caching=True,
+            data={'github': {'user': 'foo', 'token': 'bar'}, 'jira': {'email': 'foo@bar.baz', 'token': 'bar'}},
+        )
+
+        mocker.patch(
+            'httpx.AsyncClient.get',
+            side_effect=[
+                Response(200, request=Request('GET', ''), content=json.dumps([{'login': 'alice', 'type': 'User'}])),
+                Response(200, request=Request('GET', ''), content=json.dumps([{'login': 'bob', 'type': 'User'}])),
+                Response(200, request=Request('GET', ''), content=json.dumps([{'login': 'bob', 'type': 'User'}])),
+            ],
+        )
+
+        client = ResponsiveNetworkClient(Static())
+        assert await app.github.get_author_team(client, 'bob', teams) == 'bar'
+
+        await app.github.get_team_members(client, 'foo-team', refresh=True)
+        assert await app.github.get_author_team(client, 'bob', teams) == 'foo'
+        assert await app.github.get_author_team(client, 'alice', teams) is None
@@ -1,6 +1,7 @@
 # SPDX-FileCopyrightText: 2023-present Datadog, Inc. <dev@datadoghq.com>
 #
 # SPDX-License-Identifier: MIT
+import asyncio
 import json
 import time
 from datetime import datetime, timedelta, timezone
@@ -246,6 +247,151 @@ async def test_create_issues(app, git_repository, helpers, mocker):
     }
 
 
+async def test_create_issues_bulk(app, git_repository, mocker):
+    app.configure(
+        git_repository,
+        caching=True,
+        data={'github': {'user': 'foo', 'token': 'bar'}, 'jira': {'email': 'foo@bar.baz', 'token': 'bar'}},
+    )
+    repo_config = dict(app.repo.model_dump())
+    repo_config['teams'] = {
+        'foo': {
+            'jira_project': 'FOO',
+            'jira_issue_type': 'Foo-Task',
+            'jira_statuses': {'TODO': 'Backlog', 'IN PROGRESS': 'Sprint', 'DONE': 'Done'},
+            'github_team': 'foo-team',
+        },
+        'bar': {
+            'jira_project': 'BAR',
+            'jira_issue_type': 'Bar-Task',
+            'jira_statuses': {'TODO': 'Backlog', 'IN PROGRESS': 'Sprint', 'DONE': 'Done'},
+            'github_team': 'bar-team',
+        },
+    }
+    app.save_repo_config(repo_config)
+    mocker.patch('ddqa.utils.jira.JiraClient.ISSUE_BULK_BATCH_SIZE', 2)
+
+    response_mock = mocker.patch(
+        'httpx.AsyncClient.request',
+        side_effect=[
+            Response(
+                201,
+                request=Request('POST', ''),
+                content=json.dumps(
+                    {
+                        'issues': [{'id': '1', 'key': 'FOO-1'}],
+                        'errors': [
+                            {
+                                'status': 400,
+                                'elementErrors': {'errorMessages': [], 'errors': {'assignee': 'Cannot be assigned'}},
+                                'failedElementNumber': 1,
+                            },
+                        ],
+                    },
+                ),
+            ),
+            Response(
+                400,
+                request=Request('POST', ''),
+                content=json.dumps(
+                    {
+                        'issues': [],
+                        'errors': [
+                            {
+                                'status': 400,
+                                'elementErrors': {'errorMessages': ['Project does not exist'], 'errors': {}},
+                                'failedElementNumber': 0,
+                            },
+                        ],
+                    },
+                ),
+            ),
+        ],
+    )
+
+    candidates = [
+        Candidate(
+            **{
+                'id': str(number),
+                'title': f'title{number}',
+                'url': f'https://github.com/org/repo/pull/{number}',
+                'user': 'user9000',
+                'labels': [],
+                'body': '',
+            }
+        )
+        for number in (1, 2)
+    ]
+    results = await app.jira.create_issues_bulk(
+        ResponsiveNetworkClient(Static()),
+        [(candidates[0], {'foo': 'jira-foo', 'bar': 'jira-bar'}), (candidates[1], {'foo': None})],
+        ['qa-1.2.3'],
+    )
+
+    assert response_mock.call_count == 2
+    for call, projects in zip(response_mock.call_args_list, (['FOO', 'BAR'], ['FOO']), strict=True):
+        assert call.args == ('POST', 'https://foobarbaz.atlassian.net/rest/api/2/issue/bulk')
+        issue_updates = call.kwargs['json']['issueUpdates']
+        assert [issue_update['fields']['project']['key'] for issue_update in issue_updates] == projects
+
+    assert results == [
+        (
+            {'foo': 'https://foobarbaz.atlassian.net/browse/FOO-1'},
+            {'bar': 'assignee: Cannot be assigned'},
+        ),
+        ({}, {'foo': 'Project does not exist'}),
+    ]
+
+
+async def test_create_issues_bulk_missing_issues(app, git_repository, mocker):
+    app.configure(
+        git_repository,
+        caching=True,
+        data={'github': {'user': 'foo', 'token': 'bar'}, 'jira': {'email': 'foo@bar.baz', 'token': 'bar'}},
+    )
+    repo_config = dict(app.repo.model_dump())
+    repo_config['teams'] = {
+        'foo': {
+            'jira_project': 'FOO',
+            'jira_issue_type': 'Foo-Task',
+            'jira_statuses': {'TODO': 'Backlog', 'IN PROGRESS': 'Sprint', 'DONE': 'Done'},
+            'github_team': 'foo-team',
+        },
+    }
+    app.save_repo_config(repo_config)
+
+    mocker.patch('ddqa.utils.jira.JiraClient.ISSUE_BULK_BATCH_SIZE', 1)
+    mocker.patch(
+        'httpx.AsyncClient.request',
+        side_effect=[
+            Response(201, request=Request('POST', ''), content=json.dumps({'issues': [{'id': '1', 'key': 'FOO-1'}]})),
+            Response(201, request=Request('POST', ''), content=json.dumps({'issues': [], 'errors': []})),
+        ],
+    )
+
+    candidates = [
+        Candidate(id=str(number), title=f'title{number}', url=f'https://github.com/org/repo/pull/{number}', user='u')
+        for number in (1, 2)
+    ]
+    results = await app.jira.create_issues_bulk(
+        ResponsiveNetworkClient(Static()), [(candidate, {'foo': None}) for candidate in candidates], ['qa-1']
+    )
+
+    # The issues of earlier batches are still reported as created
+    assert results == [
+        ({'foo': 'https://foobarbaz.atlassian.net/browse/FOO-1'}, {}),
+        (
+            {},
+            {
+                'foo': (
+                    'Jira returned 0 created issue(s) and 0 error(s) for a batch of 1 issue(s), '
+                    'the issue may have been created'
+                )
+            },
+        ),
+    ]
+
+
 async def test_search_issues(app, git_repository, mocker):
     app.configure(
         git_repository,
@@ -602,6 +748,203 @@ async def test_search_issues(app, git_repository, mocker):
     }
 
 
+async def test_search_issues_concurrency(app, git_repository, mocker):
+    app.configure(
+        git_repository,
+        caching=True,
+        data={'github': {'user': 'foo', 'token': 'bar'}, 'jira': {'email': 'foo@bar.baz', 'token': 'bar'}},
+    )
+    repo_config = dict(app.repo.model_dump())
+    repo_config['teams'] = {
+        'foo': {
+            'jira_project': 'FOO',
+            'jira_issue_type': 'Foo-Task',
+            'jira_statuses': {'TODO': 'Backlog', 'IN PROGRESS': 'Sprint', 'DONE': 'Done'},
+            'github_team': 'foo-team',
+        },
+    }
+    app.save_repo_config(repo_config)
+
+    def page(offset):
+        return {
+            'issues': [
+                {
+                    'fields': {
+                        'assignee': None,
+                        'components': [],
+                        'description': 'Test description',
+                        'issuetype': {'name': 'Foo-Task'},
+                        'labels': ['qa-1.2.3'],
+                        'project': {'key': 'FOO'},
+                        'status': {'id': '42', 'name': 'In Progress'},
+                        'summary': 'Test summary',
+                        'updated': '2023-02-13T12:08:50.058-0500',
+                    },
+                    'key': f'FOO-{offset + 1}',
+                },
+            ],
+            'maxResults': 1,
+            'startAt': offset,
+            'total': 3,
+        }
+
+    last_page_requested = asyncio.Event()
+
+    async def request(method, url, **kwargs):
+        if method == 'GET':
+            return Response(200, request=Request(method, url), content=json.dumps({'transitions': []}))
+
+        offset = kwargs['json']['startAt']
+        if offset == 1:
+            # The second page is only received once the last page has been requested
+            await asyncio.wait_for(last_page_requested.wait(), timeout=5)
+        elif offset == 2:
+            last_page_requested.set()
+
+        return Response(200, request=Request(method, url), content=json.dumps(page(offset)))
+
+    response_mock = mocker.patch('httpx.AsyncClient.request', side_effect=request)
+    app.jira.PAGINATION_RESULT_SIZE = 1
+
+    issues = [
+        issue.key
+        async for issue in app.jira.search_issues(ResponsiveNetworkClient(Static()), ('qa-1.2.3',), concurrency=2)
+    ]
+
+    # Pages are streamed in the order they are received
+    assert issues == ['FOO-1', 'FOO-3', 'FOO-2']
+    assert [call.kwargs['json']['startAt'] for call in response_mock.call_args_list if call.args[0] == 'POST'] == [
+        0,
+        1,
+        2,
+    ]
+
+
+async def test_search_issues_transitions(app, git_repository, mocker):
+    app.configure(
+        git_repository,
+        caching=True,
+        data={'github': {'user': 'foo', 'token': 'bar'}, 'jira': {'email': 'foo@bar.baz', 'token': 'bar'}},
+    )
+    repo_config = dict(app.repo.model_dump())
+    repo_config['teams'] = {
+        'foo': {
+            'jira_project': 'FOO',
+            'jira_issue_type': 'Foo-Task',
+            'jira_statuses': {'TODO': 'Backlog', 'IN PROGRESS': 'Sprint', 'DONE': 'Done'},
+            'github_team': 'foo-team',
+        },
+        'bar': {
+            'jira_project': 'BAR',
+            'jira_issue_type': 'Bar-Task',
+            'jira_statuses': {'TODO': 'Backlog', 'IN PROGRESS': 'Sprint', 'DONE': 'Done'},
+            'github_team': 'bar-team',
+        },
+    }
+    app.save_repo_config(repo_config)
+
+    def issue(key, project, issue_type):
+        return {
+            'fields': {
+                'assignee': None,
+                'components': [],
+                'description': 'Test description',
+                'issuetype': {'name': issue_type},
+                'labels': ['qa-1.2.3'],
+                'project': {'key': project},
+                'status': {'id': '42', 'name': 'In Progress'},
+                'summary': 'Test summary',
+                'updated': '2023-02-13T12:08:50.058-0500',
+            },
+            'key': key,
+        }
+
+    pages = [
+        [issue('FOO-1', 'FOO', 'Foo-Task'), issue('FOO-2', 'FOO', 'Foo-Task')],
+        [issue('FOO-3', 'FOO', 'Foo-Task'), issue('BAR-1', 'BAR', 'Bar-Task')],
+    ]
+    issues_streamed = asyncio.Event()
+
+    async def request(method, url, **kwargs):
+        if url.endswith('/search'):
+            offset = kwargs['json']['startAt']
+            content = {'issues': pages[offset // 2], 'maxResults': 2, 'startAt': offset, 'total': 4}
+        elif method == 'GET':
+            # Transitions are only received once every issue has been streamed
+            await asyncio.wait_for(issues_streamed.wait(), timeout=5)
+            content = {
+                'transitions': [{'id': '123', 'to': {'name': 'Status1'}}, {'id': '456', 'to': {'name': 'Status2'}}]
+            }
+        else:
+            content = {}
+
+        return Response(200, request=Request(method, url), content=json.dumps(content))
+
+    response_mock = mocker.patch('httpx.AsyncClient.request', side_effect=request)
+    app.jira.PAGINATION_RESULT_SIZE = 2
+
+    client = ResponsiveNetworkClient(Static())
+    issues = []
+    async for jira_issue in app.jira.search_issues(client, ('qa-1.2.3',)):
+        issues.append(jira_issue)
+        if len(issues) == 4:
+            issues_streamed.set()
+            # Waits for the lookup that is already in progress for the same project and issue type
+            await app.jira.update_issue_status(client, issues[1], 'Status2')
+
+    assert [jira_issue.key for jira_issue in issues] == ['FOO-1', 'FOO-2', 'FOO-3', 'BAR-1']
+    assert [
+        (call.args, call.kwargs.get('json'))
+        for call in response_mock.call_args_list
+        if not call.args[1].endswith('/search')
+    ] == [
+        (('GET', 'https://foobarbaz.atlassian.net/rest/api/2/issue/FOO-1/transitions'), None),
+        (('GET', 'https://foobarbaz.atlassian.net/rest/api/2/issue/BAR-1/transitions'), None),
+        (
+            ('POST', 'https://foobarbaz.atlassian.net/rest/api/2/issue/FOO-2/transitions'),
+            {'transition': {'id': '456'}},
+        ),
+    ]
+
+
+async def test_search_issues_updated_since(app, git_repository, mocker):
+    app.configure(
+        git_repository,
+        caching=True,
+        data={'github': {'user': 'foo', 'token': 'bar'}, 'jira': {'email': 'foo@bar.baz', 'token': 'bar'}},
+    )
+    repo_config = dict(app.repo.model_dump())
+    repo_config['teams'] = {
+        'foo': {
+            'jira_project': 'FOO',
+            'jira_issue_type': 'Foo-Task',
+            'jira_statuses': {'TODO': 'Backlog', 'IN PROGRESS': 'Sprint', 'DONE': 'Done'},
+            'github_team': 'foo-team',
+        },
+    }
+    app.save_repo_config(repo_config)
+
+    response_mock = mocker.patch(
+        'httpx.AsyncClient.request',
+        return_value=Response(
+            200,
+            request=Request('POST', ''),
+            content=json.dumps({'issues': [], 'maxResults': 100, 'startAt': 0, 'total': 0}),
+        ),
+    )
+
+    issues = [
+        issue
+        async for issue in app.jira.search_issues(
+            ResponsiveNetworkClient(Static()), ('qa-1.2.3',), updated_since=time.time() - 150
+        )
+    ]
+
+    assert not issues
+    # Rounded up to the minute with a margin for clock differences, ignoring labels to find those that were removed
+    assert response_mock.call_args.kwargs['json']['jql'] == 'project in ("FOO") and updated >= -4m'
+
+
 async def test_rate_limit_handling(app, git_repository, mocker):
     app.configure(
         git_repository,
@@ -0,0 +1,38 @@
+# SPDX-FileCopyrightText: 2023-present Datadog, Inc. <dev@datadoghq.com>
+#
+# SPDX-License-Identifier: MIT
+import asyncio
+
+from ddqa.utils.network import ResponsiveNetworkClient
+
+
+class MemoryStatus:
+    def __init__(self, status):
+        self.status = status
+
+    def render(self):
+        return self.status
+
+    def update(self, status=''):
+        self.status = status
+
+
+class TestWait:
+    async def test_restore_status(self):
+        status = MemoryStatus('foo')
+
+        async with ResponsiveNetworkClient(status) as client:
+            await client.wait(0.2, context='err')
+
+        assert status.render() == 'foo'
+
+    async def test_overlapping(self):
+        status = MemoryStatus('foo')
+
+        async with ResponsiveNetworkClient(status) as client:
+            first_wait = asyncio.create_task(client.wait(0.5, context='err'))
+            await asyncio.sleep(0.2)
+            # The second wait starts while the countdown of the first one is displayed
+            await asyncio.gather(first_wait, client.wait(0.5, context='err'))
+
+        assert status.render() == 'foo'
@@ -0,0 +1,130 @@
+# SPDX-FileCopyrightText: 2023-present Datadog, Inc. <dev@datadoghq.com>
+#
+# SPDX-License-Identifier: MIT
+import time
+
+import pytest
+from httpx import Request, Response
+
+from ddqa.utils.rate_limit import RateLimitBucket, RateLimiter
+
+
+class TestBucket:
+    def test_unknown(self):
+        bucket = RateLimitBucket()
+        assert bucket.get_delay(time.time()) == 0
+
+    def test_burst_above_reserve(self):
+        now = time.time()
+        bucket = RateLimitBucket()
+        bucket.update(100, 50, now + 60)
+
+        for _ in range(30):
+            assert bucket.get_delay(now) == 0
+            bucket.consume(now)
+
+        assert bucket.remaining == 20
+
+    def test_pacing_within_reserve(self):
+        now = time.time()
+        bucket = RateLimitBucket()
+        bucket.update(100, 10, now + 60)
+
+        assert bucket.get_delay(now) == 0
+        bucket.consume(now)
+        assert bucket.get_delay(now) == pytest.approx(60 / 9)
+
+    def test_exhausted(self):
+        now = time.time()
+        bucket = RateLimitBucket()
+        bucket.update(100, 0, now + 60)
+
+        assert bucket.get_delay(now) == pytest.approx(61)
+        assert bucket.get_delay(now + 60) == 0
+
+    def test_update_same_window(self):
+        now = time.time()
+        bucket = RateLimitBucket()
+        bucket.update(100, 50, now + 60)
+        bucket.consume(now)
+        bucket.consume(now)
+
+        # A response to a request sent before the others were consumed
+        bucket.update(100, 49, now + 60)
+        assert bucket.remaining == 48
+
+        # A new window
+        bucket.update(100, 99, now + 120)
+        assert bucket.remaining == 99
+
+
+class TestRateLimiter:
+    def test_update(self):
+        limiter = RateLimiter()
+        response = Response(
+            200,
+            request=Request('GET', ''),
+            headers={
+                'X-RateLimit-Limit': '30',
+                'X-RateLimit-Remaining': '29',
+                'X-RateLimit-Reset': '1700000000',
+                'X-RateLimit-Resource': 'search',
+            },
+        )
+
+        assert not limiter.update(response, 'core')
+        assert list(limiter.buckets) == ['search']
+        assert limiter.buckets['search'].limit == 30
+        assert limiter.buckets['search'].remaining == 29
+
+    def test_primary_limit(self):
+        limiter = RateLimiter()
+        response = Response(
+            403,
+            request=Request('GET', ''),
+            headers={'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset': f'{time.time() + 60}'},
+        )
+
+        assert limiter.update(response, 'core')
+        assert limiter.buckets['core'].get_delay(time.time()) > 60
+
+    def test_not_throttled(self):
+        limiter = RateLimiter()
+        response = Response(403, request=Request('GET', ''), content=b'{"message": "Forbidden"}')
+
+        assert not limiter.update(response, 'core')
+
+    async def test_retry_after(self, network_client):
+        limiter = RateLimiter()
+        response = Response(429, request=Request('GET', ''), headers={'Retry-After': '0.5'})
+        assert limiter.update(response, 'core')
+
+        # Secondary limits apply to every resource
+        start = time.time()
+        await limiter.acquire(network_client, 'search')
+        assert time.time() - start >= 0.5
+
+    async def test_secondary_limit(self, network_client, mocker):
+        limiter = RateLimiter()
+        response = Response(
+            403,
+            request=Request('GET', ''),
+            content=b'{"message": "You have exceeded a secondary rate limit."}',
+        )
+        mocker.patch.object(RateLimiter, 'SECONDARY_LIMIT_WAIT', 0.5)
+        assert limiter.update(response, 'core')
+
+        start = time.time()
+        await limiter.acquire(network_client, 'core')
+        assert time.time() - start >= 0.5
+
+    async def test_pacing(self, network_client):
+        limiter = RateLimiter()
+        limiter.get_bucket('core').update(100, 2, time.time() + 1)
+
+        start = time.time()
+        await limiter.acquire(network_client, 'core')
+        assert time.time() - start < 0.5
+
+        await limiter.acquire(network_client, 'core')
+        assert time.time() - start >= 0.5
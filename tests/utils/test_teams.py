@@ -0,0 +1,39 @@
+# SPDX-FileCopyrightText: 2023-present Datadog, Inc. <dev@datadoghq.com>
+#
+# SPDX-License-Identifier: MIT
+import pytest
+
+from ddqa.models.config.team import TeamConfig
+from ddqa.utils.teams import TeamIndex
+
+
+@pytest.fixture
+def teams():
+    return {
+        'foo': TeamConfig(jira_project='FOO', jira_issue_type='Task', jira_statuses=['TODO'], github_team='foo-team'),
+        'bar': TeamConfig(jira_project='BAR', jira_issue_type='Task', jira_statuses=['TODO'], github_team='bar-team'),
+        'baz': TeamConfig(jira_project='BAZ', jira_issue_type='Task', jira_statuses=['TODO'], github_team='foo-team'),
+    }
+
+
+def test_lookup(teams):
+    team_index = TeamIndex(teams, {'foo-team': {'alice'}, 'bar-team': {'bob', 'charlie'}})
+
+    assert team_index.get_teams('alice') == ['foo', 'baz']
+    assert team_index.get_teams('bob') == ['bar']
+    assert team_index.get_teams('charlie') == ['bar']
+    assert team_index.get_teams('unknown') == []
+
+
+def test_multi_team_users(teams):
+    team_index = TeamIndex(teams, {'foo-team': ['bob', 'alice'], 'bar-team': ['bob', 'charlie']})
+
+    assert team_index.get_multi_team_users() == {'alice': ['foo', 'baz'], 'bob': ['foo', 'bar', 'baz']}
+
+
+def test_matches(teams):
+    team_index = TeamIndex(teams, {})
+
+    assert team_index.matches(teams)
+    assert not team_index.matches({'foo': teams['foo']})
+    assert team_index.github_teams == {'foo': 'foo-team', 'bar': 'bar-team', 'baz': 'foo-team'}